@@ -1,3 +1,4 @@
+import crypto from 'crypto'
 import fs from 'fs'
 import path from 'path'
 import { normalizeText } from './custom-food-import'
@@ -25,8 +26,48 @@ export type FastFoodMenuItem = {
 }
 
 const DATA_PATH = path.join(process.cwd(), 'data', 'food-overrides', 'fast_food_menus.csv')
-const CACHE_TTL_MS = 5 * 60 * 1000
-let cachedAt = 0
+// Written by the Python importers (scripts/fast-food/fast_food_import/manifest.py).
+const MANIFEST_PATH = path.join(process.cwd(), 'data', 'food-overrides', 'fast_food_menus.manifest.json')
+
+type ManifestPartition = {
+  country: string
+  chain: string
+  rows: number
+  sha256: string
+  ranges: [number, number][]
+}
+
+type Manifest = {
+  version: number
+  generation: number
+  csv_bytes: number
+  header_bytes: number
+  partitions: Record<string, ManifestPartition>
+}
+
+type MenuRow = {
+  partition: string
+  country: string | null
+  chain: string
+  name: string
+  sizeLabel: string
+  grams: number | null
+  ml: number | null
+  calories: number | null
+  protein_g: number | null
+  carbs_g: number | null
+  fat_g: number | null
+  fiber_g: number | null
+  sugar_g: number | null
+  sourceUrl: string | null
+}
+
+// Cache is keyed on a stat signature of the CSV + manifest, so an import is
+// visible on the next call and an unchanged file is never re-read.
+let cachedSignature = ''
+let cachedGeneration: number | null = null
+let cachedHeaders: string[] = []
+let cachedPartitions = new Map<string, { sha256: string; rows: MenuRow[] }>()
 let cachedItems: FastFoodMenuItem[] = []
 
 const parseCsvLine = (line: string): string[] => {
@@ -56,13 +97,14 @@ const parseCsvLine = (line: string): string[] => {
   return cells.map((cell) => cell.trim())
 }
 
-const parseCsv = (filePath: string) => {
-  if (!fs.existsSync(filePath)) return { headers: [] as string[], records: [] as string[][] }
-  const content = fs.readFileSync(filePath, 'utf8')
-  const rows = content
+const splitCsvLines = (content: string) =>
+  content
     .split(/\r?\n/)
     .map((line) => line.trim())
     .filter((line) => line.length > 0)
+
+const parseCsvContent = (content: string) => {
+  const rows = splitCsvLines(content)
   if (rows.length === 0) return { headers: [] as string[], records: [] as string[][] }
   const headers = parseCsvLine(rows[0]).map((header) => header.toLowerCase())
   const records = rows.slice(1).map((line) => parseCsvLine(line))
@@ -84,19 +126,33 @@ const buildServingLabel = (sizeLabel: string, grams: number | null, ml: number |
   return label || '1 serving'
 }
 
-export const loadFastFoodMenuItems = () => {
-  const now = Date.now()
-  if (cachedItems.length > 0 && now - cachedAt < CACHE_TTL_MS) return cachedItems
-
-  const parsed = parseCsv(DATA_PATH)
-  if (!parsed.records.length) {
-    cachedItems = []
-    cachedAt = now
-    return cachedItems
+const statSignature = (filePath: string) => {
+  try {
+    const stat = fs.statSync(filePath)
+    return `${stat.size}:${stat.mtimeMs}`
+  } catch {
+    return 'missing'
+  }
+}
+
+const readManifest = (): Manifest | null => {
+  try {
+    const manifest = JSON.parse(fs.readFileSync(MANIFEST_PATH, 'utf8')) as Manifest
+    if (manifest?.version !== 1 || !manifest.partitions) return null
+    return manifest
+  } catch {
+    return null
   }
+}
+
+const sha256 = (buffer: Buffer) => crypto.createHash('sha256').update(buffer).digest('hex')
 
+const partitionBytes = (buffer: Buffer, partition: ManifestPartition) =>
+  Buffer.concat(partition.ranges.map(([start, end]) => buffer.subarray(start, end)))
+
+const recordsToRows = (headers: string[], records: string[][]) => {
   const headerIndex = new Map<string, number>()
-  parsed.headers.forEach((header, index) => headerIndex.set(header, index))
+  headers.forEach((header, index) => headerIndex.set(header, index))
 
   const get = (row: string[], key: string) => {
     const idx = headerIndex.get(key)
@@ -104,24 +160,8 @@ export const loadFastFoodMenuItems = () => {
     return row[idx] ?? ''
   }
 
-  type Row = {
-    country: string | null
-    chain: string
-    name: string
-    sizeLabel: string
-    grams: number | null
-    ml: number | null
-    calories: number | null
-    protein_g: number | null
-    carbs_g: number | null
-    fat_g: number | null
-    fiber_g: number | null
-    sugar_g: number | null
-    sourceUrl: string | null
-  }
-
-  const rows: Row[] = []
-  for (const record of parsed.records) {
+  const rows: MenuRow[] = []
+  for (const record of records) {
     const chain = String(get(record, 'chain') || '').trim()
     const name = String(get(record, 'item') || '').trim()
     const sizeLabel = String(get(record, 'size_label') || get(record, 'size') || '').trim()
@@ -133,6 +173,7 @@ export const loadFastFoodMenuItems = () => {
     if (calories == null || protein == null || carbs == null || fat == null) continue
     const country = String(get(record, 'country') || '').trim().toUpperCase() || null
     rows.push({
+      partition: `${String(get(record, 'country') || '').trim()}|${chain}`,
       country,
       chain,
       name,
@@ -148,7 +189,78 @@ export const loadFastFoodMenuItems = () => {
       sourceUrl: String(get(record, 'source_url') || '').trim() || null,
     })
   }
+  return rows
+}
+
+// Full parse. When the manifest matches this CSV, also remember each partition's
+// rows + hash so the next import only has to re-read what changed.
+const loadAllRows = (manifest: Manifest | null) => {
+  cachedHeaders = []
+  cachedPartitions = new Map()
+  cachedGeneration = null
+  if (!fs.existsSync(DATA_PATH)) return [] as MenuRow[]
+
+  const buffer = fs.readFileSync(DATA_PATH)
+  const parsed = parseCsvContent(buffer.toString('utf8'))
+  const rows = recordsToRows(parsed.headers, parsed.records)
+  cachedHeaders = parsed.headers
+
+  if (manifest && manifest.csv_bytes === buffer.length) {
+    const byPartition = new Map<string, MenuRow[]>()
+    for (const row of rows) {
+      const list = byPartition.get(row.partition)
+      if (list) list.push(row)
+      else byPartition.set(row.partition, [row])
+    }
+    for (const [key, partition] of Object.entries(manifest.partitions)) {
+      // Only trust partitions whose bytes still hash to the manifest value.
+      if (sha256(partitionBytes(buffer, partition)) !== partition.sha256) continue
+      cachedPartitions.set(key, { sha256: partition.sha256, rows: byPartition.get(key) ?? [] })
+    }
+    cachedGeneration = manifest.generation
+  }
+  return rows
+}
+
+// Newer manifest generation: re-read and re-parse only partitions whose hash changed.
+// Returns null when anything looks off, so the caller falls back to a full parse.
+const loadChangedPartitions = (manifest: Manifest): MenuRow[] | null => {
+  if (!cachedHeaders.length) return null
+  let fd: number | null = null
+  try {
+    if (fs.statSync(DATA_PATH).size !== manifest.csv_bytes) return null
+    const next = new Map<string, { sha256: string; rows: MenuRow[] }>()
+    const ordered = Object.entries(manifest.partitions).sort(
+      ([, a], [, b]) => (a.ranges[0]?.[0] ?? 0) - (b.ranges[0]?.[0] ?? 0),
+    )
+    for (const [key, partition] of ordered) {
+      const cached = cachedPartitions.get(key)
+      if (cached && cached.sha256 === partition.sha256) {
+        next.set(key, cached)
+        continue
+      }
+      if (fd == null) fd = fs.openSync(DATA_PATH, 'r')
+      const chunks = partition.ranges.map(([start, end]) => {
+        const chunk = Buffer.alloc(end - start)
+        fs.readSync(fd as number, chunk, 0, chunk.length, start)
+        return chunk
+      })
+      const bytes = Buffer.concat(chunks)
+      if (sha256(bytes) !== partition.sha256) return null
+      const records = splitCsvLines(bytes.toString('utf8')).map((line) => parseCsvLine(line))
+      next.set(key, { sha256: partition.sha256, rows: recordsToRows(cachedHeaders, records) })
+    }
+    cachedPartitions = next
+    cachedGeneration = manifest.generation
+    return Array.from(next.values()).flatMap((partition) => partition.rows)
+  } catch {
+    return null
+  } finally {
+    if (fd != null) fs.closeSync(fd)
+  }
+}
 
+const groupRows = (rows: MenuRow[]) => {
   const grouped = new Map<string, FastFoodMenuItem>()
   for (const row of rows) {
     const key = `${row.country || ''}|${normalizeText(row.chain)}|${normalizeText(row.name)}`
@@ -182,7 +294,7 @@ export const loadFastFoodMenuItems = () => {
     }
   }
 
-  const items = Array.from(grouped.values()).map((item) => {
+  return Array.from(grouped.values()).map((item) => {
     const sortedOptions = [...item.servingOptions].sort((a, b) => {
       const aSize = a.grams ?? a.ml ?? 0
       const bSize = b.grams ?? b.ml ?? 0
@@ -191,8 +303,22 @@ export const loadFastFoodMenuItems = () => {
     })
     return { ...item, servingOptions: sortedOptions }
   })
+}
+
+export const loadFastFoodMenuItems = () => {
+  const signature = `${statSignature(DATA_PATH)}|${statSignature(MANIFEST_PATH)}`
+  if (signature === cachedSignature) return cachedItems
+
+  const manifest = readManifest()
+  // Partial reload only when an import advanced the generation; a CSV edited without
+  // a new manifest (same or older generation) gets a full parse.
+  const partial =
+    manifest && cachedGeneration != null && manifest.generation > cachedGeneration
+      ? loadChangedPartitions(manifest)
+      : null
+  const rows = partial ?? loadAllRows(manifest)
 
-  cachedItems = items
-  cachedAt = now
+  cachedItems = groupRows(rows)
+  cachedSignature = signature
   return cachedItems
 }
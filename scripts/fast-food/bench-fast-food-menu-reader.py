@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the chunked parallel menu reader against the serial one.
+
+    python3 scripts/fast-food/generate-synthetic-fast-food-menus.py --rows 2000000 --out /tmp/load/menus.csv
+    python3 scripts/fast-food/bench-fast-food-menu-reader.py --csv /tmp/load/menus.csv [--workers 1,2,4,8]
+
+Times iter_menu_records() (the serial reader every stage used to share) and
+read_menu_columns() at each worker count (default: powers of two up to the CPU
+count), best of --runs. Every result is checked against the serial records
+before it is reported. Speedup is relative to the serial iter_menu_records()
+run, so a configuration only wins if it beats what callers would otherwise
+do; efficiency is that speedup per worker.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from fast_food_import.reader import read_menu_columns
+from fast_food_import.storage import iter_menu_records
+
+
+def _best_of(runs: int, fn: Callable[[], object]) -> Tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(runs):
+        result = None  # let the previous run's rows go before timing the next
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def _worker_counts(spec: str) -> List[int]:
+    if spec:
+        return sorted({int(w) for w in spec.split(",")})
+    cpus, counts = os.cpu_count() or 1, [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--csv", required=True, help="Menu CSV to read")
+    ap.add_argument("--workers", default="", help="Comma-separated worker counts (default: 1, 2, 4, ... up to the CPUs)")
+    ap.add_argument("--runs", type=int, default=3, help="Timed runs per configuration (best is reported)")
+    args = ap.parse_args()
+
+    if not os.path.exists(args.csv):
+        print(f"CSV not found: {args.csv}", file=sys.stderr)
+        return 2
+
+    serial_s, serial = _best_of(args.runs, lambda: list(iter_menu_records(args.csv))[1:])
+    assert isinstance(serial, list)
+    size_mb = os.path.getsize(args.csv) / 1e6
+    print(f"# {args.csv}: {len(serial):,} records, {size_mb:.0f} MB, {os.cpu_count()} CPUs")
+    print(f"serial iter_menu_records   {serial_s:8.2f} s")
+
+    failed = False
+    for workers in _worker_counts(args.workers):
+        elapsed, columns = _best_of(args.runs, lambda: read_menu_columns(args.csv, workers))
+        same = list(columns.iter_records()) == serial  # type: ignore[attr-defined]
+        failed |= not same
+        speedup = serial_s / elapsed
+        print(
+            f"read_menu_columns w={workers:<3} {elapsed:8.2f} s  {speedup:5.2f}x  "
+            f"{speedup / workers * 100:4.0f}% efficiency  {'same records' if same else 'RECORDS DIFFER'}"
+        )
+
+    if failed:
+        print("The parallel reader disagreed with the serial one.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
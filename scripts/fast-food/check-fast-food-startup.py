@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Measures startup of the fast-food CLIs on paths that parse no PDF, and fails if
+one is over budget or loads a heavy dependency.
+
+    python3 scripts/fast-food/check-fast-food-startup.py [--runs 9] [--budget-ms 60]
+
+Covered: --help of every script, an importer refusing bad CSV headers, an
+importer with nothing to retry, and `import fast_food_import.api`. Each median
+wall time is reported next to a bare `python3 -c pass` (interpreter + site
+startup, which no script can avoid); the budget applies to the difference.
+Imports come from `python3 -X importtime`, minus whatever site already loads.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Sequence, Set, Tuple
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Milliseconds a non-parsing command may add on top of a bare interpreter.
+STARTUP_BUDGET_MS = 60.0
+
+# Only the code paths that parse, fetch or write Parquet may import these.
+HEAVY_MODULES = ("pdfplumber", "pdfminer", "PIL", "requests", "urllib3", "pyarrow", "multiprocessing")
+
+MENU_HEADER = "country,chain,item,size_label,grams,ml,calories,protein_g,carbs_g,fat_g,fiber_g,sugar_g,source_url\n"
+MACROS_HEADER = "food,per_100g_kcal,protein_g,carbs_g,fat_g,fibre_g,sugar_g\n"
+
+Command = Tuple[str, List[str], int]  # (label, argv after the interpreter, expected exit code)
+
+
+def _commands(tmp: str) -> List[Command]:
+    menus, bad, macros, pdf = (os.path.join(tmp, n) for n in ("menus.csv", "bad.csv", "macros.csv", "dummy.pdf"))
+    for path, text in ((menus, MENU_HEADER), (bad, "food," + MENU_HEADER), (macros, MACROS_HEADER)):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    with open(pdf, "wb") as f:
+        f.write(b"%PDF-1.4\n")  # never parsed on these paths
+
+    core = "import-mcdonalds-au-core-food-menu-jan-2026.py"
+    files = ["--csv", menus, "--macros-csv", macros, "--pdf", pdf]
+    out: List[Command] = [
+        (f"{name} --help", [name, "--help"], 0)
+        for name in sorted(os.listdir(SCRIPTS_DIR))
+        if name.endswith(".py") and name != os.path.basename(__file__)
+    ]
+    out += [
+        (f"{core} (bad headers)", [core, "--csv", bad, "--macros-csv", macros, "--pdf", pdf], 2),
+        (
+            f"{core} (nothing to retry)",
+            [core, *files, "--quarantine-report", os.path.join(tmp, "q.json"), "--retry-quarantined"],
+            0,
+        ),
+        ("import fast_food_import.api", ["-c", "import fast_food_import.api"], 0),
+        (
+            "load every source",
+            ["-c", "from fast_food_import.sources import SOURCES, load_source; [load_source(s) for s in SOURCES]"],
+            0,
+        ),
+    ]
+    return out
+
+
+def _run(argv: Sequence[str], flags: Sequence[str] = ()) -> Tuple[int, float, str]:
+    t0 = time.perf_counter()
+    p = subprocess.run([sys.executable, *flags, *argv], cwd=SCRIPTS_DIR, capture_output=True, text=True)
+    return p.returncode, time.perf_counter() - t0, p.stderr
+
+
+def _median_ms(argv: Sequence[str], runs: int) -> float:
+    return statistics.median(_run(argv)[1] for _ in range(runs)) * 1000
+
+
+def _imports(argv: Sequence[str]) -> Set[str]:
+    _, _, err = _run(argv, ("-X", "importtime"))
+    names = set()
+    for line in err.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            if name != "package":  # the column header line
+                names.add(name.split(".")[0])
+    return names
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=9, help="Timed runs per command (median is reported)")
+    ap.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS, help="Allowed ms over a bare interpreter")
+    args = ap.parse_args()
+
+    base_ms = _median_ms(["-c", "pass"], args.runs)
+    base_imports = _imports(["-c", "pass"])
+    print(f"# python3 -c pass: {base_ms:.0f} ms (median of {args.runs})")
+
+    failed = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, argv, expected_rc in _commands(tmp):
+            rc, _, err = _run(argv)
+            heavy = sorted((_imports(argv) - base_imports) & set(HEAVY_MODULES))
+            over = _median_ms(argv, args.runs) - base_ms
+            problems = []
+            if rc != expected_rc:
+                problems.append(f"exit {rc}, expected {expected_rc}: {err.strip()[-200:]}")
+            if over > args.budget_ms:
+                problems.append(f"over the {args.budget_ms:.0f} ms budget")
+            if heavy:
+                problems.append(f"imports {', '.join(heavy)}")
+            print(f"{'FAIL' if problems else 'ok  '} {over:+6.0f} ms  {label}")
+            for p in problems:
+                print(f"       {p}")
+            failed += bool(problems)
+
+    if failed:
+        print(f"{failed} command(s) failed the startup check.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
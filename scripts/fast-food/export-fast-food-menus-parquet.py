@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Exports data/food-overrides/fast_food_menus.csv as a Parquet file for analytics.
+
+One row group per (country, chain), numeric columns as float64, repeated
+strings dictionary-encoded. Readers can then load only the chains and columns
+they need, e.g.
+
+    pq.read_table(path, columns=["item", "calories"], filters=[("chain", "=", "KFC")])
+
+Requires pyarrow (pip install pyarrow).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+from fast_food_import.parquet import write_menu_parquet_from_csv
+
+
+CSV_DEFAULT = os.path.join("data", "food-overrides", "fast_food_menus.csv")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--csv", default=CSV_DEFAULT, help="Path to fast_food_menus.csv")
+    ap.add_argument("--out", required=True, help="Output .parquet path")
+    args = ap.parse_args()
+
+    if not os.path.exists(args.csv):
+        print(f"CSV not found: {args.csv}", file=sys.stderr)
+        return 2
+
+    try:
+        groups = write_menu_parquet_from_csv(args.csv, args.out)
+    except (RuntimeError, ValueError) as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+
+    print(f"Wrote {args.out} ({groups} country/chain row groups)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,6 @@
+"""
+Shared helpers for the fast-food menu importers in scripts/fast-food/.
+
+The import-*.py scripts add this directory to sys.path implicitly (Python puts
+the script's folder first), so they can simply `import fast_food_import`.
+"""
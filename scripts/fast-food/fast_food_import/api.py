@@ -0,0 +1,138 @@
+"""
+In-process API for the fast-food menu importers.
+
+The import-*.py scripts are CLIs; other tooling can drive the same code without
+spawning them (scripts/fast-food must be on sys.path):
+
+    from fast_food_import import api
+
+    for batch in api.iter_extract("mcdonalds-au-core", "core-menu.pdf"):
+        ...  # RowBatch, rows as their tables complete (at most one batch per page)
+    rows = api.extract("guzman-y-gomez-au", pdf_bytes)
+    result = api.merge("data/food-overrides/fast_food_menus.csv", rows)
+    problems = api.validate("data/food-overrides/fast_food_menus.csv")
+
+Sources are the parsers in fast_food_import/sources/, the same ones the CLIs
+use; a source's module is imported on first use.
+
+Neither importing this module nor a non-parsing CLI command (--help, header
+checks, "nothing to retry") loads a PDF, HTTP or Parquet library: pdfplumber /
+pdfminer load when a page is parsed, requests when a remote PDF is fetched,
+pyarrow when Parquet is written. check-fast-food-startup.py enforces that and
+the startup budget.
+"""
+
+from __future__ import annotations
+
+import io
+from typing import Any, Collection, Dict, Iterator, List, Optional, Tuple
+
+from .backends import PdfSource, compare_backends
+from .merge import MergeResult, merge_menu_rows
+from .pages import DEFAULT_PAGE_BUDGET_S, QuarantineReport
+from .reader import read_menu_columns
+from .rows import MENU_HEADERS, RowBatch, check_menu_headers
+from .sources import load_source
+from .storage import read_menu_headers
+
+
+def iter_extract(
+    source: str,
+    pdf: PdfSource,
+    *,
+    source_url: Optional[str] = None,
+    backend: Optional[str] = None,
+    page_budget_s: Optional[float] = DEFAULT_PAGE_BUDGET_S,
+    quarantine: Optional[QuarantineReport] = None,
+    only_pages: Optional[Collection[int]] = None,
+    with_boxes: bool = False,
+) -> Iterator[RowBatch]:
+    """
+    Parse `pdf` with `source`'s importer, yielding rows as their tables complete.
+
+    Defaults match the CLI: the source's own text backend and source URL, and a
+    per-page time budget (page_budget_s=0 parses in this process).
+    """
+    importer = load_source(source)
+    kwargs: Dict[str, Any] = dict(
+        page_budget_s=page_budget_s,
+        quarantine=quarantine,
+        only_pages=only_pages,
+        backend=backend or importer.TEXT_BACKEND,
+        with_boxes=with_boxes,
+    )
+    if source_url is not None:
+        kwargs["source_url"] = source_url
+    return importer.iter_rows(pdf, **kwargs)
+
+
+def extract(source: str, pdf: PdfSource, **kwargs: Any) -> RowBatch:
+    """All rows of `pdf` in one batch; keyword arguments as for iter_extract()."""
+    rows: Optional[RowBatch] = None
+    for batch in iter_extract(source, pdf, **kwargs):
+        if rows is None:
+            rows = batch
+        else:
+            rows.extend(batch)
+    return rows if rows is not None else RowBatch()
+
+
+def merge(csv_path: str, batch: RowBatch, after: Optional[Tuple[str, str]] = None) -> MergeResult:
+    """
+    Add rows whose (country, chain, item, size_label) key isn't in `csv_path` yet.
+
+    `after` is the (country, chain) partition to insert behind; defaults to the
+    first row's. Raises ValueError if the file's headers aren't MENU_HEADERS.
+    """
+    err = io.StringIO()
+    if not check_menu_headers(read_menu_headers(csv_path), err):
+        raise ValueError(err.getvalue().strip())
+    if after is None:
+        after = (batch.country[0], batch.chain[0]) if len(batch) else ("", "")
+    return merge_menu_rows(csv_path, batch, after)
+
+
+def validate(csv_path: str, workers: Optional[int] = None) -> List[str]:
+    """
+    Problems in a menu file; an empty list means it is valid.
+
+    Checks the exact headers, the cell count of every record, that numeric cells
+    are numbers, and that no (country, chain, item, size_label) key repeats.
+    Records are parsed by the chunked parallel reader (`workers` processes,
+    default every CPU; see reader.py).
+    """
+    err = io.StringIO()
+    if not check_menu_headers(read_menu_headers(csv_path), err):
+        return err.getvalue().splitlines()
+    columns = read_menu_columns(csv_path, workers)
+
+    # (record, column) -> problem, so the report reads in file order.
+    found: List[Tuple[int, int, str]] = []
+    width = len(MENU_HEADERS)
+    for i, cells in columns.irregular.items():
+        found.append((i, 0, f"record {i + 1}: {len(cells)} cells, expected {width}"))
+    # Only cells kept verbatim can fail to parse; format_tenths() spelled the rest.
+    for (i, c), text in columns.verbatim.items():
+        try:
+            float(text)
+        except ValueError:
+            found.append((i, c, f"record {i + 1}: {MENU_HEADERS[c]}={text!r} is not a number"))
+
+    keys = columns.keys()
+    regular = [i for i in range(len(keys)) if i not in columns.irregular] if columns.irregular else range(len(keys))
+    # Built back to front, so each key ends up mapped to its first record.
+    first_seen = dict(zip((keys[i] for i in reversed(regular)), reversed(regular)))
+    if len(first_seen) < len(regular):
+        for i in regular:
+            first = first_seen[keys[i]]
+            if first != i:
+                key = " / ".join(keys[i])
+                found.append((i, width, f"record {i + 1}: duplicate key {key} (first at record {first + 1})"))
+
+    found.sort(key=lambda p: p[:2])
+    return [p[2] for p in found]
+
+
+def validate_backend(source: str, pdf: PdfSource, backend: str, **kwargs: Any) -> List[str]:
+    """Row differences between the reference backend and `backend` (see compare_backends)."""
+    return compare_backends(lambda b: extract(source, pdf, backend=b, **kwargs), backend)
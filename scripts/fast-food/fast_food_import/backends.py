@@ -0,0 +1,420 @@
+"""
+Text-extraction backends for the menu importers.
+
+Every importer works on plain page text (one table row per line), so the
+backend only has to answer "how many pages" and "text of page i":
+
+- "pdfplumber" (reference): pdfplumber's default extract_text(). Parses every
+  object on the page (chars, images, curves, rects) before clustering chars.
+- "pdfminer": pdfminer layout analysis with tuned LAParams, and a device that
+  drops paths and images instead of building LTCurve/LTRect/LTImage objects.
+  Text lines are regrouped into visual rows so tables read like pdfplumber's.
+- "raw": no layout analysis at all; chars are emitted in content-stream order
+  and split into lines on baseline changes. Only for PDFs whose stream order
+  already matches reading order.
+
+page_lines() also returns each text line's bounding box (used to record row
+provenance), and region_text() re-extracts just one box of a page.
+
+Opening a document doesn't build its pages: the page count comes from the
+root /Pages /Count and a page's objects are only resolved when it is
+extracted (_PageTree). Over a RemotePdf that is what keeps a page-selective
+run from fetching the whole file.
+
+All backends decode fonts through fonts.FONT_CACHE, so a font embedded in
+several documents (or opened twice) is decoded once.
+
+Before switching a source away from the reference backend, run its importer
+with --validate-backend: it extracts with both and refuses a backend whose rows
+differ (see compare_backends).
+"""
+
+from __future__ import annotations
+
+import io
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .macros import macro_records
+from .remote import RemotePdf
+from .rows import RowBatch
+
+
+# A local path, the file's bytes, or a lazily fetched remote PDF (remote.py).
+PdfSource = Union[str, bytes, RemotePdf]
+
+# (x0, top, x1, bottom) in PDF points, top measured from the top of the page.
+BBox = Tuple[float, float, float, float]
+
+
+REFERENCE_BACKEND = "pdfplumber"
+
+# Tuned for nutrition tables: keep a table row's cells on one line, don't waste
+# time on vertical text, and don't group lines into boxes (we regroup by row).
+TUNED_LAPARAMS = dict(
+    line_overlap=0.5,
+    char_margin=3.0,
+    word_margin=0.1,
+    line_margin=0.3,
+    boxes_flow=None,
+    detect_vertical=False,
+    all_texts=False,
+)
+
+# Two text lines whose baselines are this close (in points) are the same row.
+ROW_TOLERANCE = 3.0
+
+
+def _open_stream(source: PdfSource) -> Any:
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if isinstance(source, RemotePdf):
+        return source.open()
+    return open(source, "rb")
+
+
+class TextDocument(ABC):
+    """An open PDF as seen by the importers: a page count and per-page text."""
+
+    page_count: int = 0
+
+    @abstractmethod
+    def page_text(self, page_index: int) -> str:
+        """Text of one page, a line per table row."""
+
+    def page_lines(self, page_index: int) -> Tuple[str, Optional[List[BBox]]]:
+        """Page text plus the bbox of each of its lines (None if they can't be aligned)."""
+        return self.page_text(page_index), None
+
+    def region_text(self, page_index: int, bbox: BBox) -> str:
+        """Text of the lines whose vertical centre lies inside `bbox`."""
+        text, boxes = self.page_lines(page_index)
+        if boxes is None:
+            return text
+        x0, top, x1, bottom = bbox
+        keep = [
+            line
+            for line, (lx0, ltop, lx1, lbottom) in zip(text.split("\n"), boxes)
+            if top <= (ltop + lbottom) / 2 <= bottom and lx1 >= x0 and lx0 <= x1
+        ]
+        return "\n".join(keep)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "TextDocument":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class _PageTree:
+    """
+    The pages of a pdfminer PDFDocument, each built the first time it is asked for.
+
+    PDFPage.create_pages() builds every page, and building a PDFPage resolves
+    its content streams. Here page i is found by walking down from the root
+    /Pages node, skipping subtrees by their /Count, so only the nodes on its
+    branch and its own objects are read. A tree whose counts don't add up
+    falls back to create_pages().
+    """
+
+    def __init__(self, doc: Any) -> None:
+        from pdfminer.pdftypes import dict_value, int_value, resolve1
+
+        self._doc = doc
+        self._built: Dict[int, Any] = {}
+        self._all: Optional[List[Any]] = None
+        try:
+            self._root = dict_value(doc.catalog["Pages"])
+            self.count = int_value(resolve1(self._root["Count"]))
+        except Exception:
+            self._fall_back()
+
+    def _fall_back(self) -> None:
+        from pdfminer.pdfpage import PDFPage
+
+        self._all = list(PDFPage.create_pages(self._doc))
+        self.count = len(self._all)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Any:
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        if self._all is not None:
+            return self._all[index]
+        page = self._built.get(index)
+        if page is None:
+            try:
+                page = self._find(index)
+            except (IndexError, KeyError, TypeError, ValueError):
+                self._fall_back()
+                return self[index]
+            self._built[index] = page
+        return page
+
+    def _find(self, index: int) -> Any:
+        from pdfminer.pdfpage import LITERAL_PAGE, LITERAL_PAGES, PDFPage
+        from pdfminer.pdftypes import dict_value, int_value, list_value, resolve1
+
+        inheritable = PDFPage.INHERITABLE_ATTRS
+        inherited = {k: v for k, v in self._doc.catalog.items() if k in inheritable}
+        node = self._root
+        for _ in range(64):  # depth bound; also stops a cyclic tree
+            inherited.update((k, v) for k, v in node.items() if k in inheritable)
+            kids = list_value(node["Kids"])
+            # A node with as many kids as pages only has leaves (unless it holds empty
+            # /Pages nodes, which the type check below catches in the common case).
+            if int_value(resolve1(node["Count"])) == len(kids):
+                ref = kids[index]
+                props = dict_value(ref)
+                if props.get("Type") is LITERAL_PAGE:
+                    return PDFPage(self._doc, ref.objid, {**inherited, **props}, None)
+            for ref in kids:
+                props = dict_value(ref)
+                kind = props.get("Type")
+                if kind is LITERAL_PAGES:
+                    count = int_value(resolve1(props["Count"]))
+                    if index < count:
+                        node = props
+                        break
+                    index -= count
+                elif kind is LITERAL_PAGE:
+                    if index == 0:
+                        return PDFPage(self._doc, ref.objid, {**inherited, **props}, None)
+                    index -= 1
+            else:
+                raise IndexError(index)
+        raise IndexError(index)
+
+
+class _PlumberDocument(TextDocument):
+    def __init__(self, source: PdfSource) -> None:
+        import pdfplumber
+
+        from .fonts import resource_manager
+
+        self._fp = _open_stream(source)
+        self._pdf = pdfplumber.open(self._fp)
+        # Pages interpret through pdf.rsrcmgr; swap in the cross-document font cache.
+        self._pdf.rsrcmgr = resource_manager()
+        # Never touch pdf.pages: it builds (and resolves) every page.
+        self._tree = _PageTree(self._pdf.doc)
+        self.page_count = len(self._tree)
+
+    def _page(self, page_index: int) -> Any:
+        from pdfplumber.page import Page
+
+        # initial_doctop only offsets the doctop coordinates, which nothing here reads.
+        return Page(self._pdf, self._tree[page_index], page_number=page_index + 1)
+
+    def page_text(self, page_index: int) -> str:
+        page = self._page(page_index)
+        text = page.extract_text() or ""
+        # Drop the page's parsed objects; long runs otherwise keep every page in memory.
+        if hasattr(page, "close"):
+            page.close()
+        return text
+
+    def page_lines(self, page_index: int) -> Tuple[str, Optional[List[BBox]]]:
+        page = self._page(page_index)
+        # Same char clustering as extract_text(), whose text is these lines joined
+        # by "\n"; one pass instead of clustering the page twice.
+        lines = page.extract_text_lines(return_chars=False)
+        if hasattr(page, "close"):
+            page.close()
+        text = "\n".join(ln["text"] for ln in lines)
+        return text, [(ln["x0"], ln["top"], ln["x1"], ln["bottom"]) for ln in lines]
+
+    def region_text(self, page_index: int, bbox: BBox) -> str:
+        page = self._page(page_index)
+        x0, top, x1, bottom = bbox
+        pad = ROW_TOLERANCE
+        region = (
+            max(0.0, x0 - pad),
+            max(0.0, top - pad),
+            min(float(page.width), x1 + pad),
+            min(float(page.height), bottom + pad),
+        )
+        text = page.crop(region, strict=False).extract_text() or ""
+        if hasattr(page, "close"):
+            page.close()
+        return text
+
+    def close(self) -> None:
+        # Not pdf.close(): it walks pdf.pages to close them, building every page first.
+        self._pdf.flush_cache()
+        self._fp.close()
+
+
+class _MinerDocument(TextDocument):
+    def __init__(self, source: PdfSource, laparams: Optional[Dict[str, Any]]) -> None:
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfparser import PDFParser
+
+        from .fonts import resource_manager
+
+        self._fp = _open_stream(source)
+        self._pages = _PageTree(PDFDocument(PDFParser(self._fp)))
+        self.page_count = len(self._pages)
+        # One resource manager per document so fonts are decoded once, not per page;
+        # it also shares decoded fonts across documents (fonts.py).
+        self._rsrcmgr = resource_manager()
+        self._laparams = LAParams(**laparams) if laparams is not None else None
+
+    def _layout(self, page_index: int):
+        from pdfminer.pdfinterp import PDFPageInterpreter
+
+        device = _text_only_aggregator(self._rsrcmgr, self._laparams)
+        PDFPageInterpreter(self._rsrcmgr, device).process_page(self._pages[page_index])
+        return device.get_result()
+
+    def page_text(self, page_index: int) -> str:
+        return self.page_lines(page_index)[0]
+
+    def page_lines(self, page_index: int) -> Tuple[str, Optional[List[BBox]]]:
+        from pdfminer.layout import LTTextLine
+
+        layout = self._layout(page_index)
+        lines: List[_Line] = []
+        stack = list(layout)
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, LTTextLine):
+                text = obj.get_text().strip()
+                if text:
+                    lines.append((obj.y0, obj.x0, text, obj.x1, obj.y1))
+            elif hasattr(obj, "__iter__"):
+                stack.extend(obj)
+        rows = _join_rows(lines, layout.height)
+        return "\n".join(t for t, _ in rows), [b for _, b in rows]
+
+    def close(self) -> None:
+        self._fp.close()
+
+
+class _RawDocument(_MinerDocument):
+    def __init__(self, source: PdfSource) -> None:
+        super().__init__(source, laparams=None)
+
+    def page_lines(self, page_index: int) -> Tuple[str, Optional[List[BBox]]]:
+        from pdfminer.layout import LTChar
+
+        layout = self._layout(page_index)
+        out: List[Tuple[str, BBox]] = []
+        line: List[str] = []
+        box: List[float] = []
+        prev: Optional[LTChar] = None
+
+        def flush() -> None:
+            text = "".join(line).strip()
+            if text:
+                out.append((text, (box[0], layout.height - box[3], box[2], layout.height - box[1])))
+
+        for obj in layout:
+            if not isinstance(obj, LTChar):
+                continue
+            if prev is not None:
+                if abs(obj.y0 - prev.y0) > ROW_TOLERANCE:
+                    flush()
+                    line, box = [], []
+                elif obj.x0 - prev.x1 > 0.25 * max(obj.width, prev.width, 1.0):
+                    line.append(" ")
+            line.append(obj.get_text())
+            box = _grow(box, (obj.x0, obj.y0, obj.x1, obj.y1))
+            prev = obj
+        if line:
+            flush()
+        return "\n".join(t for t, _ in out), [b for _, b in out]
+
+
+# A pdfminer text line: (y0, x0, text, x1, y1), PDF coordinates (origin bottom-left).
+_Line = Tuple[float, float, str, float, float]
+
+
+def _grow(box: List[float], other: Tuple[float, float, float, float]) -> List[float]:
+    if not box:
+        return list(other)
+    return [min(box[0], other[0]), min(box[1], other[1]), max(box[2], other[2]), max(box[3], other[3])]
+
+
+def _join_rows(lines: List[_Line], page_height: float) -> List[Tuple[str, BBox]]:
+    # Top-to-bottom, then left-to-right; lines within ROW_TOLERANCE share a row.
+    lines.sort(key=lambda t: (-t[0], t[1]))
+    rows: List[List[_Line]] = []
+    for ln in lines:
+        if rows and abs(rows[-1][0][0] - ln[0]) <= ROW_TOLERANCE:
+            rows[-1].append(ln)
+        else:
+            rows.append([ln])
+    out: List[Tuple[str, BBox]] = []
+    for row in rows:
+        row.sort(key=lambda t: t[1])
+        box: List[float] = []
+        for y0, x0, _, x1, y1 in row:
+            box = _grow(box, (x0, y0, x1, y1))
+        out.append((" ".join(t[2] for t in row), (box[0], page_height - box[3], box[2], page_height - box[1])))
+    return out
+
+
+def _text_only_aggregator(rsrcmgr, laparams):
+    from pdfminer.converter import PDFPageAggregator
+
+    class _TextOnlyAggregator(PDFPageAggregator):
+        # Nutrition tables are all text; skip building curve/rect/image objects.
+        def paint_path(self, gstate, stroke, fill, evenodd, path):  # type: ignore[override]
+            return None
+
+        def render_image(self, name, stream):  # type: ignore[override]
+            return None
+
+    return _TextOnlyAggregator(rsrcmgr, laparams=laparams)
+
+
+BACKENDS: Dict[str, Callable[[PdfSource], TextDocument]] = {
+    "pdfplumber": _PlumberDocument,
+    "pdfminer": lambda source: _MinerDocument(source, TUNED_LAPARAMS),
+    "raw": _RawDocument,
+}
+
+
+def open_document(source: PdfSource, backend: str = REFERENCE_BACKEND) -> TextDocument:
+    try:
+        factory = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown text backend {backend!r} (choose from {', '.join(sorted(BACKENDS))})")
+    return factory(source)
+
+
+def compare_backends(extract: Callable[[str], RowBatch], backend: str) -> List[str]:
+    """
+    Extract with the reference backend and with `backend`; return row differences.
+
+    Compares the menu rows and the per-100g macro rows (macros.py) built from
+    them. An empty list means the backend is safe to use for that source.
+    """
+    ref = extract(REFERENCE_BACKEND)
+    got = extract(backend)
+    return _diff_records(list(ref.iter_records()), list(got.iter_records()), "") + _diff_records(
+        macro_records(ref), macro_records(got), "macros "
+    )
+
+
+def _diff_records(ref_rows: List[List[str]], got_rows: List[List[str]], kind: str) -> List[str]:
+    ref = [tuple(r) for r in ref_rows]
+    got = [tuple(r) for r in got_rows]
+    diffs: List[str] = []
+    ref_set, got_set = set(ref), set(got)
+    for r in ref:
+        if r not in got_set:
+            diffs.append(f"{kind}missing: {','.join(r)}")
+    for r in got:
+        if r not in ref_set:
+            diffs.append(f"{kind}extra:   {','.join(r)}")
+    if not diffs and ref != got:
+        diffs.append(f"same {kind}rows, different order")
+    return diffs
@@ -0,0 +1,321 @@
+"""
+Cross-document font cache for the pdfminer-based text backends.
+
+pdfminer's PDFResourceManager caches decoded fonts by object id, i.e. once per
+open document. Sibling PDFs built from one template (the McDonald's AU Core
+Food / McCafe / Dessert guides), a --validate-backend run (two opens) or
+--reverify (one open per region) decode the same fonts again every time:
+Type1 headers, ToUnicode CMaps, width tables.
+
+FontCache keys decoded PDFFont objects by a hash of the font dictionary with
+every reference resolved and every stream's bytes included (font programs,
+ToUnicode, encodings), plus the pdfminer version. The same embedded font in
+another document is a hit; a subset font with a different glyph set hashes
+differently and is decoded as usual.
+
+Tiers:
+- memory: process-wide (FONT_CACHE). Page-budget workers start from a snapshot
+  of the parent's cache and send back what they decoded (pages.py)
+- disk (optional, set_directory / --font-cache DIR): one pickle per font, so
+  separate runs share work. PDF object references are dropped when pickling
+  (a decoded font only needs them while it is being built). Only point it at
+  a directory you trust: entries are unpickled.
+
+stats() feeds the importers' run metrics.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import pickle
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, TextIO
+
+
+FONT_CACHE_VERSION = 1
+
+# Nesting guard for the key walk (font dicts are shallow; Type3 resources aren't always).
+_MAX_DEPTH = 24
+
+
+@dataclass
+class FontCacheStats:
+    lookups: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    key_s: float = 0.0  # hashing font dicts
+    decode_s: float = 0.0  # decoding the misses
+    saved_s: float = 0.0  # decode time the hits would have cost
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def add(self, other: "FontCacheStats") -> None:
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+
+@dataclass
+class _Entry:
+    font: Any
+    decode_s: float
+
+
+class FontCache:
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self.directory = directory
+        self._entries: Dict[str, _Entry] = {}
+        self._pickled: Dict[str, bytes] = {}  # received from a worker or parent, unpickled on first use
+        self._new: Dict[str, _Entry] = {}  # decoded by this process since the last export
+        self._stats = FontCacheStats()
+        self._lock = threading.Lock()
+
+    def set_directory(self, directory: Optional[str]) -> None:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory or None
+
+    def start_worker(self, directory: Optional[str], snapshot: Dict[str, bytes]) -> None:
+        # A page worker reports only its own work back (a forked one inherits the parent's stats).
+        self.set_directory(directory)
+        with self._lock:
+            self._stats = FontCacheStats()
+            self._new = {}
+        self.load(snapshot)
+
+    def stats(self) -> FontCacheStats:
+        with self._lock:
+            return FontCacheStats(**asdict(self._stats))
+
+    def merge_stats(self, stats: FontCacheStats) -> None:
+        with self._lock:
+            self._stats.add(stats)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            self._stats.lookups += 1
+            entry = self._entries.get(key)
+            if entry is None and key in self._pickled:
+                entry = _loads(self._pickled.pop(key))
+                if entry is not None:
+                    self._entries[key] = entry
+            if entry is not None:
+                self._stats.memory_hits += 1
+                self._stats.saved_s += entry.decode_s
+                return entry.font
+        entry = self._read(key)
+        with self._lock:
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._entries[key] = entry
+            self._stats.disk_hits += 1
+            self._stats.saved_s += entry.decode_s
+        return entry.font
+
+    def put(self, key: str, font: Any, decode_s: float) -> None:
+        entry = _Entry(font, decode_s)
+        with self._lock:
+            self._entries[key] = entry
+            self._new[key] = entry
+            self._stats.decode_s += decode_s
+        self._write(key, entry)
+
+    def add_key_time(self, seconds: float) -> None:
+        with self._lock:
+            self._stats.key_s += seconds
+
+    def snapshot(self) -> Dict[str, bytes]:
+        """Every cached font, pickled (for a worker process to start from)."""
+        with self._lock:
+            out = dict(self._pickled)
+            entries = list(self._entries.items())
+        for key, entry in entries:
+            data = _dumps(entry)
+            if data is not None:
+                out[key] = data
+        return out
+
+    def export_new(self) -> Dict[str, bytes]:
+        """Fonts decoded since the last export, pickled (worker -> parent)."""
+        with self._lock:
+            new, self._new = self._new, {}
+        out = {}
+        for key, entry in new.items():
+            data = _dumps(entry)
+            if data is not None:
+                out[key] = data
+        return out
+
+    def load(self, pickled: Dict[str, bytes]) -> None:
+        with self._lock:
+            for key, data in pickled.items():
+                if key not in self._entries:
+                    self._pickled[key] = data
+
+    def _path(self, key: str) -> str:
+        assert self.directory is not None
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def _read(self, key: str) -> Optional[_Entry]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                return _loads(f.read())
+        except OSError:
+            return None
+
+    def _write(self, key: str, entry: _Entry) -> None:
+        if not self.directory:
+            return
+        data = _dumps(entry)
+        if data is None:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # the disk tier is best effort
+
+
+FONT_CACHE = FontCache()
+
+
+def print_font_stats(stats: FontCacheStats, fp: TextIO) -> None:
+    if not stats.lookups:
+        return
+    rate = stats.hits / stats.lookups * 100
+    print(
+        f"# Font cache: {stats.lookups} lookups, {stats.hits} hits ({rate:.0f}%; "
+        f"{stats.memory_hits} memory, {stats.disk_hits} disk), {stats.misses} decoded "
+        f"in {stats.decode_s * 1000:.0f} ms, ~{stats.saved_s * 1000:.0f} ms saved, "
+        f"hashing {stats.key_s * 1000:.0f} ms",
+        file=fp,
+    )
+
+
+def font_key(spec: Any) -> str:
+    """Content hash of a font dictionary (references resolved, stream bytes included)."""
+    import pdfminer
+    from pdfminer.pdftypes import PDFObjRef, PDFStream
+    from pdfminer.psparser import PSKeyword, PSLiteral
+
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"v{FONT_CACHE_VERSION}|pdfminer {pdfminer.__version__}|".encode("ascii"))
+    streams_seen: Dict[int, int] = {}
+
+    def feed(obj: Any, depth: int) -> None:
+        if depth > _MAX_DEPTH:
+            h.update(b"^")
+            return
+        if isinstance(obj, PDFObjRef):
+            try:
+                obj = obj.resolve()
+            except Exception:
+                h.update(b"?")
+                return
+        if isinstance(obj, PDFStream):
+            if id(obj) in streams_seen:
+                h.update(b"@%d" % streams_seen[id(obj)])
+                return
+            streams_seen[id(obj)] = len(streams_seen)
+            h.update(b"S")
+            feed(obj.attrs, depth + 1)
+            # Raw bytes until pdfminer decodes the stream, decoded bytes after;
+            # tagged differently, so at worst that is a miss, never a false hit.
+            if obj.rawdata is not None:
+                h.update(b"r%d:" % len(obj.rawdata))
+                h.update(obj.rawdata)
+            else:
+                data = obj.data or b""
+                h.update(b"d%d:" % len(data))
+                h.update(data)
+        elif isinstance(obj, dict):
+            h.update(b"{%d" % len(obj))
+            for k in sorted(obj, key=str):
+                feed(k, depth + 1)
+                feed(obj[k], depth + 1)
+        elif isinstance(obj, (list, tuple)):
+            h.update(b"[%d" % len(obj))
+            for v in obj:
+                feed(v, depth + 1)
+        elif isinstance(obj, PSLiteral):
+            h.update(b"/" + repr(obj.name).encode("utf-8", "backslashreplace"))
+        elif isinstance(obj, PSKeyword):
+            h.update(b"k" + repr(obj.name).encode("utf-8", "backslashreplace"))
+        elif isinstance(obj, (bytes, bytearray)):
+            h.update(b"b%d:" % len(obj))
+            h.update(obj)
+        else:
+            text = repr(obj).encode("utf-8", "backslashreplace")
+            h.update(b"%s%d:" % (type(obj).__name__.encode("ascii"), len(text)))
+            h.update(text)
+
+    feed(spec, 0)
+    return h.hexdigest()
+
+
+def resource_manager(cache: Optional[FontCache] = None) -> Any:
+    """A PDFResourceManager that consults `cache` (default FONT_CACHE) before decoding a font."""
+    from pdfminer.pdfinterp import PDFResourceManager
+
+    class _CachingResourceManager(PDFResourceManager):
+        def __init__(self, cache: FontCache) -> None:
+            super().__init__(caching=True)
+            self._font_cache = cache
+
+        def get_font(self, objid: object, spec: Any) -> Any:  # type: ignore[override]
+            # Fonts without an object id (Type0 descendants) are built inside
+            # their parent's miss; ids already seen use pdfminer's own cache.
+            if not objid or objid in self._cached_fonts:
+                return super().get_font(objid, spec)
+            t0 = time.perf_counter()
+            key = font_key(spec)
+            self._font_cache.add_key_time(time.perf_counter() - t0)
+            font = self._font_cache.get(key)
+            if font is not None:
+                self._cached_fonts[objid] = font
+                return font
+            t0 = time.perf_counter()
+            font = super().get_font(objid, spec)
+            self._font_cache.put(key, font, time.perf_counter() - t0)
+            return font
+
+    return _CachingResourceManager(cache or FONT_CACHE)
+
+
+class _FontPickler(pickle.Pickler):
+    def reducer_override(self, obj: Any) -> Any:
+        from pdfminer.pdftypes import PDFObjRef, PDFStream
+
+        # References point into the source document (and would drag it along).
+        if isinstance(obj, (PDFObjRef, PDFStream)):
+            return type(None), ()
+        return NotImplemented
+
+
+def _dumps(entry: _Entry) -> Optional[bytes]:
+    buf = io.BytesIO()
+    try:
+        _FontPickler(buf, protocol=pickle.HIGHEST_PROTOCOL).dump((entry.font, entry.decode_s))
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+        return None  # memory tier only
+    return buf.getvalue()
+
+
+def _loads(data: bytes) -> Optional[_Entry]:
+    try:
+        font, decode_s = pickle.loads(data)
+    except Exception:
+        return None  # truncated, or written by an incompatible version: decode again
+    return _Entry(font, decode_s)
@@ -0,0 +1,295 @@
+"""
+Persistent key index for fast_food_menus.csv (fast_food_menus.idx).
+
+Answers "does (country, chain, item, size_label) exist?" and "where is it?"
+without parsing the CSV. The sidecar is an open-addressing hash table read
+through mmap:
+
+    header  <8s Q Q I I>   magic, csv_bytes, csv_mtime_ns, rows, nslots
+    columns (nslots each, little-endian)
+            hash Q, byte offset Q, byte length I, crc32 I
+
+Every row has two slots: one for the full key (unique) and one for
+(country, chain, item) so all sizes of an item can be listed. A lookup probes
+from hash % nslots, then reads the record at the stored offset and checks its
+crc32 and key, so a stale or colliding slot can never return the wrong row.
+The header ties the index to the CSV's size and mtime; MenuIndex.open()
+refuses a mismatched index and open_or_build() rebuilds it from the raw bytes
+(one bulk parse).
+
+A merge never rebuilds it: apply_splice() moves every slot at or after the
+splice point by the number of bytes inserted and adds the new rows' slots.
+Slots carry their hash, so growing the table never needs the CSV either.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, List, Optional, Sequence, Tuple
+
+from .menu_csv import iter_parsed_records, iter_record_spans, parse_record
+from .rows import MenuKey
+
+
+MAGIC = b"FFMIDX2\0"
+HEADER = struct.Struct("<8sQQII")
+
+# (typecode, bytes per slot) of each column, in file order.
+COLUMNS = (("Q", 8), ("Q", 8), ("I", 4), ("I", 4))
+
+_KIND_KEY = 0
+_KIND_ITEM = 1
+
+# (byte offset, byte length) of one record in the CSV.
+RecordRef = Tuple[int, int]
+
+# hash, offset, length, crc32 columns.
+Table = Tuple[Any, Any, Any, Any]
+
+
+def index_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".idx"
+
+
+def _hash(parts: Sequence[str], kind: int) -> int:
+    digest = hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).digest()
+    h = int.from_bytes(digest, "little")
+    # Low bit = slot kind; bit 1 forces non-zero so 0 can mean "empty slot".
+    return (h & ~0x3) | 0x2 | kind
+
+
+def _key_cells(cells: List[str]) -> List[str]:
+    return (cells + ["", "", "", ""])[:4]
+
+
+def _nslots(entries: int) -> int:
+    nslots = 16
+    while nslots < entries * 2:
+        nslots *= 2
+    return nslots
+
+
+def _empty_table(nslots: int) -> Table:
+    return tuple(array(code, bytes(size * nslots)) for code, size in COLUMNS)  # type: ignore[return-value]
+
+
+def _insert(table: Table, h: int, off: int, length: int, crc: int) -> None:
+    hashes, offs, lens, crcs = table
+    nslots = len(hashes)
+    i = h % nslots
+    while hashes[i]:
+        i = (i + 1) % nslots
+    hashes[i], offs[i], lens[i], crcs[i] = h, off, length, crc
+
+
+def _columns(buf: Any, nslots: int) -> Table:
+    cols = []
+    pos = HEADER.size
+    for code, size in COLUMNS:
+        raw = memoryview(buf)[pos : pos + size * nslots]
+        if sys.byteorder == "little":
+            cols.append(raw.cast(code))
+        else:
+            col = array(code, raw.tobytes())
+            col.byteswap()
+            cols.append(col)
+        pos += size * nslots
+    return tuple(cols)  # type: ignore[return-value]
+
+
+def _copy(code: str, col: Any) -> array:
+    out = array(code)
+    out.frombytes(col.cast("B") if isinstance(col, memoryview) else col.tobytes())
+    return out
+
+
+def _write(csv_path: str, csv_bytes: int, rows: int, table: Table) -> None:
+    st = os.stat(csv_path)
+    path = index_path(csv_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, csv_bytes, st.st_mtime_ns, rows, len(table[0])))
+        for col in table:
+            if sys.byteorder != "little":
+                col = array(col.typecode, col)
+                col.byteswap()
+            f.write(col)
+    os.replace(tmp_path, path)
+
+
+class MenuIndex:
+    def __init__(self, csv_path: str, idx_buf, csv_buf, rows: int, nslots: int) -> None:
+        self.csv_path = csv_path
+        self._idx = idx_buf
+        self._csv = csv_buf
+        self.rows = rows
+        self._nslots = nslots
+        self._table: Optional[Table] = _columns(idx_buf, nslots)
+
+    # -- building -------------------------------------------------------------
+
+    @classmethod
+    def build(cls, csv_path: str, data: Optional[bytes] = None) -> "MenuIndex":
+        if data is None:
+            with open(csv_path, "rb") as f:
+                data = f.read()
+        header = next(iter_record_spans(data), (0, 0))
+        # Two slots per record at most; newlines bound the records (quoted ones only overcount).
+        table = _empty_table(_nslots(2 * (data.count(b"\n", header[1]) + 1)))
+        hashes, offs, lens, crcs = table
+        nslots = len(hashes)
+
+        seen_keys = set()
+        rows = 0
+        for start, end, cells in iter_parsed_records(data, header[1]):
+            if not cells or not any(c.strip() for c in cells):
+                continue
+            key = tuple(_key_cells(cells))
+            crc = zlib.crc32(data[start:end])
+            slots = [_hash(key[:3], _KIND_ITEM)]
+            # Importers treat the first occurrence of a key as the existing row.
+            if key not in seen_keys:
+                seen_keys.add(key)
+                slots.append(_hash(key, _KIND_KEY))
+            for h in slots:
+                i = h % nslots
+                while hashes[i]:
+                    i = (i + 1) % nslots
+                hashes[i], offs[i], lens[i], crcs[i] = h, start, end - start, crc
+            rows += 1
+
+        _write(csv_path, len(data), rows, table)
+        return cls._open_files(csv_path)
+
+    def apply_splice(self, at: int, start: int, written: bytes, keys: Sequence[MenuKey]) -> None:
+        """
+        Rewrite the sidecar for splice_records(csv_path, data, at, ...) having put
+        `written` (the records of `keys`, new to this index) at `start`.
+
+        This index must still describe the CSV as it was before the splice.
+        """
+        assert self._table is not None
+        shift = start - at + len(written)
+        hashes, offs, lens, crcs = (_copy(code, col) for (code, _), col in zip(COLUMNS, self._table))
+        # Empty slots hold offset 0, which is inside the header: never moved.
+        offs = array("Q", [o + shift if o >= at else o for o in offs])
+        table: Table = (hashes, offs, lens, crcs)
+
+        used = len(hashes) - hashes.count(0)
+        if _nslots(used + 2 * len(keys)) > len(hashes):
+            old = table
+            table = _empty_table(_nslots(used + 2 * len(keys)))
+            for i, h in enumerate(old[0]):
+                if h:
+                    _insert(table, h, old[1][i], old[2][i], old[3][i])
+
+        for key, (s, e) in zip(keys, iter_record_spans(written)):
+            crc = zlib.crc32(written[s:e])
+            parts = list(key)
+            _insert(table, _hash(parts, _KIND_KEY), start + s, e - s, crc)
+            _insert(table, _hash(parts[:3], _KIND_ITEM), start + s, e - s, crc)
+        _write(self.csv_path, os.path.getsize(self.csv_path), self.rows + len(keys), table)
+
+    # -- opening --------------------------------------------------------------
+
+    @classmethod
+    def _open_files(cls, csv_path: str) -> "MenuIndex":
+        with open(index_path(csv_path), "rb") as f:
+            idx_buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(csv_path, "rb") as f:
+            csv_buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+        _, _, _, rows, nslots = HEADER.unpack_from(idx_buf, 0)
+        return cls(csv_path, idx_buf, csv_buf, rows, nslots)
+
+    @classmethod
+    def open(cls, csv_path: str) -> Optional["MenuIndex"]:
+        """Open the sidecar, or None if it is missing or doesn't match the CSV."""
+        path = index_path(csv_path)
+        if not os.path.exists(path) or not os.path.exists(csv_path):
+            return None
+        with open(path, "rb") as f:
+            head = f.read(HEADER.size)
+            size = os.fstat(f.fileno()).st_size
+        if len(head) != HEADER.size:
+            return None
+        magic, csv_bytes, mtime_ns, _, nslots = HEADER.unpack(head)
+        st = os.stat(csv_path)
+        if magic != MAGIC or csv_bytes != st.st_size or mtime_ns != st.st_mtime_ns:
+            return None
+        if size != HEADER.size + nslots * sum(s for _, s in COLUMNS):
+            return None
+        return cls._open_files(csv_path)
+
+    @classmethod
+    def open_or_build(cls, csv_path: str, data: Optional[bytes] = None) -> "MenuIndex":
+        return cls.open(csv_path) or cls.build(csv_path, data)
+
+    def close(self) -> None:
+        # Views into the mmap must go before it can be closed.
+        if self._table is not None:
+            for col in self._table:
+                if isinstance(col, memoryview):
+                    col.release()
+            self._table = None
+        for buf in (self._idx, self._csv):
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+    def __enter__(self) -> "MenuIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- lookups --------------------------------------------------------------
+
+    def _probe(self, h: int):
+        assert self._table is not None
+        hashes, offs, lens, crcs = self._table
+        i = h % self._nslots
+        while hashes[i]:
+            if hashes[i] == h:
+                yield offs[i], lens[i], crcs[i]
+            i = (i + 1) % self._nslots
+
+    def _verified(self, slot, parts: Sequence[str]) -> Optional[List[str]]:
+        off, length, crc = slot
+        raw = bytes(self._csv[off : off + length])
+        if zlib.crc32(raw) != crc:
+            return None
+        cells = parse_record(raw)
+        if _key_cells(cells)[: len(parts)] != list(parts):
+            return None
+        return cells
+
+    def get(self, key: MenuKey) -> Optional[RecordRef]:
+        for slot in self._probe(_hash(list(key), _KIND_KEY)):
+            if self._verified(slot, key) is not None:
+                return (slot[0], slot[1])
+        return None
+
+    def __contains__(self, key: MenuKey) -> bool:
+        return self.get(key) is not None
+
+    def lookup(self, key: MenuKey) -> Optional[List[str]]:
+        for slot in self._probe(_hash(list(key), _KIND_KEY)):
+            cells = self._verified(slot, key)
+            if cells is not None:
+                return cells
+        return None
+
+    def item_rows(self, country: str, chain: str, item: str) -> List[Tuple[int, List[str]]]:
+        """All rows (byte offset, cells) for an item, in file order."""
+        parts = [country, chain, item]
+        out = []
+        for slot in self._probe(_hash(parts, _KIND_ITEM)):
+            cells = self._verified(slot, parts)
+            if cells is not None:
+                out.append((slot[0], cells))
+        return sorted(out, key=lambda t: t[0])
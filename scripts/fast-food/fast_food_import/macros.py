@@ -0,0 +1,142 @@
+"""
+Per-100g macro rows for data/food-overrides/fast_food_macros.csv.
+
+The McDonald's nutrition tables print every nutrient as (per serve, per 100g)
+pairs (per 100mL for drinks). The importers keep both halves in RowBatch's
+*_100 columns, so one parse feeds fast_food_menus.csv (per serve) and this
+file (per 100g), each merged with its own dedupe key:
+- fast_food_menus.csv: (country, chain, item, size_label)
+- fast_food_macros.csv: food, e.g. "Big Mac (McDonald's)"
+
+Food names follow the hand-maintained rows ("Big Mac (McDonald's)"), so an
+item already in the file keeps its one row. Per-100mL values (the file's
+columns say per_100g) are marked in the name: "Latte Small (McDonald's, per 100mL)".
+Like the hand-maintained rows, a nutrient the PDF doesn't give is written as 0.
+
+Sizes of one item usually share their per-100g values and collapse into one
+food row; when they differ, each size gets its own row ("Latte Small (...)").
+Existing rows always win: hand-maintained values are never overwritten, but
+ones that disagree with the PDF are returned so the importer can report them.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Sequence, TextIO, Tuple
+
+from .menu_csv import iter_record_spans, parse_record, splice_records
+from .rows import MISSING, RowBatch
+
+
+MACROS_HEADERS = ["food", "per_100g_kcal", "protein_g", "carbs_g", "fat_g", "fibre_g", "sugar_g"]
+
+# RowBatch columns behind MACROS_HEADERS[1:], in order.
+MACRO_COLUMNS = ("calories_100", "protein_g_100", "carbs_g_100", "fat_g_100", "fiber_g_100", "sugar_g_100")
+
+# A food row needs at least these; fibre/sugar are written as 0 when the PDF has none.
+REQUIRED_MACRO_COLUMNS = ("calories_100", "protein_g_100", "carbs_g_100", "fat_g_100")
+
+
+def check_macro_headers(headers: Sequence[str], err_fp: TextIO) -> bool:
+    if list(headers) == MACROS_HEADERS:
+        return True
+    print("Unexpected macros CSV headers. Refusing to write.", file=err_fp)
+    print("Expected:", ",".join(MACROS_HEADERS), file=err_fp)
+    print("Got     :", ",".join(headers), file=err_fp)
+    return False
+
+
+def read_macro_headers(path: str) -> List[str]:
+    with open(path, "rb") as f:
+        data = f.read(64 * 1024)
+    for start, end in iter_record_spans(data):
+        return parse_record(data[start:end])
+    return []
+
+
+def food_name(chain: str, item: str, size_label: str = "", per_100: str = "g") -> str:
+    name = item if not size_label or size_label == "1 serving" else f"{item} {size_label}"
+    tag = chain
+    if per_100 != "g":
+        tag += f", per 100{per_100}"
+    return f"{name} ({tag})"
+
+
+def _is_chain_food(food: str, chain: str) -> bool:
+    # "Big Mac (McDonald's)", "Latte (McDonald's, per 100mL)".
+    _, sep, tag = food.rpartition(" (")
+    return bool(sep) and tag.startswith(chain) and tag[len(chain) : len(chain) + 1] in (")", " ", ",")
+
+
+def _numbers(cells: Sequence[str]) -> List[object]:
+    # Numeric cells compared by value ("15" == "15.0"); blank and unparseable ones as text.
+    out: List[object] = []
+    for c in cells:
+        try:
+            out.append(float(c))
+        except ValueError:
+            out.append(c.strip())
+    return out
+
+
+def macro_records(batch: RowBatch) -> List[List[str]]:
+    """fast_food_macros.csv rows for every batch row that has per-100g (or per-100mL) values."""
+    # (country, chain, item, per_100) -> (size_label, values) of each size.
+    groups: "OrderedDict[Tuple[str, str, str, str], List[Tuple[str, Tuple[str, ...]]]]" = OrderedDict()
+    for i in range(len(batch)):
+        if any(getattr(batch, col)[i] == MISSING for col in REQUIRED_MACRO_COLUMNS):
+            continue
+        values = tuple(batch.text(i, col, compact=True) or "0" for col in MACRO_COLUMNS)
+        key = (batch.country[i], batch.chain[i], batch.item[i], batch.per_100[i])
+        groups.setdefault(key, []).append((batch.size_label[i], values))
+
+    out: List[List[str]] = []
+    for (_country, chain, item, per_100), sizes in groups.items():
+        if len({values for _, values in sizes}) == 1:
+            sizes = [("", sizes[0][1])]
+        for size_label, values in sizes:
+            name = food_name(chain, item, size_label, per_100)
+            out.append([name] + list(values))
+    return out
+
+
+@dataclass
+class MacroMergeResult:
+    added: List[List[str]] = field(default_factory=list)
+    # (existing row, record) pairs for foods already in the file with other values; kept as is.
+    conflicts: List[Tuple[List[str], List[str]]] = field(default_factory=list)
+
+
+def merge_macro_records(path: str, records: Iterable[Sequence[str]], chain: str) -> MacroMergeResult:
+    """
+    Add records whose food isn't in `path` yet, right after the last `chain` row
+    (end of file if there is none).
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    existing = {}
+    insert_at: Optional[int] = None
+    spans = iter_record_spans(data)
+    next(spans, None)
+    for start, end in spans:
+        row = parse_record(data[start:end])
+        if not row:
+            continue
+        existing.setdefault(row[0], row)
+        if _is_chain_food(row[0], chain):
+            insert_at = end
+
+    result = MacroMergeResult()
+    for r in records:
+        row = existing.get(r[0])
+        if row is not None:
+            if _numbers(row[1:]) != _numbers(r[1:]):
+                result.conflicts.append((row, list(r)))
+            continue
+        existing[r[0]] = list(r)
+        result.added.append(list(r))
+    if result.added:
+        splice_records(path, data, len(data) if insert_at is None else insert_at, result.added)
+    return result
@@ -0,0 +1,201 @@
+"""
+Generation manifest for fast_food_menus.csv.
+
+Written next to the CSV (fast_food_menus.manifest.json) after every import.
+It lets consumers (lib/food/fast-food-menus.ts) replace a blind TTL with a
+stat + compare:
+- `generation` only goes up, and only when some partition changed
+- `csv_bytes` ties the manifest to the CSV it describes (size mismatch = stale)
+- each (country, chain) partition has a row count, the sha256 of its record
+  bytes, and the byte ranges those records occupy in the CSV, so a consumer
+  can re-read and re-parse just the partitions whose hash changed
+
+A merge doesn't rebuild it: apply_splice() shifts the byte ranges behind the
+splice point and re-hashes only the partitions that got rows. A full rebuild
+(write_manifest) parses the CSV once, in bulk.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .menu_csv import iter_parsed_records, iter_record_spans
+
+
+MANIFEST_VERSION = 1
+
+
+def manifest_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".manifest.json"
+
+
+def load_manifest(csv_path: str, csv_bytes: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """The manifest, or None if there is none (or it describes a CSV of another size than csv_bytes)."""
+    path = manifest_path(csv_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != MANIFEST_VERSION:
+        return None
+    if csv_bytes is not None and data.get("csv_bytes") != csv_bytes:
+        return None
+    return data
+
+
+def partition_key(country: str, chain: str) -> str:
+    return f"{country.strip()}|{chain.strip()}"
+
+
+def build_partitions(data: bytes) -> Dict[str, Any]:
+    header = next(iter_record_spans(data), None)
+    header_bytes = header[1] if header else 0
+
+    parts: Dict[str, Dict[str, Any]] = {}
+    hashers: Dict[str, Any] = {}
+    for start, end, cells in iter_parsed_records(data, header_bytes):
+        if not cells or not any(c.strip() for c in cells):
+            continue
+        country = cells[0] if len(cells) > 0 else ""
+        chain = cells[1] if len(cells) > 1 else ""
+        key = partition_key(country, chain)
+        p = parts.get(key)
+        if p is None:
+            p = parts[key] = {"country": country.strip(), "chain": chain.strip(), "rows": 0, "ranges": []}
+            hashers[key] = hashlib.sha256()
+        p["rows"] += 1
+        hashers[key].update(data[start:end])
+        ranges: List[List[int]] = p["ranges"]
+        if ranges and ranges[-1][1] == start:
+            ranges[-1][1] = end
+        else:
+            ranges.append([start, end])
+
+    for key, h in hashers.items():
+        parts[key]["sha256"] = h.hexdigest()
+    return {"header_bytes": header_bytes, "partitions": parts}
+
+
+def write_manifest(csv_path: str) -> Dict[str, Any]:
+    """(Re)write the manifest for `csv_path`; bumps the generation if anything changed."""
+    with open(csv_path, "rb") as f:
+        data = f.read()
+    built = build_partitions(data)
+    prev = load_manifest(csv_path)
+
+    unchanged = (
+        prev is not None
+        and prev.get("csv_bytes") == len(data)
+        and {k: p.get("sha256") for k, p in prev.get("partitions", {}).items()}
+        == {k: p["sha256"] for k, p in built["partitions"].items()}
+    )
+    generation = int(prev.get("generation", 0)) if prev else 0
+    if not unchanged:
+        generation += 1
+    return _save(csv_path, generation, len(data), built["header_bytes"], built["partitions"])
+
+
+def apply_splice(
+    csv_path: str,
+    manifest: Dict[str, Any],
+    at: int,
+    start: int,
+    written: bytes,
+    partitions: Sequence[Tuple[str, str]],
+) -> Dict[str, Any]:
+    """
+    The manifest after splice_records(csv_path, data, at, ...) put `written` (one
+    record per (country, chain) in `partitions`) at `start`, written to disk.
+
+    `manifest` must describe the CSV as it was before the splice.
+    """
+    if start != at:
+        # The record before the splice point got a line terminator: its partition's bytes changed too.
+        return write_manifest(csv_path)
+    shift = len(written)
+    parts: Dict[str, Dict[str, Any]] = {}
+    for key, p in manifest["partitions"].items():
+        ranges: List[List[int]] = []
+        for s, e in p["ranges"]:
+            if s >= at:
+                ranges.append([s + shift, e + shift])
+            elif e > at:  # split by the new records
+                ranges += [[s, at], [at + shift, e + shift]]
+            else:
+                ranges.append([s, e])
+        parts[key] = dict(p, ranges=ranges)
+
+    changed = set()
+    for (country, chain), (s, e) in zip(partitions, iter_record_spans(written)):
+        key = partition_key(country, chain)
+        p = parts.get(key)
+        if p is None:
+            p = parts[key] = {"country": country.strip(), "chain": chain.strip(), "rows": 0, "ranges": []}
+        p["rows"] += 1
+        p["ranges"].append([start + s, start + e])
+        changed.add(key)
+
+    with open(csv_path, "rb") as f:
+        for key in changed:
+            p = parts[key]
+            merged: List[List[int]] = []
+            for s, e in sorted(p["ranges"]):
+                if merged and merged[-1][1] == s:
+                    merged[-1][1] = e
+                else:
+                    merged.append([s, e])
+            p["ranges"] = merged
+            h = hashlib.sha256()
+            for s, e in merged:
+                f.seek(s)
+                h.update(f.read(e - s))
+            p["sha256"] = h.hexdigest()
+
+    generation = int(manifest.get("generation", 0)) + (1 if changed else 0)
+    return _save(csv_path, generation, int(manifest["csv_bytes"]) + shift, manifest["header_bytes"], parts)
+
+
+def _save(
+    csv_path: str, generation: int, csv_bytes: int, header_bytes: int, partitions: Dict[str, Any]
+) -> Dict[str, Any]:
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "generation": generation,
+        "csv": os.path.basename(csv_path),
+        "csv_bytes": csv_bytes,
+        "header_bytes": header_bytes,
+        "rows": sum(p["rows"] for p in partitions.values()),
+        "partitions": partitions,
+    }
+    path = manifest_path(csv_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def changed_partitions(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> List[str]:
+    """Partition keys added, removed or modified between two manifests."""
+    old_parts = (old or {}).get("partitions", {})
+    new_parts = new.get("partitions", {})
+    keys = set(old_parts) | set(new_parts)
+    return sorted(
+        k for k in keys if (old_parts.get(k) or {}).get("sha256") != (new_parts.get(k) or {}).get("sha256")
+    )
+
+
+def partition_end(csv_path: str, data: bytes, country: str, chain: str) -> Optional[int]:
+    """Byte offset just past the last record of (country, chain), or None if absent.
+
+    Uses the manifest when it matches `data`; otherwise scans the bytes.
+    """
+    manifest = load_manifest(csv_path, len(data)) or build_partitions(data)
+    part = manifest["partitions"].get(partition_key(country, chain))
+    if not part or not part["ranges"]:
+        return None
+    return int(part["ranges"][-1][1])
@@ -0,0 +1,111 @@
+"""
+Byte-level helpers for fast_food_menus.csv.
+
+Some cells contain quoted newlines, so "one line = one record" is not safe.
+iter_record_spans() walks raw bytes and yields (start, end) offsets of whole
+records: a newline only ends a record when the quotes seen so far in that
+record are balanced ("" escapes count as two quotes, so parity still works).
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import os
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+def iter_record_spans(data: bytes, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    n = len(data) if end is None else end
+    pos = start
+    while pos < n:
+        nl = data.find(b"\n", pos, n)
+        if nl == -1:
+            yield pos, n
+            return
+        stop = nl + 1
+        quotes = data.count(b'"', pos, stop)
+        while quotes % 2 == 1:
+            nl = data.find(b"\n", stop, n)
+            if nl == -1:
+                stop = n
+                break
+            quotes += data.count(b'"', stop, nl + 1)
+            stop = nl + 1
+        yield pos, stop
+        pos = stop
+
+
+def record_boundary(data: bytes, pos: int, at: int) -> int:
+    """
+    The first record boundary at or after `at`, given that `pos` <= `at` is one.
+
+    Same rule as iter_record_spans(), without walking every record in between:
+    a newline ends a record iff the quotes since `pos` are balanced there.
+    """
+    n = len(data)
+    if at <= pos:
+        return pos
+    nl = data.find(b"\n", at - 1)
+    if nl == -1:
+        return n
+    quotes = data.count(b'"', pos, nl + 1)
+    while quotes % 2 == 1:
+        nxt = data.find(b"\n", nl + 1)
+        if nxt == -1:
+            return n
+        quotes += data.count(b'"', nl + 1, nxt + 1)
+        nl = nxt
+    return nl + 1
+
+
+def iter_parsed_records(
+    data: bytes, start: int = 0, end: Optional[int] = None
+) -> Iterator[Tuple[int, int, List[str]]]:
+    """(start, end, cells) of every record in data[start:end], all parsed by one csv.reader."""
+    span = (start, start)
+
+    def texts() -> Iterator[str]:
+        nonlocal span
+        for span in iter_record_spans(data, start, end):
+            yield data[span[0] : span[1]].decode("utf-8")
+
+    # Each span is one quote-balanced record, so the reader consumes exactly one per row.
+    for cells in csv.reader(texts()):
+        yield span[0], span[1], cells
+
+
+def parse_record(raw: bytes) -> List[str]:
+    # One record's bytes (as yielded by iter_record_spans) -> its cells.
+    for row in csv.reader(io.StringIO(raw.decode("utf-8"), newline="")):
+        return row
+    return []
+
+
+def line_terminator(data: bytes) -> str:
+    # Match whatever the file already uses so a splice doesn't mix endings.
+    nl = data.find(b"\n")
+    return "\r\n" if nl > 0 and data[nl - 1 : nl] == b"\r" else "\n"
+
+
+def splice_records(csv_path: str, data: bytes, offset: int, records: Iterable[Sequence[str]]) -> Tuple[int, bytes]:
+    """
+    Rewrite `csv_path` as data[:offset] + records + data[offset:] (atomic).
+
+    Returns where the new records start in the new file and their bytes; every
+    byte from `offset` on moved by start - offset + len(bytes). start only
+    differs from `offset` when the record before lacked a line terminator.
+    """
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator=line_terminator(data)).writerows(records)
+    written = buf.getvalue().encode("utf-8")
+    head = data[:offset]
+    if head and not head.endswith(b"\n"):
+        head += line_terminator(data).encode("ascii")
+    tmp_path = csv_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(head)
+        f.write(written)
+        f.write(data[offset:])
+    os.replace(tmp_path, csv_path)
+    return len(head), written
@@ -0,0 +1,73 @@
+"""
+Merging extracted rows into fast_food_menus.csv.
+
+The CSV never gets parsed into dicts: existence checks go through the key
+index (O(new rows)), new rows are spliced in after their (country, chain)
+partition, and the index and manifest are updated in place: offsets behind
+the splice point move by the bytes inserted, the new rows are added, and only
+the partition that got rows is re-hashed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from .index import MenuIndex
+from .manifest import apply_splice, load_manifest, partition_end, write_manifest
+from .menu_csv import iter_record_spans, splice_records
+from .rows import RowBatch
+
+
+@dataclass
+class MergeResult:
+    added: List[int]  # batch indices written to the CSV
+    # Batch indices whose CSV row now comes from this batch's source: the added
+    # ones, plus existing rows with the same source_url (provenance records both).
+    traced: List[int]
+    generation: Optional[int] = None  # manifest generation
+
+
+def merge_menu_rows(csv_path: str, batch: RowBatch, after: Tuple[str, str]) -> MergeResult:
+    """
+    Add batch rows whose (country, chain, item, size_label) key isn't in `csv_path`
+    yet, right after the existing `after` (country, chain) rows; with none, after
+    the first data row. Existing rows are never modified.
+    """
+    with open(csv_path, "rb") as f:
+        data = f.read()
+
+    keep: List[int] = []
+    traced: List[int] = []
+    seen = set()
+    with MenuIndex.open_or_build(csv_path, data) as index:
+        for i in range(len(batch)):
+            key = batch.key(i)
+            if key in seen:
+                continue
+            seen.add(key)
+            existing = index.lookup(key)
+            if existing is None:
+                keep.append(i)
+                traced.append(i)
+            elif existing[-1] == batch.source_url[i]:
+                traced.append(i)
+
+        # A no-op import leaves the CSV, and so a manifest that matches it, alone.
+        manifest = load_manifest(csv_path, len(data)) or write_manifest(csv_path)
+        if not keep:
+            return MergeResult(added=keep, traced=traced, generation=manifest["generation"])
+
+        insert_at = partition_end(csv_path, data, *after)
+        if insert_at is None:
+            spans = iter_record_spans(data)
+            next(spans, None)
+            insert_at = next(spans, (0, len(data)))[1]
+
+        new_rows = batch.take(keep)
+        start, written = splice_records(csv_path, data, insert_at, new_rows.iter_records())
+        index.apply_splice(insert_at, start, written, [new_rows.key(i) for i in range(len(new_rows))])
+    partitions = list(zip(new_rows.country, new_rows.chain))
+    manifest = apply_splice(csv_path, manifest, insert_at, start, written, partitions)
+    return MergeResult(added=keep, traced=traced, generation=manifest["generation"])
+
@@ -0,0 +1,316 @@
+"""
+Per-page text extraction with a time budget.
+
+A single pathological page (full-bleed artwork, a giant allergen matrix) can
+keep page.extract_text() busy for minutes. iter_page_texts() runs extraction in
+a worker process and gives each page `budget_s` seconds. A page that overruns
+(or raises) is quarantined: the worker is killed, the page is recorded in a
+QuarantineReport (PDF hash, page index, elapsed time), and a fresh worker picks
+up from the next page. The run still gets every other page's text.
+
+Quarantine reports are JSON so a later run can retry just those pages with a
+bigger budget (see QuarantineReport.pages_for).
+
+With with_boxes=True each page comes back as a PageText: still a str, so
+parsers don't change, but carrying the bbox of every line for provenance.
+
+Workers are spawned, not forked (the caller may be threaded), and each page's
+budget is measured from when the worker began it. Workers start from a
+snapshot of the parent's font cache and send back the fonts they decoded plus
+their hit/miss counts (see fonts.py), so sibling PDFs parsed in one run share
+font decoding and the run metrics see every worker.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Collection, Dict, Iterator, List, Optional, Tuple, Union
+
+from .backends import REFERENCE_BACKEND, BBox, PdfSource, open_document
+from .fonts import FONT_CACHE
+from .remote import RemotePdf
+
+DEFAULT_PAGE_BUDGET_S = 60.0
+# Opening a PDF (xref + page tree) is not a per-page cost; give it its own allowance.
+OPEN_TIMEOUT_S = 120.0
+
+
+def pdf_sha256(source: PdfSource) -> str:
+    if isinstance(source, RemotePdf):
+        return source.identity()
+    h = hashlib.sha256()
+    if isinstance(source, bytes):
+        h.update(source)
+    else:
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+class PageText(str):
+    """Page text whose .boxes[i] is the bbox of line i (None if unknown)."""
+
+    boxes: Optional[List[BBox]]
+
+    def __new__(cls, text: str, boxes: Optional[List[BBox]]) -> "PageText":
+        self = super().__new__(cls, text)
+        self.boxes = boxes
+        return self
+
+
+def _extract(doc, pi: int, with_boxes: bool):
+    return doc.page_lines(pi) if with_boxes else doc.page_text(pi)
+
+
+def _wrap(page, with_boxes: bool) -> str:
+    return PageText(*page) if with_boxes else page
+
+
+@dataclass
+class QuarantineEntry:
+    pdf_sha256: str
+    source: str
+    page_index: int  # 0-based, as used by pdf.pages[...]
+    elapsed_s: float
+    budget_s: float
+    reason: str  # "timeout" or "error"
+    detail: str = ""
+
+
+class QuarantineReport:
+    """
+    Pages that could not be extracted, keyed by (pdf_sha256, page_index).
+
+    Successfully extracted pages are resolved (dropped) so the report only ever
+    lists pages that still need attention.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self._entries: Dict[Tuple[str, int], QuarantineEntry] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            for raw in data.get("pages", []):
+                e = QuarantineEntry(**raw)
+                self._entries[(e.pdf_sha256, e.page_index)] = e
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entries(self) -> List[QuarantineEntry]:
+        with self._lock:
+            return sorted(self._entries.values(), key=lambda e: (e.source, e.page_index))
+
+    def add(self, entry: QuarantineEntry) -> None:
+        with self._lock:
+            self._entries[(entry.pdf_sha256, entry.page_index)] = entry
+
+    def resolve(self, sha: str, page_index: int) -> None:
+        with self._lock:
+            self._entries.pop((sha, page_index), None)
+
+    def pages_for(self, sha: str, source: Optional[str] = None) -> List[int]:
+        """
+        Quarantined pages of the PDF with hash `sha`.
+
+        A RemotePdf's hash is its identity(), not the content sha256 a full
+        download was quarantined under; pass its URL as `source` and entries
+        for that source are re-keyed to `sha`, so the retry finds them and
+        resolves them.
+        """
+        with self._lock:
+            if source is not None:
+                for key, e in list(self._entries.items()):
+                    if e.source == source and key[0] != sha:
+                        del self._entries[key]
+                        e.pdf_sha256 = sha
+                        self._entries[(sha, e.page_index)] = e
+            return sorted(pi for (s, pi) in self._entries if s == sha)
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"pages": [asdict(e) for e in self.entries()]}, f, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+
+def _select_pages(count: int, start: int, stop: Optional[int], only: Optional[Collection[int]]) -> List[int]:
+    end = count if stop is None else min(count, stop)
+    pages = range(max(0, start), end)
+    if only is not None:
+        wanted = set(only)
+        return [pi for pi in pages if pi in wanted]
+    return list(pages)
+
+
+def _worker(
+    conn,
+    started,
+    source: PdfSource,
+    backend: str,
+    spec: Union[List[int], Tuple[int, Optional[int], Optional[Collection[int]]]],
+    with_boxes: bool = False,
+    fonts: Optional[Tuple[Optional[str], Dict[str, bytes]]] = None,
+) -> None:
+    if fonts is not None:
+        FONT_CACHE.start_worker(*fonts)
+    try:
+        with open_document(source, backend) as doc:
+            pages = spec if isinstance(spec, list) else _select_pages(doc.page_count, *spec)
+            conn.send(("ready", pages))
+            for pi in pages:
+                t0 = time.perf_counter()
+                started.value = time.monotonic()
+                try:
+                    text = _extract(doc, pi, with_boxes)
+                except Exception as exc:
+                    conn.send(("error", pi, f"{type(exc).__name__}: {exc}", time.perf_counter() - t0))
+                    continue
+                conn.send(("page", pi, text, time.perf_counter() - t0))
+            conn.send(("fonts", FONT_CACHE.stats(), FONT_CACHE.export_new()))
+    except Exception as exc:
+        conn.send(("fatal", f"{type(exc).__name__}: {exc}"))
+    finally:
+        conn.close()
+
+
+def _wait_for_page(conn, started, budget_s: float) -> bool:
+    """
+    Wait until the worker's next message arrives or its current page has run
+    for budget_s; False on timeout.
+
+    The budget runs from when the worker began the page, not from when the
+    caller resumed iter_page_texts(): a slow consumer neither stretches it nor
+    uses it up. While a page's result hasn't arrived, the worker is still on
+    that page (it only moves on after sending), so `started` is that page's.
+    """
+    while True:
+        remaining = started.value + budget_s - time.monotonic()
+        if conn.poll(max(0.0, remaining)):
+            return True
+        if remaining <= 0:
+            return False
+
+
+def iter_page_texts(
+    source: PdfSource,
+    *,
+    start: int = 0,
+    stop: Optional[int] = None,
+    only: Optional[Collection[int]] = None,
+    budget_s: Optional[float] = DEFAULT_PAGE_BUDGET_S,
+    quarantine: Optional[QuarantineReport] = None,
+    label: str = "",
+    backend: str = REFERENCE_BACKEND,
+    with_boxes: bool = False,
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (page_index, text) for pages in [start, stop) (optionally only `only`).
+
+    budget_s=None (or <= 0) extracts in-process with no deadline. with_boxes=True
+    yields PageText objects instead of plain strings.
+    """
+    sha = pdf_sha256(source) if quarantine is not None else ""
+    label = label or (source if isinstance(source, str) else getattr(source, "url", "<bytes>"))
+
+    if not budget_s or budget_s <= 0:
+        with open_document(source, backend) as doc:
+            for pi in _select_pages(doc.page_count, start, stop, only):
+                yield pi, _wrap(_extract(doc, pi, with_boxes), with_boxes)
+                if quarantine is not None:
+                    quarantine.resolve(sha, pi)
+        return
+
+    def _quarantine(pi: int, elapsed_s: float, reason: str, detail: str = "") -> None:
+        if quarantine is not None:
+            quarantine.add(
+                QuarantineEntry(
+                    pdf_sha256=sha,
+                    source=label,
+                    page_index=pi,
+                    elapsed_s=round(elapsed_s, 3),
+                    budget_s=budget_s,
+                    reason=reason,
+                    detail=detail,
+                )
+            )
+
+    import multiprocessing  # only budgeted runs spawn workers; keeps CLI startup light
+
+    # Not fork: the GYG pipeline calls this from extract-stage threads, and a forked
+    # child can inherit another thread's lock (logging, urllib3, the font cache) held.
+    ctx = multiprocessing.get_context("spawn")
+    spec: Union[List[int], Tuple[int, Optional[int], Optional[Collection[int]]]] = (start, stop, only)
+    while True:
+        parent, child = ctx.Pipe(duplex=False)
+        fonts = (FONT_CACHE.directory, FONT_CACHE.snapshot())
+        # time.monotonic() the worker began its current page; until its first page,
+        # when the worker was started.
+        started = ctx.Value("d", time.monotonic(), lock=False)
+        proc = ctx.Process(
+            target=_worker,
+            args=(child, started, source, backend, spec, with_boxes, fonts),
+            daemon=True,
+        )
+        proc.start()
+        child.close()
+        stuck: Optional[int] = None
+        try:
+            if not parent.poll(OPEN_TIMEOUT_S):
+                raise RuntimeError(f"Timed out opening PDF: {label}")
+            try:
+                msg = parent.recv()
+            except EOFError:
+                raise RuntimeError(f"PDF worker exited while opening {label}") from None
+            if msg[0] == "fatal":
+                raise RuntimeError(f"Could not open PDF {label}: {msg[1]}")
+            todo: List[int] = msg[1]
+
+            for n, pi in enumerate(todo):
+                if not _wait_for_page(parent, started, budget_s):
+                    _quarantine(pi, time.monotonic() - started.value, "timeout")
+                    stuck = n
+                    break
+                try:
+                    msg = parent.recv()
+                except EOFError:
+                    # Worker died mid-page (e.g. killed by the OS); treat like a timeout.
+                    _quarantine(pi, time.monotonic() - started.value, "error", "worker exited")
+                    stuck = n
+                    break
+                if msg[0] == "page":
+                    yield msg[1], _wrap(msg[2], with_boxes)
+                    if quarantine is not None:
+                        quarantine.resolve(sha, msg[1])
+                elif msg[0] == "error":
+                    _quarantine(msg[1], msg[3], "error", msg[2])
+                else:
+                    raise RuntimeError(f"PDF worker failed on {label}: {msg[1]}")
+            if stuck is None and parent.poll(budget_s):
+                msg = parent.recv()
+                if msg[0] == "fonts":
+                    FONT_CACHE.merge_stats(msg[1])
+                    FONT_CACHE.load(msg[2])
+        finally:
+            parent.close()
+            if proc.is_alive():
+                proc.kill()
+            proc.join()
+
+        if stuck is None:
+            return
+        # Restart a fresh worker after the stuck page.
+        spec = todo[stuck + 1 :]
+        if not spec:
+            return
@@ -0,0 +1,100 @@
+"""
+Parquet export of fast_food_menus.csv for analytics jobs.
+
+Each (country, chain) pair is written as its own row group, sorted, so the
+footer's min/max statistics let readers skip every other chain, and readers
+only decode the columns they ask for. Numbers are float64 (null for blank
+cells); country/chain/size_label/source_url are dictionary-encoded.
+
+pyarrow is optional: it is only imported when an export or read is requested.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .rows import DICTIONARY_COLUMNS, MENU_HEADERS, NUMERIC_COLUMNS
+from .storage import iter_menu_records
+
+
+def _require_pyarrow() -> Tuple[Any, Any]:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow).") from None
+    return pa, pq
+
+
+def menu_schema(pa: Any) -> Any:
+    fields = []
+    for name in MENU_HEADERS:
+        if name in NUMERIC_COLUMNS:
+            fields.append(pa.field(name, pa.float64()))
+        elif name in DICTIONARY_COLUMNS:
+            fields.append(pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+
+def _num(v: str) -> Optional[float]:
+    v = v.strip()
+    if not v:
+        return None
+    try:
+        return float(v)
+    except ValueError:
+        return None
+
+
+def write_menu_parquet(records: Iterable[Sequence[str]], out_path: str) -> int:
+    """Write rows (in MENU_HEADERS order) to `out_path`; returns the row-group count."""
+    pa, pq = _require_pyarrow()
+    schema = menu_schema(pa)
+
+    ci, hi = MENU_HEADERS.index("country"), MENU_HEADERS.index("chain")
+    groups: Dict[Tuple[str, str], List[Sequence[str]]] = {}
+    for r in records:
+        groups.setdefault((r[ci], r[hi]), []).append(r)
+
+    tmp_path = out_path + ".tmp"
+    with pq.ParquetWriter(tmp_path, schema, compression="zstd", write_statistics=True) as writer:
+        for key in sorted(groups):
+            recs = groups[key]
+            cols = []
+            for i, name in enumerate(MENU_HEADERS):
+                if name in NUMERIC_COLUMNS:
+                    cols.append(pa.array([_num(r[i]) for r in recs], type=pa.float64()))
+                elif name in DICTIONARY_COLUMNS:
+                    cols.append(pa.array([r[i] for r in recs], type=pa.string()).dictionary_encode())
+                else:
+                    cols.append(pa.array([r[i] for r in recs], type=pa.string()))
+            writer.write_table(pa.Table.from_arrays(cols, schema=schema), row_group_size=len(recs))
+    os.replace(tmp_path, out_path)
+    return len(groups)
+
+
+def write_menu_parquet_from_csv(csv_path: str, out_path: str) -> int:
+    records = iter_menu_records(csv_path)
+    headers = next(records, [])
+    if headers != MENU_HEADERS:
+        raise ValueError(f"Unexpected CSV headers in {csv_path}: {','.join(headers)}")
+    return write_menu_parquet(records, out_path)
+
+
+def read_menu_parquet(
+    path: str,
+    columns: Optional[Sequence[str]] = None,
+    country: Optional[str] = None,
+    chain: Optional[str] = None,
+) -> Any:
+    """Read a pyarrow.Table, skipping row groups for other countries/chains."""
+    _, pq = _require_pyarrow()
+    filters = []
+    if country is not None:
+        filters.append(("country", "=", country))
+    if chain is not None:
+        filters.append(("chain", "=", chain))
+    return pq.read_table(path, columns=list(columns) if columns else None, filters=filters or None)
@@ -0,0 +1,245 @@
+"""
+Bounded-queue staged pipeline for multi-source imports.
+
+Each stage runs its own pool of worker threads and reads from a bounded queue,
+so PDF N+1 can download while PDF N is parsed and PDF N-1's rows are merged.
+When a downstream queue is full the upstream workers block (backpressure)
+instead of buffering whole PDFs in memory.
+
+The sink (merge) runs in the calling thread and always sees results in input
+order, so output is deterministic regardless of worker counts. Results that
+finish early wait in a reorder buffer; the feeder never lets more than
+sink_queue_size items get ahead of the one the sink needs next, so one slow
+PDF can't make every later result pile up there. That wait is the
+"feed" stage's blocked time, and its max_queue is the most items in flight.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+
+_DONE = object()
+_POLL_S = 0.1
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+    # Max items waiting in front of this stage.
+    queue_size: int = 2
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    workers: int
+    items: int = 0
+    busy_s: float = 0.0
+    # Time workers sat waiting for upstream (starved).
+    wait_in_s: float = 0.0
+    # Time workers were blocked on a full downstream queue (backpressure).
+    wait_out_s: float = 0.0
+    max_depth: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def occupancy(self, wall_s: float) -> float:
+        if wall_s <= 0 or self.workers <= 0:
+            return 0.0
+        return min(1.0, self.busy_s / (self.workers * wall_s))
+
+
+@dataclass
+class PipelineMetrics:
+    wall_s: float
+    stages: List[StageMetrics]
+
+    def lines(self) -> List[str]:
+        out = [f"Pipeline wall time: {self.wall_s:.2f}s"]
+        for m in self.stages:
+            out.append(
+                f"Stage {m.name}: items={m.items} workers={m.workers} "
+                f"occupancy={m.occupancy(self.wall_s) * 100:.0f}% busy={m.busy_s:.2f}s "
+                f"starved={m.wait_in_s:.2f}s blocked={m.wait_out_s:.2f}s max_queue={m.max_depth}"
+            )
+        return out
+
+
+class _Aborted(Exception):
+    pass
+
+
+def _put(q: "queue.Queue[Any]", item: Any, stop: threading.Event) -> None:
+    while True:
+        try:
+            q.put(item, timeout=_POLL_S)
+            return
+        except queue.Full:
+            if stop.is_set():
+                raise _Aborted()
+
+
+def _acquire(sem: threading.Semaphore, stop: threading.Event) -> None:
+    while not sem.acquire(timeout=_POLL_S):
+        if stop.is_set():
+            raise _Aborted()
+
+
+def _get(q: "queue.Queue[Any]", stop: threading.Event) -> Any:
+    while True:
+        try:
+            return q.get(timeout=_POLL_S)
+        except queue.Empty:
+            if stop.is_set():
+                raise _Aborted()
+
+
+def run_pipeline(
+    items: Iterable[Any],
+    stages: Sequence[Stage],
+    sink: Callable[[Any], None],
+    sink_queue_size: int = 2,
+) -> PipelineMetrics:
+    """
+    Push every item through `stages` in order and hand results to `sink`.
+
+    At most sink_queue_size items are admitted ahead of the oldest one not yet
+    handed to `sink`, so it also bounds how many items are in flight: raise it
+    along with the worker counts. The first exception raised by any stage (or
+    the sink) stops the pipeline and is re-raised here.
+    """
+    if not stages:
+        raise ValueError("run_pipeline needs at least one stage")
+
+    stop = threading.Event()
+    errors: List[BaseException] = []
+    queues: List["queue.Queue[Any]"] = [queue.Queue(maxsize=max(1, s.queue_size)) for s in stages]
+    queues.append(queue.Queue(maxsize=max(1, sink_queue_size)))
+    metrics = [StageMetrics(name=s.name, workers=max(1, s.workers)) for s in stages]
+    sink_metrics = StageMetrics(name="merge", workers=1)
+    feed_metrics = StageMetrics(name="feed", workers=1)
+    # One slot per sequence number between next_seq and the newest admitted item.
+    window = threading.Semaphore(max(1, sink_queue_size) + 1)
+    in_flight = [0]
+    all_metrics = metrics + [sink_metrics]
+    remaining = [m.workers for m in metrics]
+    remaining_lock = threading.Lock()
+
+    def fail(exc: BaseException) -> None:
+        with remaining_lock:
+            errors.append(exc)
+        stop.set()
+
+    def feed() -> None:
+        try:
+            for seq, item in enumerate(items):
+                t0 = time.perf_counter()
+                _acquire(window, stop)
+                with feed_metrics._lock:
+                    in_flight[0] += 1
+                    feed_metrics.max_depth = max(feed_metrics.max_depth, in_flight[0])
+                _put(queues[0], (seq, item), stop)
+                feed_metrics.wait_out_s += time.perf_counter() - t0
+                feed_metrics.items += 1
+                _note_depth(metrics[0], queues[0])
+            for _ in range(metrics[0].workers):
+                _put(queues[0], _DONE, stop)
+        except _Aborted:
+            pass
+        except BaseException as exc:  # surface iterator errors to the caller
+            fail(exc)
+
+    def work(k: int) -> None:
+        stage = stages[k]
+        m = metrics[k]
+        q_in, q_out = queues[k], queues[k + 1]
+        next_m = all_metrics[k + 1]
+        try:
+            while True:
+                t0 = time.perf_counter()
+                got = _get(q_in, stop)
+                t1 = time.perf_counter()
+                if got is _DONE:
+                    break
+                seq, item = got
+                result = stage.fn(item)
+                t2 = time.perf_counter()
+                _put(q_out, (seq, result), stop)
+                t3 = time.perf_counter()
+                _note_depth(next_m, q_out)
+                with m._lock:
+                    m.items += 1
+                    m.wait_in_s += t1 - t0
+                    m.busy_s += t2 - t1
+                    m.wait_out_s += t3 - t2
+            with remaining_lock:
+                remaining[k] -= 1
+                last = remaining[k] == 0
+            if last:
+                for _ in range(next_m.workers):
+                    _put(q_out, _DONE, stop)
+        except _Aborted:
+            pass
+        except BaseException as exc:
+            fail(exc)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=feed, name="pipeline-feed", daemon=True)]
+    for k, m in enumerate(metrics):
+        for w in range(m.workers):
+            threads.append(threading.Thread(target=work, args=(k,), name=f"pipeline-{m.name}-{w}", daemon=True))
+    for t in threads:
+        t.start()
+
+    # Merge in the caller's thread, restoring input order.
+    pending: Dict[int, Any] = {}
+    next_seq = 0
+    try:
+        while True:
+            t0 = time.perf_counter()
+            got = _get(queues[-1], stop)
+            t1 = time.perf_counter()
+            sink_metrics.wait_in_s += t1 - t0
+            if got is _DONE:
+                break
+            seq, result = got
+            pending[seq] = result
+            while next_seq in pending:
+                t2 = time.perf_counter()
+                sink(pending.pop(next_seq))
+                with feed_metrics._lock:
+                    in_flight[0] -= 1
+                window.release()
+                sink_metrics.busy_s += time.perf_counter() - t2
+                sink_metrics.items += 1
+                next_seq += 1
+    except _Aborted:
+        pass
+    except BaseException as exc:
+        fail(exc)
+
+    stop.set()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+
+    return PipelineMetrics(wall_s=time.perf_counter() - started, stages=[feed_metrics] + all_metrics)
+
+
+def _note_depth(m: StageMetrics, q: "queue.Queue[Any]") -> None:
+    depth = q.qsize()
+    if depth > m.max_depth:
+        m.max_depth = depth
+
+
+def print_metrics(metrics: PipelineMetrics, out_fp: Any, prefix: str = "# ") -> None:
+    for line in metrics.lines():
+        print(f"{prefix}{line}", file=out_fp)
+
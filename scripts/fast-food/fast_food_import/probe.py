@@ -0,0 +1,138 @@
+"""
+Fast layout preflight for a menu PDF (--probe).
+
+A changed layout used to surface only after a full extraction returned
+"No rows extracted from PDF" or a suspiciously small count. probe_pdf() reads a
+few evenly spaced pages, checks them for the source's header markers and
+expected column counts, and runs the importer's own row parser on just those
+pages to predict the yield for the whole range. It opens the PDF in-process
+and touches `sample` pages, so it answers go/no-go in well under a second for
+the guides we import.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from .backends import REFERENCE_BACKEND, PdfSource, open_document
+
+
+DEFAULT_SAMPLE_PAGES = 3
+# Below this layout-match score the PDF is treated as a new layout (no-go).
+MIN_SCORE = 0.8
+
+
+@dataclass
+class ProbeResult:
+    source: str
+    pages_total: int
+    pages_in_range: int
+    pages_sampled: List[int] = field(default_factory=list)
+    marker_pages: int = 0
+    data_lines: int = 0
+    data_lines_ok: int = 0
+    sample_rows: int = 0
+    predicted_rows: int = 0
+    expected_rows: Optional[int] = None
+    score: float = 0.0
+    elapsed_s: float = 0.0
+    ok: bool = False
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True)
+
+
+def _sample_pages(start: int, stop: int, sample: int) -> List[int]:
+    n = stop - start
+    if n <= 0:
+        return []
+    if n <= sample:
+        return list(range(start, stop))
+    if sample == 1:
+        return [start + n // 2]
+    # Evenly spaced, always including the first and last page of the range.
+    picks = {start + round(i * (n - 1) / (sample - 1)) for i in range(sample)}
+    return sorted(picks)
+
+
+def _has_marker(text: str, markers: Sequence[Sequence[str]]) -> bool:
+    for line in text.split("\n"):
+        for group in markers:
+            if all(m in line for m in group):
+                return True
+    return False
+
+
+def probe_pdf(
+    source: PdfSource,
+    *,
+    markers: Sequence[Sequence[str]],
+    check_line: Callable[[str], Optional[bool]],
+    count_rows: Callable[[Iterable[Tuple[int, str]]], int],
+    start: int = 0,
+    stop: Optional[int] = None,
+    sample: int = DEFAULT_SAMPLE_PAGES,
+    expected_rows: Optional[int] = None,
+    min_score: float = MIN_SCORE,
+    backend: str = REFERENCE_BACKEND,
+    label: str = "",
+) -> ProbeResult:
+    """
+    markers:     groups of strings that must appear together on one line of a
+                 table page (e.g. ("Avg Qty / Serve", "Avg Qty / 100g")).
+    check_line:  None for lines that are not table rows, otherwise whether the
+                 row has the expected number of columns.
+    count_rows:  the importer's parser, run on the sampled (page_index, text).
+    """
+    t0 = time.perf_counter()
+    label = label or (source if isinstance(source, str) else getattr(source, "url", "<bytes>"))
+    with open_document(source, backend) as doc:
+        end = doc.page_count if stop is None else min(doc.page_count, stop)
+        begin = max(0, start)
+        result = ProbeResult(
+            source=label,
+            pages_total=doc.page_count,
+            pages_in_range=max(0, end - begin),
+            expected_rows=expected_rows,
+        )
+        texts: List[Tuple[int, str]] = []
+        for pi in _sample_pages(begin, end, max(1, sample)):
+            text = doc.page_text(pi)
+            texts.append((pi, text))
+            result.pages_sampled.append(pi)
+            if _has_marker(text, markers):
+                result.marker_pages += 1
+            for line in text.split("\n"):
+                verdict = check_line(line.strip())
+                if verdict is None:
+                    continue
+                result.data_lines += 1
+                if verdict:
+                    result.data_lines_ok += 1
+
+    sampled = len(result.pages_sampled)
+    if sampled:
+        result.sample_rows = count_rows(texts)
+        result.predicted_rows = round(result.sample_rows * result.pages_in_range / sampled)
+        marker_score = result.marker_pages / sampled
+        column_score = result.data_lines_ok / result.data_lines if result.data_lines else 0.0
+        result.score = round((marker_score + column_score) / 2, 3)
+    result.ok = result.score >= min_score and result.predicted_rows > 0
+    result.elapsed_s = round(time.perf_counter() - t0, 3)
+    return result
+
+
+def print_probe(result: ProbeResult, out_fp, err_fp) -> None:
+    # JSON on stdout for refresh automation; a readable summary on stderr.
+    print(result.to_json(), file=out_fp)
+    verdict = "GO" if result.ok else "NO-GO"
+    expected = f" (currently {result.expected_rows} in CSV)" if result.expected_rows is not None else ""
+    print(
+        f"Probe {verdict}: score={result.score:.2f} markers={result.marker_pages}/{len(result.pages_sampled)} "
+        f"columns={result.data_lines_ok}/{result.data_lines} predicted_rows={result.predicted_rows}{expected} "
+        f"in {result.elapsed_s:.2f}s",
+        file=err_fp,
+    )
@@ -0,0 +1,201 @@
+"""
+Row provenance sidecar for fast_food_menus.csv (fast_food_menus.provenance.json).
+
+For every row an importer extracts, it records where the numbers came from:
+the PDF's sha256, the 0-based page index and the bbox of the table block
+(item title line down to the last nutrient line), plus the source URL and
+text backend. Each entry carries its row's key as a JSON list,
+[country, chain, item, size_label], so item names may contain any character.
+
+An importer's --reverify re-extracts just that bbox (backends.region_text)
+and diffs the re-parsed row against the CSV, so auditing one reported value
+costs one page region instead of a full-document import.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Collection, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from .backends import BBox, PdfSource, open_document
+from .fonts import FONT_CACHE, print_font_stats
+from .index import MenuIndex
+from .pages import pdf_sha256
+from .rows import MENU_HEADERS, MenuKey, RowBatch
+
+
+PROVENANCE_VERSION = 2
+
+
+def provenance_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".provenance.json"
+
+
+@dataclass
+class Provenance:
+    pdf_sha256: str
+    source_url: str
+    page_index: int  # 0-based
+    bbox: Optional[List[float]]  # (x0, top, x1, bottom); None = whole page
+    backend: str
+
+
+class ProvenanceStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._rows: Dict[MenuKey, Provenance] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            version = data.get("version")
+            if version == PROVENANCE_VERSION:
+                for entry in data.get("rows", []):
+                    key = entry.pop("key")
+                    self._rows[tuple(key)] = Provenance(**entry)
+            elif version == 1:
+                # Keyed "country|chain|item|size_label": only unambiguous when
+                # no field holds a "|"; the others are dropped (re-import to
+                # record them again).
+                for k, v in data.get("rows", {}).items():
+                    parts = k.split("|")
+                    if len(parts) == 4:
+                        self._rows[tuple(parts)] = Provenance(**v)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, key: MenuKey) -> Optional[Provenance]:
+        return self._rows.get(tuple(key))
+
+    def items(self) -> Iterator[Tuple[MenuKey, Provenance]]:
+        return iter(self._rows.items())
+
+    def record(self, batch: RowBatch, pdf_sha256: str, backend: str) -> int:
+        """Record every row of `batch` that knows its origin; returns how many."""
+        n = 0
+        for i in range(len(batch)):
+            origin = batch.origin[i]
+            if origin is None:
+                continue
+            page_index, bbox = origin
+            self._rows[batch.key(i)] = Provenance(
+                pdf_sha256=pdf_sha256,
+                source_url=batch.source_url[i],
+                page_index=page_index,
+                bbox=[round(v, 2) for v in bbox] if bbox is not None else None,
+                backend=backend,
+            )
+            n += 1
+        return n
+
+    def save(self) -> None:
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            rows = [{"key": list(k), **asdict(v)} for k, v in sorted(self._rows.items())]
+            json.dump({"version": PROVENANCE_VERSION, "rows": rows}, f, indent=1, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+
+def record_provenance(csv_path: str, batch: RowBatch, pdf_sha256: str, backend: str) -> int:
+    store = ProvenanceStore(provenance_path(csv_path))
+    n = store.record(batch, pdf_sha256, backend)
+    store.save()
+    return n
+
+
+def union_bbox(a: Optional[BBox], b: Optional[BBox]) -> Optional[BBox]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def diff_record(stored: Sequence[str], extracted: Sequence[str]) -> List[str]:
+    """Column-by-column differences between a CSV row and a re-extracted one."""
+    out = []
+    for name, a, b in zip(MENU_HEADERS, stored, extracted):
+        if a == b:
+            continue
+        try:
+            if float(a) == float(b):
+                continue  # "337" vs "337.0"
+        except ValueError:
+            pass
+        out.append(f"{name}: csv={a!r} pdf={b!r}")
+    return out
+
+
+def _stored_record(csv_path: str, key: MenuKey) -> Optional[List[str]]:
+    with MenuIndex.open_or_build(csv_path) as index:
+        return index.lookup(key)
+
+
+def reverify(
+    csv_path: str,
+    pdf: PdfSource,
+    country: str,
+    chain: str,
+    item: str,
+    parse_region: Callable[[int, str, str], RowBatch],
+    out_fp: TextIO,
+    pdf_shas: Optional[Collection[str]] = None,
+) -> int:
+    """
+    Re-extract the recorded region of every size of `item` and diff it against the CSV.
+
+    `parse_region(page_index, text, source_url)` is the importer's own parser.
+    `pdf_shas` are the hashes the rows may have been recorded under (default:
+    pdf_sha256(pdf)); a RemotePdf's identity() differs from the content
+    sha256 of the same file downloaded in full.
+    Returns 0 if everything matches, 1 on differences, 2 if it can't check.
+    """
+    store = ProvenanceStore(provenance_path(csv_path))
+    entries = sorted((k, p) for k, p in store.items() if k[:3] == (country, chain, item))
+    if not entries:
+        print(f"No provenance recorded for {country} / {chain} / {item}.", file=out_fp)
+        return 2
+
+    shas = set(pdf_shas) if pdf_shas else {pdf_sha256(pdf)}
+    stale = sorted({p.pdf_sha256 for _, p in entries if p.pdf_sha256 not in shas})
+    if stale:
+        print(f"Rows were extracted from PDF {', '.join(stale)}; this PDF is {', '.join(sorted(shas))}.", file=out_fp)
+        return 2
+
+    status = 0
+    regions: Dict[tuple, RowBatch] = {}
+    t0 = time.perf_counter()
+    for key, p in entries:
+        region = (p.backend, p.page_index, tuple(p.bbox) if p.bbox else None, p.source_url)
+        if region not in regions:
+            with open_document(pdf, p.backend) as doc:
+                if p.bbox is not None:
+                    text = doc.region_text(p.page_index, tuple(p.bbox))
+                else:
+                    text = doc.page_text(p.page_index)
+            regions[region] = parse_region(p.page_index, text, p.source_url)
+        batch = regions[region]
+
+        where = f"page {p.page_index + 1}" + (f" bbox {p.bbox}" if p.bbox else "")
+        extracted = next((batch.record(i) for i in range(len(batch)) if batch.key(i) == key), None)
+        stored = _stored_record(csv_path, key)
+        if extracted is None:
+            print(f"MISSING {' / '.join(key)}: not found when re-extracting {where}", file=out_fp)
+            status = 1
+        elif stored is None:
+            print(f"MISSING {' / '.join(key)}: no longer in {csv_path}", file=out_fp)
+            status = 1
+        else:
+            diffs = diff_record(stored, extracted)
+            print(f"{'DIFF' if diffs else 'OK  '} {' / '.join(key)} ({where})", file=out_fp)
+            for d in diffs:
+                print(f"     {d}", file=out_fp)
+            if diffs:
+                status = 1
+    print(f"# Re-extracted {len(regions)} region(s) in {(time.perf_counter() - t0) * 1000:.0f} ms", file=out_fp)
+    print_font_stats(FONT_CACHE.stats(), out_fp)
+    return status
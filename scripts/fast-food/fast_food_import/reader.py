@@ -0,0 +1,235 @@
+"""
+Chunked parallel reader for menu files.
+
+iter_menu_records() parses fast_food_menus.csv on one core and hands out 13
+str cells per row. At millions of rows that is the fixed cost of every
+validation. read_menu_columns():
+- applies the exact required_headers check (check_menu_headers) up front
+- splits the bytes into chunks at record boundaries
+  (menu_csv.record_boundary: a quoted newline never straddles two chunks)
+- parses the chunks in a process pool, each into MenuColumns
+- concatenates them in file order
+
+MenuColumns is columnar like RowBatch (tenths in array('i'), interned
+low-cardinality strings) but keeps every cell's exact text: a numeric cell
+that isn't one of format_tenths()'s two spellings ("337.0" / "337") is kept
+verbatim, and so is every record without len(MENU_HEADERS) cells (blank
+lines included). record(i) is exactly what iter_menu_records() yields for
+that record.
+
+With one worker, or a file under PARALLEL_MIN_BYTES, the records are streamed
+from iter_menu_records() instead: splitting and a pool only pay for
+themselves with several CPUs and a big file.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import math
+import os
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .menu_csv import iter_record_spans, parse_record, record_boundary
+from .rows import MENU_HEADERS, MISSING, NUMERIC_COLUMNS, SCALE, STRING_COLUMNS, check_menu_headers, format_tenths
+from .storage import iter_menu_records
+
+
+PARALLEL_MIN_BYTES = 4 << 20
+
+# Upper bound on a chunk, so neither side ever decodes the whole file at once.
+CHUNK_MAX_BYTES = 8 << 20
+
+# Chunks per worker: small enough that one slow chunk doesn't leave the rest idle.
+CHUNKS_PER_WORKER = 4
+
+_FIRST_NUMERIC = MENU_HEADERS.index(NUMERIC_COLUMNS[0])
+_VERBATIM = (MISSING, 0)
+_DIGITS = "0123456789"
+
+class MenuColumns:
+    """The data records of a menu file, one column per MENU_HEADERS field."""
+
+    __slots__ = STRING_COLUMNS + NUMERIC_COLUMNS + ("spelling", "verbatim", "irregular")
+
+    def __init__(self) -> None:
+        self.country: List[str] = []
+        self.chain: List[str] = []
+        self.item: List[str] = []
+        self.size_label: List[str] = []
+        self.source_url: List[str] = []
+        for col in NUMERIC_COLUMNS:
+            setattr(self, col, array("i"))
+        # Bit k set: NUMERIC_COLUMNS[k] is written without the ".0" (format_tenths(v, True)).
+        self.spelling = bytearray()
+        # (record, MENU_HEADERS index) -> numeric cells format_tenths() can't reproduce
+        # ("2.25", "0.50", "None"); their column holds MISSING.
+        self.verbatim: Dict[Tuple[int, int], str] = {}
+        # record -> cells of records that don't have len(MENU_HEADERS) cells; their
+        # columns hold "" / MISSING.
+        self.irregular: Dict[int, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.item)
+
+    def extend(self, other: "MenuColumns") -> None:
+        base = len(self)
+        for col in STRING_COLUMNS + NUMERIC_COLUMNS + ("spelling",):
+            getattr(self, col).extend(getattr(other, col))
+        self.verbatim.update(((i + base, c), text) for (i, c), text in other.verbatim.items())
+        self.irregular.update((i + base, cells) for i, cells in other.irregular.items())
+
+    def keys(self) -> List[Tuple[str, ...]]:
+        # tuple(record[:4]) of every record, as the serial callers compute it.
+        keys: List[Tuple[str, ...]] = list(zip(self.country, self.chain, self.item, self.size_label))
+        for i, cells in self.irregular.items():
+            keys[i] = tuple(cells[:4])
+        return keys
+
+    def record(self, i: int) -> List[str]:
+        cells = self.irregular.get(i)
+        if cells is not None:
+            return list(cells)
+        bits = self.spelling[i]
+        out = [self.country[i], self.chain[i], self.item[i], self.size_label[i]]
+        for k, col in enumerate(NUMERIC_COLUMNS):
+            text = self.verbatim.get((i, _FIRST_NUMERIC + k)) if self.verbatim else None
+            out.append(text if text is not None else format_tenths(getattr(self, col)[i], bool(bits >> k & 1)))
+        out.append(self.source_url[i])
+        return out
+
+    def iter_records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[List[str]]:
+        for i in range(start, len(self) if stop is None else stop):
+            yield self.record(i)
+
+
+def _slow_cell(text: str) -> Optional[Tuple[int, int]]:
+    try:
+        x = float(text)
+    except ValueError:
+        return None
+    if not math.isfinite(x):
+        return None
+    v = int(round(x * SCALE))
+    if not MISSING < v < 2**31:
+        return None
+    if format_tenths(v) == text:
+        return v, 0
+    if format_tenths(v, True) == text:
+        return v, 1
+    return None
+
+
+def _cell(text: str) -> Optional[Tuple[int, int]]:
+    # (tenths, compact bit) if format_tenths() spells `text` back exactly, else None.
+    whole, dot, frac = text.partition(".")
+    if whole.isdigit() and whole.isascii() and (whole[0] != "0" or len(whole) == 1) and len(whole) < 9:
+        if not dot:
+            return int(whole) * SCALE, 1
+        if len(frac) == 1 and frac in _DIGITS:
+            return int(whole) * SCALE + ord(frac) - 48, 0
+        return None
+    return _slow_cell(text)
+
+
+def _fill(out: MenuColumns, rows: Iterable[List[str]]) -> MenuColumns:
+    country, chain, item, size_label, source_url = (getattr(out, c) for c in STRING_COLUMNS)
+    numeric = [(getattr(out, c), _FIRST_NUMERIC + k, k) for k, c in enumerate(NUMERIC_COLUMNS)]
+    spelling, verbatim, irregular = out.spelling, out.verbatim, out.irregular
+    intern = sys.intern
+    width = len(MENU_HEADERS)
+    # Numeric spellings repeat a lot ("0.0", "12", ...): parse each distinct one once.
+    cells: Dict[str, Tuple[int, int]] = {"": (MISSING, 0)}
+    n = len(out)
+    for row in rows:
+        if len(row) != width:
+            irregular[n] = row
+            for col in (country, chain, item, size_label, source_url):
+                col.append("")
+            for values, _, _ in numeric:
+                values.append(MISSING)
+            spelling.append(0)
+            n += 1
+            continue
+        country.append(intern(row[0]))
+        chain.append(intern(row[1]))
+        item.append(row[2])
+        size_label.append(intern(row[3]))
+        source_url.append(intern(row[12]))
+        bits = 0
+        for values, c, k in numeric:
+            text = row[c]
+            cell = cells.get(text)
+            if cell is None:
+                cell = cells[text] = _cell(text) or _VERBATIM
+            if cell is _VERBATIM:
+                verbatim[(n, c)] = text
+            values.append(cell[0])
+            bits |= cell[1] << k
+        spelling.append(bits)
+        n += 1
+    return out
+
+
+def _parse_chunk(job: Tuple[str, int, int]) -> MenuColumns:
+    # One chunk, read by the worker itself so the parent never pickles bytes.
+    path, start, end = job
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return _fill(MenuColumns(), csv.reader(io.StringIO(data.decode("utf-8"), newline="")))
+
+
+def chunk_bounds(data: bytes, start: int, parts: int) -> List[Tuple[int, int]]:
+    """Split data[start:] into at least `parts` (start, end) ranges of whole records."""
+    n = len(data)
+    step = max(1, min(CHUNK_MAX_BYTES, (n - start) // max(1, parts)))
+    bounds: List[Tuple[int, int]] = []
+    pos = start
+    while pos < n:
+        end = record_boundary(data, pos, pos + step)
+        bounds.append((pos, end))
+        pos = end
+    return bounds
+
+
+def read_menu_columns(path: str, workers: Optional[int] = None) -> MenuColumns:
+    """
+    Every data record of `path` as MenuColumns.
+
+    Raises ValueError (check_menu_headers' message) unless the headers are
+    exactly MENU_HEADERS. workers=None uses every CPU; with workers=1, or a
+    file under PARALLEL_MIN_BYTES, this is iter_menu_records() in this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or os.path.getsize(path) < PARALLEL_MIN_BYTES:
+        # The serial reader, streamed straight into columns: no pool, no
+        # whole-file buffer, nothing to split.
+        records = iter_menu_records(path)
+        _check_headers(next(records, []))
+        return _fill(MenuColumns(), records)
+
+    with open(path, "rb") as f:
+        data = f.read()
+    header = next(iter_record_spans(data), (0, 0))
+    _check_headers(parse_record(data[header[0] : header[1]]))
+
+    bounds = chunk_bounds(data, header[1], workers * CHUNKS_PER_WORKER)
+    jobs = [(path, s, e) for s, e in bounds]  # workers read their own range
+    del data
+
+    import multiprocessing  # only big files start a pool; keeps CLI startup light
+
+    out = MenuColumns()
+    with multiprocessing.get_context().Pool(min(workers, len(jobs))) as pool:
+        for part in pool.imap(_parse_chunk, jobs):
+            out.extend(part)
+    return out
+
+
+def _check_headers(headers: List[str]) -> None:
+    err = io.StringIO()
+    if not check_menu_headers(headers, err):
+        raise ValueError(err.getvalue().strip())
@@ -0,0 +1,205 @@
+"""
+Lazy remote PDFs over HTTP Range requests.
+
+download_pdf() pulls the whole guide even when only a few pages are parsed.
+open_remote_pdf() instead asks for the first block with a Range header:
+- 206 + a Content-Range total: returns a RemotePdf. Backends open it as a
+  seekable file (RangeFile), so pdfminer reads the trailer/xref and then only
+  the objects of the pages actually extracted, a block at a time
+- 200 (server ignores Range) or no usable total: the response is already the
+  whole file, so it is returned as bytes, exactly like download_pdf()
+
+RangeFile keeps an LRU cache of fixed-size blocks, coalesces adjacent missing
+blocks into one request, and sends If-Range with the ETag so a PDF replaced
+mid-run fails loudly instead of mixing two versions.
+
+That only pays off when few pages are parsed (--probe, --retry-quarantined).
+A full import reads every page, so it downloads the file: one request instead
+of dozens, done in the fetch stage where it overlaps extraction rather than
+inside the page budget, and reused by restarted workers.
+
+RemotePdf is a small picklable handle (URL, size, validator, first block), so
+it can be handed to page-budget worker processes; each opens its own session.
+requests is only imported when a remote PDF is fetched.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+DEFAULT_CACHE_BLOCKS = 256  # 16 MiB with the default block size
+HTTP_TIMEOUT_S = 60
+HTTP_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+)")
+
+
+def _session() -> Any:
+    import requests
+
+    s = requests.Session()
+    s.headers.update(HTTP_HEADERS)
+    return s
+
+
+def _check_pdf(url: str, content_type: str, head: bytes) -> None:
+    ct = content_type.lower()
+    if "pdf" not in ct and not head.startswith(b"%PDF"):
+        raise RuntimeError(f"Expected PDF response from {url}, got content-type={ct!r}")
+
+
+@dataclass
+class RemotePdf:
+    url: str
+    size: int
+    etag: str = ""
+    last_modified: str = ""
+    block_size: int = DEFAULT_BLOCK_SIZE
+    cache_blocks: int = DEFAULT_CACHE_BLOCKS
+    head: bytes = b""  # block 0, already fetched by open_remote_pdf()
+
+    def identity(self) -> str:
+        # Stands in for the content sha256 (quarantine keys) without downloading
+        # the whole file: URL + size + validator.
+        key = f"{self.url}\n{self.size}\n{self.etag or self.last_modified}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def open(self) -> io.BufferedReader:
+        return io.BufferedReader(RangeFile(self), buffer_size=self.block_size)
+
+
+class RangeFile(io.RawIOBase):
+    def __init__(self, remote: RemotePdf) -> None:
+        super().__init__()
+        self._remote = remote
+        self._pos = 0
+        self._blocks: "OrderedDict[int, bytes]" = OrderedDict()
+        self._session: Any = None
+        self.requests = 0
+        self.bytes_fetched = 0
+        if remote.head:
+            self._blocks[0] = remote.head
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._remote.size + offset
+        else:
+            raise ValueError(f"invalid whence {whence}")
+        if pos < 0:
+            raise ValueError("negative seek position")
+        self._pos = pos
+        return pos
+
+    def readinto(self, b: Any) -> int:
+        size, bs = self._remote.size, self._remote.block_size
+        n = min(len(b), size - self._pos)
+        if n <= 0:
+            return 0
+        first, last = self._pos // bs, (self._pos + n - 1) // bs
+        run_start: Optional[int] = None
+        for i in range(first, last + 2):
+            if i <= last and i not in self._blocks:
+                if run_start is None:
+                    run_start = i
+            elif run_start is not None:
+                self._fetch(run_start, i - 1)
+                run_start = None
+
+        view = memoryview(b)
+        done = 0
+        while done < n:
+            i, off = divmod(self._pos + done, bs)
+            block = self._blocks[i]
+            self._blocks.move_to_end(i)
+            chunk = block[off : off + n - done]
+            view[done : done + len(chunk)] = chunk
+            done += len(chunk)
+        self._pos += n
+        while len(self._blocks) > max(self._remote.cache_blocks, last - first + 1):
+            self._blocks.popitem(last=False)
+        return n
+
+    def _fetch(self, first: int, last: int) -> None:
+        r = self._remote
+        start = first * r.block_size
+        end = min(r.size, (last + 1) * r.block_size) - 1
+        headers = {"Range": f"bytes={start}-{end}"}
+        if r.etag or r.last_modified:
+            headers["If-Range"] = r.etag or r.last_modified
+        if self._session is None:
+            self._session = _session()
+        resp = self._session.get(r.url, headers=headers, timeout=HTTP_TIMEOUT_S)
+        resp.raise_for_status()
+        data = resp.content
+        if resp.status_code != 206 or len(data) != end - start + 1:
+            raise IOError(f"Range request for bytes {start}-{end} of {r.url} was not honoured (PDF changed?)")
+        self.requests += 1
+        self.bytes_fetched += len(data)
+        for i in range(first, last + 1):
+            off = (i - first) * r.block_size
+            self._blocks[i] = data[off : off + r.block_size]
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        super().close()
+
+
+def open_remote_pdf(url: str, block_size: int = DEFAULT_BLOCK_SIZE) -> Union[RemotePdf, bytes]:
+    """A RemotePdf if the server honours Range requests, else the downloaded bytes."""
+    with _session() as s:
+        resp = s.get(url, headers={"Range": f"bytes=0-{block_size - 1}"}, timeout=HTTP_TIMEOUT_S)
+        resp.raise_for_status()
+        data = resp.content
+        _check_pdf(url, resp.headers.get("content-type") or "", data)
+        m = _CONTENT_RANGE_RE.match(resp.headers.get("content-range") or "")
+        if resp.status_code != 206 or not m or int(m.group(1)) != 0:
+            # Full body (Range ignored) or an unusable partial answer.
+            if resp.status_code == 206:
+                data = download_pdf(url)
+            return data
+
+        size = int(m.group(3))
+        if len(data) >= size:
+            return data[:size]
+        if len(data) != block_size:
+            return download_pdf(url)
+        etag = resp.headers.get("etag") or ""
+        return RemotePdf(
+            url=url,
+            size=size,
+            # Weak validators aren't allowed in If-Range.
+            etag="" if etag.startswith("W/") else etag,
+            last_modified=resp.headers.get("last-modified") or "",
+            block_size=block_size,
+            head=data,
+        )
+
+
+def download_pdf(url: str) -> bytes:
+    with _session() as s:
+        resp = s.get(url, timeout=HTTP_TIMEOUT_S)
+        resp.raise_for_status()
+        _check_pdf(url, resp.headers.get("content-type") or "", resp.content)
+        return resp.content
@@ -0,0 +1,259 @@
+"""
+Columnar row batches for extracted menu servings.
+
+Importers used to build one 13-key dict (or a frozen dataclass) per serving and
+stringify every number straight away. RowBatch keeps one column per CSV field
+instead:
+- numeric columns are array('i') in fixed-point tenths (27.4 g -> 274), with
+  MISSING marking blank cells; a value with more decimals (1.25) also keeps
+  its text in RowBatch.verbatim, so it is written back unrounded
+- country/chain/size_label/source_url are interned, so a 100k-row batch holds
+  a handful of distinct string objects for those columns
+- CSV text is only produced when the batch is written (iter_records)
+
+Rows can also carry the PDF's per-100g (or per-100mL) values in the *_100
+columns, with the unit ("g" or "mL") in per_100. They are not
+fast_food_menus.csv columns; macros.py writes them to fast_food_macros.csv
+from the same parse.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+
+MENU_HEADERS = [
+    "country",
+    "chain",
+    "item",
+    "size_label",
+    "grams",
+    "ml",
+    "calories",
+    "protein_g",
+    "carbs_g",
+    "fat_g",
+    "fiber_g",
+    "sugar_g",
+    "source_url",
+]
+
+NUMERIC_COLUMNS = (
+    "grams",
+    "ml",
+    "calories",
+    "protein_g",
+    "carbs_g",
+    "fat_g",
+    "fiber_g",
+    "sugar_g",
+)
+
+# Per-100g/100mL counterparts of the nutrient columns, same fixed-point scale.
+PER_100_COLUMNS = (
+    "calories_100",
+    "protein_g_100",
+    "carbs_g_100",
+    "fat_g_100",
+    "fiber_g_100",
+    "sugar_g_100",
+)
+
+STRING_COLUMNS = ("country", "chain", "item", "size_label", "source_url")
+
+# Low-cardinality columns stored as dictionary ids in the Parquet export.
+DICTIONARY_COLUMNS = ("country", "chain", "size_label", "source_url")
+
+# Fixed-point scale: every numeric cell is stored as round(value * SCALE).
+SCALE = 10
+
+# Sentinel for an empty numeric cell (smallest 32-bit int, never a real value).
+MISSING = -(2**31)
+
+MenuKey = Tuple[str, str, str, str]
+
+# Where a row was extracted from: (page_index, bbox or None). The bbox is
+# (x0, top, x1, bottom) in PDF points, top measured from the top of the page.
+Origin = Tuple[int, Optional[Tuple[float, float, float, float]]]
+
+
+def check_menu_headers(headers: Sequence[str], err_fp: TextIO) -> bool:
+    """The exact required_headers check every writer of fast_food_menus.csv applies."""
+    required_headers = MENU_HEADERS
+    if list(headers) == required_headers:
+        return True
+    print("Unexpected CSV headers. Refusing to write.", file=err_fp)
+    print("Expected:", ",".join(required_headers), file=err_fp)
+    print("Got     :", ",".join(headers), file=err_fp)
+    return False
+
+
+def to_tenths(x: Optional[float]) -> int:
+    # Nearest tenth; see is_tenths() for whether that is exact.
+    if x is None:
+        return MISSING
+    return int(round(x * SCALE))
+
+
+def is_tenths(x: float) -> bool:
+    """True if x has at most one decimal place, i.e. to_tenths() loses nothing."""
+    scaled = x * SCALE
+    return abs(scaled - round(scaled)) < 1e-6
+
+
+def format_tenths(v: int, compact: bool = False) -> str:
+    """
+    Format a fixed-point cell for CSV output.
+
+    compact=False matches str(float) for one-decimal values ("337.0", "6.5").
+    compact=True drops a trailing ".0" ("337", "6.5").
+    """
+    if v == MISSING:
+        return ""
+    sign = "-" if v < 0 else ""
+    whole, frac = divmod(abs(v), SCALE)
+    if compact and frac == 0:
+        return f"{sign}{whole}"
+    return f"{sign}{whole}.{frac}"
+
+
+class RowBatch:
+    __slots__ = ("compact", "origin", "per_100", "verbatim") + STRING_COLUMNS + NUMERIC_COLUMNS + PER_100_COLUMNS
+
+    def __init__(self, compact: bool = False) -> None:
+        self.compact = compact
+        self.country: List[str] = []
+        self.chain: List[str] = []
+        self.item: List[str] = []
+        self.size_label: List[str] = []
+        self.source_url: List[str] = []
+        for col in NUMERIC_COLUMNS + PER_100_COLUMNS:
+            setattr(self, col, array("i"))
+        # Provenance; not a CSV column (see provenance.py).
+        self.origin: List[Optional[Origin]] = []
+        # Unit of the *_100 columns: "g" or "mL".
+        self.per_100: List[str] = []
+        # (row, column) -> text of values that aren't whole tenths ("1.25"); their
+        # column holds the nearest tenth.
+        self.verbatim: Dict[Tuple[int, str], str] = {}
+
+    def __len__(self) -> int:
+        return len(self.item)
+
+    def append(
+        self,
+        *,
+        country: str,
+        chain: str,
+        item: str,
+        size_label: str,
+        source_url: str,
+        grams: Optional[float] = None,
+        ml: Optional[float] = None,
+        calories: Optional[float] = None,
+        protein_g: Optional[float] = None,
+        carbs_g: Optional[float] = None,
+        fat_g: Optional[float] = None,
+        fiber_g: Optional[float] = None,
+        sugar_g: Optional[float] = None,
+        calories_100: Optional[float] = None,
+        protein_g_100: Optional[float] = None,
+        carbs_g_100: Optional[float] = None,
+        fat_g_100: Optional[float] = None,
+        fiber_g_100: Optional[float] = None,
+        sugar_g_100: Optional[float] = None,
+        per_100: str = "g",
+        origin: Optional[Origin] = None,
+    ) -> None:
+        i = len(self.item)
+        self.country.append(sys.intern(country))
+        self.chain.append(sys.intern(chain))
+        self.item.append(item)
+        self.size_label.append(sys.intern(size_label))
+        self.source_url.append(sys.intern(source_url))
+        values = (
+            grams,
+            ml,
+            calories,
+            protein_g,
+            carbs_g,
+            fat_g,
+            fiber_g,
+            sugar_g,
+            calories_100,
+            protein_g_100,
+            carbs_g_100,
+            fat_g_100,
+            fiber_g_100,
+            sugar_g_100,
+        )
+        for col, x in zip(NUMERIC_COLUMNS + PER_100_COLUMNS, values):
+            getattr(self, col).append(to_tenths(x))
+            if x is not None and not is_tenths(x):
+                self.verbatim[(i, col)] = str(float(x))
+        self.origin.append(origin)
+        self.per_100.append(sys.intern(per_100))
+
+    def extend(self, other: "RowBatch") -> None:
+        base = len(self)
+        for col in STRING_COLUMNS + NUMERIC_COLUMNS + PER_100_COLUMNS + ("origin", "per_100"):
+            getattr(self, col).extend(getattr(other, col))
+        self.verbatim.update(((i + base, col), text) for (i, col), text in other.verbatim.items())
+
+    def key(self, i: int) -> MenuKey:
+        # Dedupe key used by every importer: (country, chain, item, size_label).
+        return (self.country[i], self.chain[i], self.item[i], self.size_label[i])
+
+    def take(self, indices: Iterable[int]) -> "RowBatch":
+        out = RowBatch(compact=self.compact)
+        idx = list(indices)
+        for col in STRING_COLUMNS + ("origin", "per_100"):
+            src = getattr(self, col)
+            getattr(out, col).extend(src[i] for i in idx)
+        for col in NUMERIC_COLUMNS + PER_100_COLUMNS:
+            src = getattr(self, col)
+            getattr(out, col).extend(src[i] for i in idx)
+        if self.verbatim:
+            for j, i in enumerate(idx):
+                for col in NUMERIC_COLUMNS + PER_100_COLUMNS:
+                    text = self.verbatim.get((i, col))
+                    if text is not None:
+                        out.verbatim[(j, col)] = text
+        return out
+
+    def text(self, i: int, col: str, compact: Optional[bool] = None) -> str:
+        """CSV text of numeric column `col` in row i."""
+        text = self.verbatim.get((i, col)) if self.verbatim else None
+        if text is not None:
+            return text
+        return format_tenths(getattr(self, col)[i], self.compact if compact is None else compact)
+
+    def record(self, i: int) -> List[str]:
+        if self.verbatim:
+            return [self.country[i], self.chain[i], self.item[i], self.size_label[i]] + [
+                self.text(i, col) for col in NUMERIC_COLUMNS
+            ] + [self.source_url[i]]
+        fmt = format_tenths
+        c = self.compact
+        return [
+            self.country[i],
+            self.chain[i],
+            self.item[i],
+            self.size_label[i],
+            fmt(self.grams[i], c),
+            fmt(self.ml[i], c),
+            fmt(self.calories[i], c),
+            fmt(self.protein_g[i], c),
+            fmt(self.carbs_g[i], c),
+            fmt(self.fat_g[i], c),
+            fmt(self.fiber_g[i], c),
+            fmt(self.sugar_g[i], c),
+            self.source_url[i],
+        ]
+
+    def iter_records(self) -> Iterator[List[str]]:
+        # Rows in MENU_HEADERS order, formatted for csv.writer.
+        for i in range(len(self)):
+            yield self.record(i)
@@ -0,0 +1,32 @@
+"""
+Menu parsers, one per official nutrition PDF.
+
+The import-*.py scripts are CLIs around these, and api.py drives the same
+code in-process. Every source exposes COUNTRY, CHAIN, TEXT_BACKEND and
+iter_rows(pdf, source_url=..., *, page_budget_s, quarantine, only_pages,
+backend, with_boxes). A source is a module (guzman_y_gomez) or a Guide
+(mcdonalds.CORE_FOOD); SOURCES names it "module" or "module:attribute".
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any, Dict
+
+
+SOURCES: Dict[str, str] = {
+    "mcdonalds-au-core": "mcdonalds:CORE_FOOD",
+    "mcdonalds-au-mccafe": "mcdonalds:MCCAFE_BEVERAGES",
+    "guzman-y-gomez-au": "guzman_y_gomez",
+}
+
+
+def load_source(source: str) -> Any:
+    """The parser behind `source`; imports its module on first use."""
+    try:
+        target = SOURCES[source]
+    except KeyError:
+        raise ValueError(f"Unknown source {source!r} (choose from {', '.join(sorted(SOURCES))})") from None
+    module_name, _, attr = target.partition(":")
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    return getattr(module, attr) if attr else module
@@ -0,0 +1,289 @@
+"""
+Guzman y Gomez (Australia) nutrition and allergen guide.
+
+Source (official): https://www.guzmanygomez.com.au/nutrition/
+PDF currently linked as of Jan 28, 2026.
+
+Every page holds tables under an all-caps section heading ("BURRITOS"); each
+item row ends in ten numbers (serve size, energy, macros, sodium). Rows are
+named "<Section> - <item>", with "- Small/Medium/Large" turned into a size.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Collection, Iterable, Iterator, List, Optional
+
+from ..backends import BBox, PdfSource
+from ..pages import DEFAULT_PAGE_BUDGET_S, QuarantineReport, iter_page_texts, pdf_sha256
+from ..provenance import union_bbox
+from ..remote import RemotePdf
+from ..rows import RowBatch, to_tenths
+
+
+PDF_URL = "https://www.guzmanygomez.com.au/wp-content/uploads/2026/02/260128_NUTRITION_ALLERGEN_GUIDE_420X297MM.pdf"
+SOURCE_URL = "https://www.guzmanygomez.com.au/nutrition/"
+
+COUNTRY = "AU"
+CHAIN = "Guzman y Gomez"
+
+# Text backend for this PDF (see fast_food_import/backends.py). Only switch after
+# --validate-backend reports identical rows to the reference backend.
+TEXT_BACKEND = "pdfplumber"
+
+
+NUM_RE = re.compile(r"^\d+(?:\.\d+)?$")
+
+# Column header line printed above every table (used by --probe).
+TABLE_MARKERS = (("SERVE SIZE",),)
+
+
+def _to_title(s: str) -> str:
+    # Keep it simple: "CALI BURRITO" -> "Cali Burrito", "LITTLE G’S" -> "Little G's"
+    s = s.replace("\u2019", "'").strip()
+    s = " ".join(s.split())
+    return s.title()
+
+
+def _clean_section_line(line: str) -> Optional[str]:
+    line = line.strip()
+    if not line:
+        return None
+
+    # Many pages have headers like "SERVE SIZE ENERGY ..." (not a real section).
+    # Sometimes the section name and headers are on the same line; keep only the section part.
+    if "SERVE SIZE" in line:
+        before = line.split("SERVE SIZE", 1)[0].strip(" ,")
+        line = before
+
+    line = line.strip()
+    if not line:
+        return None
+
+    # Skip obvious non-sections.
+    if line in {"NUTRITIONAL INFORMATION", "CARBOHYDRATE"}:
+        return None
+    if line.strip().isdigit():
+        return None
+    if line.startswith("(") or "(g)" in line and "(kJ)" in line:
+        return None
+    if "ENERGY" in line or "PROTEIN" in line or "TOTAL FAT" in line:
+        return None
+
+    # Section headings are all caps in this PDF.
+    if not line.isupper():
+        return None
+
+    return line or None
+
+
+def _split_size_label(name: str) -> tuple[str, Optional[str]]:
+    # Turn "... - Small/Medium/Large" into a serving-size dropdown.
+    # We only do this for true size words; we do NOT treat "Mild/Spicy" as sizes.
+    cleaned = (
+        name.replace("\u2013", "-")
+        .replace("\u2014", "-")
+        .replace("\u2212", "-")
+        .strip()
+    )
+
+    m = re.match(r"^(.*?)(?:\s*-\s*)(Small|Medium|Large)$", cleaned, flags=re.IGNORECASE)
+    if m:
+        base = m.group(1).strip()
+        size = m.group(2).title()
+        return (base, size)
+
+    # Special-case: "Family Fries" is clearly a size in the PDF.
+    m2 = re.match(r"^(.*?)(?:\s*-\s*)(Family Fries)$", cleaned, flags=re.IGNORECASE)
+    if m2:
+        base = m2.group(1).strip()
+        return (base, "Family")
+
+    return (name.strip(), None)
+
+
+def _parse_data_line(line: str) -> Optional[tuple[str, str, list[float]]]:
+    # Skip modifier / delta lines like:
+    # "For spicy add + 30 + 85 + 20 ..."
+    # "Swap White Rice for Brown Rice 0 - 60 - 14 ..."
+    lo = line.lower()
+    if lo.startswith("for spicy add") or lo.startswith("swap ") or lo.startswith("add "):
+        return None
+    if "+" in line:
+        # In this PDF, these are deltas/swaps, not full item rows.
+        return None
+
+    parts = line.split()
+    if len(parts) < 12:
+        return None
+
+    nums: list[str] = []
+    i = len(parts) - 1
+    while i >= 0 and len(nums) < 10:
+        tok = parts[i]
+        if NUM_RE.match(tok):
+            nums.append(tok)
+            i -= 1
+        else:
+            break
+
+    if len(nums) != 10:
+        return None
+
+    nums = list(reversed(nums))
+    name = " ".join(parts[: i + 1]).strip()
+    if not name or name.isdigit():
+        return None
+
+    base_name, size = _split_size_label(name)
+    size_label = size or "1 serving"
+
+    return (base_name, size_label, [float(x) for x in nums])
+
+
+def probe_line(line: str) -> Optional[bool]:
+    # Item rows end in a run of numbers; a full row has exactly 10 of them.
+    if "+" in line:
+        return None
+    trailing = 0
+    for tok in reversed(line.split()):
+        if not NUM_RE.match(tok):
+            break
+        trailing += 1
+    if trailing < 6:
+        return None
+    return _parse_data_line(line) is not None
+
+
+def extract_rows(
+    pdf: PdfSource,
+    page_budget_s: Optional[float] = DEFAULT_PAGE_BUDGET_S,
+    quarantine: Optional[QuarantineReport] = None,
+    retry_quarantined: bool = False,
+    label: str = "",
+    backend: str = TEXT_BACKEND,
+    with_boxes: bool = False,
+) -> RowBatch:
+    only_pages = None
+    if retry_quarantined and quarantine is not None:
+        only_pages = quarantine.pages_for(pdf_sha256(pdf), label if isinstance(pdf, RemotePdf) else None)
+        if not only_pages:
+            return RowBatch(compact=True)
+
+    rows = RowBatch(compact=True)
+    for batch in iter_rows(
+        pdf,
+        page_budget_s=page_budget_s,
+        quarantine=quarantine,
+        only_pages=only_pages,
+        label=label,
+        backend=backend,
+        with_boxes=with_boxes,
+    ):
+        rows.extend(batch)
+    return rows
+
+
+def iter_rows(
+    pdf: PdfSource,
+    source_url: str = SOURCE_URL,
+    *,
+    page_budget_s: Optional[float] = DEFAULT_PAGE_BUDGET_S,
+    quarantine: Optional[QuarantineReport] = None,
+    only_pages: Optional[Collection[int]] = None,
+    label: str = "",
+    backend: str = TEXT_BACKEND,
+    with_boxes: bool = False,
+) -> Iterator[RowBatch]:
+    """Rows as they are parsed, at most one batch per page (see fast_food_import/api.py)."""
+    pages = iter_page_texts(
+        pdf,
+        only=only_pages,
+        budget_s=page_budget_s,
+        quarantine=quarantine,
+        label=label,
+        backend=backend,
+        with_boxes=with_boxes,
+    )
+    return iter_page_rows(pages, source_url)
+
+
+def rows_from_pages(pages: Iterable[tuple[int, str]], source_url: str = SOURCE_URL) -> RowBatch:
+    rows = RowBatch(compact=True)
+    for batch in iter_page_rows(pages, source_url):
+        rows.extend(batch)
+    return rows
+
+
+def iter_page_rows(pages: Iterable[tuple[int, str]], source_url: str = SOURCE_URL) -> Iterator[RowBatch]:
+    rows = RowBatch(compact=True)
+    section: Optional[str] = None
+    section_title = ""
+    # Box of the section heading, while it is on the current page: a row's region
+    # (provenance.py) runs from its heading down to the row, since the row's name
+    # depends on both. Rows under a heading carried over from the previous page
+    # have no such region and get no origin.
+    section_box: Optional[BBox] = None
+    prev_pi: Optional[int] = None
+
+    # De-dupe, stable order.
+    seen: set[tuple[str, str, str, int]] = set()
+
+    for pi, text in pages:
+        if prev_pi is not None and pi != prev_pi + 1:
+            # A skipped page (quarantined, or not sampled by --probe) sits in between;
+            # its section heading is unknown, so wait for the next heading rather
+            # than filing rows under the wrong section.
+            section = None
+        prev_pi = pi
+        section_box = None
+        boxes: Optional[List[BBox]] = getattr(text, "boxes", None)
+
+        for li, raw in enumerate(text.split("\n")):
+            line = raw.strip()
+            if not line:
+                continue
+            box = boxes[li] if boxes is not None else None
+
+            sec = _clean_section_line(line)
+            if sec:
+                section = sec
+                section_title = _to_title(sec)
+                section_box = box
+                continue
+
+            if not section:
+                continue
+
+            parsed = _parse_data_line(line)
+            if not parsed:
+                continue
+
+            name, size_label, nums = parsed
+            k = (section, name, size_label, to_tenths(nums[0]))
+            if k in seen:
+                continue
+            seen.add(k)
+
+            # Columns in the GYG AU PDF tables:
+            # serve_size_g, energy_kJ, energy_cal, protein_g, total_fat_g, sat_fat_g,
+            # carbohydrate_g, sugars_g, fibre_g, sodium_mg
+            rows.append(
+                country=COUNTRY,
+                chain=CHAIN,
+                item=f"{section_title} - {name}",
+                size_label=size_label,
+                grams=nums[0],
+                calories=nums[2],
+                protein_g=nums[3],
+                fat_g=nums[4],
+                carbs_g=nums[6],
+                sugar_g=nums[7],
+                fiber_g=nums[8],
+                source_url=source_url,
+                origin=(pi, union_bbox(section_box, box)) if section_box is not None and box is not None else None,
+            )
+
+        if rows:
+            yield rows
+            rows = RowBatch(compact=True)
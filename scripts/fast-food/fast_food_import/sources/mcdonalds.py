@@ -0,0 +1,396 @@
+"""
+McDonald's Australia nutrition guides (Core Food Menu, McCafe Beverages).
+
+Both PDFs print one table per item: the item title, a header line
+"Avg Qty / Serve  Avg Qty / 100g" (100mL for drinks), then one line per
+nutrient with (per serve, per 100g) pairs, one pair per size.
+
+Rules enforced:
+- Only includes items that have calories + protein + carbs + fat (per serve).
+- If an item has Small/Medium/Large options in the PDF, they are imported as
+  separate serving options (size_label = Small/Medium/Large) so the app can show
+  the serving-size dropdown.
+
+The guides differ only in what a Guide records (pages, per-100 units, how long
+a title line can be); CORE_FOOD and MCCAFE_BEVERAGES are the January 2026 ones.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import ClassVar, Collection, Iterable, Iterator, List, Optional, Tuple
+
+from ..backends import BBox, PdfSource
+from ..pages import DEFAULT_PAGE_BUDGET_S, QuarantineReport, iter_page_texts
+from ..provenance import union_bbox
+from ..rows import RowBatch
+
+
+COUNTRY = "AU"
+CHAIN = "McDonald's"
+
+NUTRIENT_LABELS = ("Energy (Cal)", "Protein (g)", "Carbohydrate (g)", "Fat, total (g)", "Sugars (g)")
+
+# Text backend for these PDFs (see fast_food_import/backends.py). Only switch after
+# --validate-backend reports identical rows to the reference backend.
+TEXT_BACKEND = "pdfplumber"
+
+NUM_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def _clean_text(s: str) -> str:
+    s = s.replace("®", "")
+    s = re.sub(r"\s+", " ", s)
+    return s.strip()
+
+
+def _is_all_caps(s: str) -> bool:
+    letters = [ch for ch in s if ch.isalpha()]
+    if not letters:
+        return False
+    return all(ch.isupper() for ch in letters)
+
+
+def _is_candidate_item_line(line: str, max_len: int) -> bool:
+    if not line:
+        return False
+    if ":" in line:
+        return False
+    # Avoid accidentally treating ingredient lines as item titles.
+    if "Avg Qty" in line:
+        return False
+    if "," in line:
+        return False
+    if (
+        "Energy (" in line
+        or "Protein (g)" in line
+        or "Carbohydrate (g)" in line
+        or "Fat, total (g)" in line
+        or "Sugars (g)" in line
+    ):
+        return False
+    if len(line) > max_len:
+        return False
+    noise_prefixes = (
+        "If this document has been printed",
+        "Issue:",
+        "Revision:",
+        "Information correct",
+        "File:",
+        "Developed and authorised",
+    )
+    for p in noise_prefixes:
+        if line.startswith(p):
+            return False
+    if _is_all_caps(line):
+        return False
+    return any(ch.isalpha() for ch in line)
+
+
+def _dedupe_repeated_title(line: str) -> str:
+    # Example: "Chicken Snack Wrap Chicken Snack Wrap" -> "Chicken Snack Wrap"
+    words = line.split()
+    if len(words) >= 2 and len(words) % 2 == 0:
+        half = len(words) // 2
+        if words[:half] == words[half:]:
+            return " ".join(words[:half]).strip()
+    return line.strip()
+
+
+def _parse_nutrient_values(line: str, label: str) -> Optional[Tuple[List[float], List[float]]]:
+    """(per serve, per 100g/100mL) values of one nutrient row, one entry per column."""
+    if label not in line:
+        return None
+    # Keep only the portion after the label.
+    after = line.split(label, 1)[1]
+    nums = [float(x) for x in NUM_RE.findall(after)]
+    if len(nums) < 2:
+        return None
+    if len(nums) % 2 != 0:
+        # Should be pairs: (per serve, per 100g/100mL) repeated for each column.
+        return None
+    return nums[0::2], nums[1::2]
+
+
+def probe_line(line: str) -> Optional[bool]:
+    # Nutrient rows must carry (per serve, per 100g) pairs.
+    for label in NUTRIENT_LABELS:
+        if label in line:
+            return _parse_nutrient_values(line, label) is not None
+    return None
+
+
+@dataclass
+class Block:
+    item_line: str
+    calories: Optional[List[float]] = None
+    protein: Optional[List[float]] = None
+    carbs: Optional[List[float]] = None
+    fat: Optional[List[float]] = None
+    sugar: Optional[List[float]] = None
+    # Per-100g (drinks: per-100mL) halves of the same rows, for fast_food_macros.csv.
+    calories_100: Optional[List[float]] = None
+    protein_100: Optional[List[float]] = None
+    carbs_100: Optional[List[float]] = None
+    fat_100: Optional[List[float]] = None
+    sugar_100: Optional[List[float]] = None
+    # Provenance: page of the block, and the bbox from the title line to the last
+    # nutrient line (None when the backend gave no line boxes).
+    page_index: int = -1
+    bbox: Optional[BBox] = None
+    # Unit of the *_100 halves, from the table header: "mL" or "g".
+    per_100: str = "g"
+
+    def grow(self, box: Optional[BBox]) -> None:
+        self.bbox = union_bbox(self.bbox, box)
+
+    def variant_count(self) -> Optional[int]:
+        for arr in (self.calories, self.protein, self.carbs, self.fat):
+            if arr:
+                return len(arr)
+        return None
+
+
+def _append_variant(out: RowBatch, block: Block, i: int, item: str, size_label: str, source_url: str) -> None:
+    out.append(
+        country=COUNTRY,
+        chain=CHAIN,
+        item=item,
+        size_label=size_label,
+        calories=block.calories[i],
+        protein_g=block.protein[i],
+        carbs_g=block.carbs[i],
+        fat_g=block.fat[i],
+        sugar_g=block.sugar[i] if block.sugar and i < len(block.sugar) else None,
+        calories_100=block.calories_100[i],
+        protein_g_100=block.protein_100[i],
+        carbs_g_100=block.carbs_100[i],
+        fat_g_100=block.fat_100[i],
+        sugar_g_100=block.sugar_100[i] if block.sugar_100 and i < len(block.sugar_100) else None,
+        per_100=block.per_100,
+        source_url=source_url,
+        origin=(block.page_index, block.bbox) if block.page_index >= 0 else None,
+    )
+
+
+def _finalize_block(block: Block, source_url: str, out: RowBatch) -> None:
+    if not block.item_line:
+        return
+
+    if not (block.calories and block.protein and block.carbs and block.fat):
+        return
+
+    v = block.variant_count()
+    if v is None:
+        return
+
+    # Ensure consistent lengths.
+    if not (
+        len(block.calories) == len(block.protein) == len(block.carbs) == len(block.fat) == v
+    ):
+        return
+
+    title = _clean_text(_dedupe_repeated_title(block.item_line))
+
+    # Small/Medium/Large options (Fries, most drinks) become a size dropdown.
+    if v == 3 and title.endswith(" Small Medium Large"):
+        base = title[: -len(" Small Medium Large")].strip()
+        sizes = ["Small", "Medium", "Large"]
+        for i, size in enumerate(sizes):
+            _append_variant(out, block, i, base, size, source_url)
+        return
+
+    # Common pattern: "X and Y X Y" (treat as two separate items)
+    if v == 2 and " and " in title:
+        left, rest = title.split(" and ", 1)
+        left = left.strip()
+        rest = rest.strip()
+
+        # Find the repeated left "X " near the end to split out Y.
+        split_at = rest.rfind(left + " ")
+        right = rest[:split_at].strip() if split_at != -1 else rest
+        right = right.strip()
+
+        if left and right and left != right:
+            names = [left, right]
+            for i, name in enumerate(names):
+                _append_variant(out, block, i, name, "1 serving", source_url)
+            return
+
+    # Default: keep the item line as one item (no dropdown), size = 1 serving.
+    if v == 1:
+        _append_variant(out, block, 0, title, "1 serving", source_url)
+        return
+
+    # If we can't name multiple variants safely, skip to avoid confusing dropdowns.
+    return
+
+
+@dataclass(frozen=True)
+class Guide:
+    """One McDonald's nutrition PDF and the ways its tables differ from the others."""
+
+    COUNTRY: ClassVar[str] = COUNTRY
+    CHAIN: ClassVar[str] = CHAIN
+    TEXT_BACKEND: ClassVar[str] = TEXT_BACKEND
+
+    pdf_url: str
+    # 0-based [start, stop) pages holding the tables; None reads every page.
+    pages: Optional[Tuple[int, int]] = None
+    # Units a table header may name for its second column, checked in order.
+    per_100_units: Tuple[str, ...] = ("g",)
+    # Longer lines are never taken for an item title.
+    max_title_len: int = 120
+
+    @property
+    def table_markers(self) -> Tuple[Tuple[str, ...], ...]:
+        # Header line that opens every nutrition table (used by --probe).
+        return tuple(("Avg Qty / Serve", f"Avg Qty / 100{unit}") for unit in self.per_100_units)
+
+    def iter_rows(
+        self,
+        pdf: PdfSource,
+        source_url: Optional[str] = None,
+        *,
+        page_budget_s: Optional[float] = DEFAULT_PAGE_BUDGET_S,
+        quarantine: Optional[QuarantineReport] = None,
+        only_pages: Optional[Collection[int]] = None,
+        backend: str = TEXT_BACKEND,
+        with_boxes: bool = False,
+    ) -> Iterator[RowBatch]:
+        """Rows as their tables complete, at most one batch per page (see fast_food_import/api.py)."""
+        start, stop = self.pages or (0, None)
+        pages = iter_page_texts(
+            pdf,
+            start=start,
+            stop=stop,
+            only=only_pages,
+            budget_s=page_budget_s,
+            quarantine=quarantine,
+            backend=backend,
+            with_boxes=with_boxes,
+        )
+        return self.iter_page_rows(pages, source_url or self.pdf_url)
+
+    def extract_rows(self, pdf: PdfSource, source_url: Optional[str] = None, **kwargs) -> RowBatch:
+        rows = RowBatch()
+        for batch in self.iter_rows(pdf, source_url, **kwargs):
+            rows.extend(batch)
+        return rows
+
+    def rows_from_pages(self, pages: Iterable[Tuple[int, str]], source_url: str) -> RowBatch:
+        rows = RowBatch()
+        for batch in self.iter_page_rows(pages, source_url):
+            rows.extend(batch)
+        return rows
+
+    def _table_unit(self, line: str) -> Optional[str]:
+        if "Avg Qty / Serve" not in line:
+            return None
+        for unit in self.per_100_units:
+            if f"Avg Qty / 100{unit}" in line:
+                return unit
+        return None
+
+    def iter_page_rows(self, pages: Iterable[Tuple[int, str]], source_url: str) -> Iterator[RowBatch]:
+        rows = RowBatch()
+        last_item_line: Optional[str] = None
+        last_item_box: Optional[BBox] = None
+        current: Optional[Block] = None
+        prev_pi: Optional[int] = None
+
+        for pi, text in pages:
+            if prev_pi is not None and pi != prev_pi + 1:
+                # A skipped page (quarantined, or not sampled by --probe) sits between these
+                # two; don't stitch a block across it.
+                if current is not None:
+                    _finalize_block(current, source_url, rows)
+                current = None
+                last_item_line = None
+            if prev_pi != pi:
+                # A title carried over from the previous page can't share this page's bbox.
+                last_item_box = None
+            prev_pi = pi
+            boxes: Optional[List[BBox]] = getattr(text, "boxes", None)
+
+            for li, raw in enumerate(text.split("\n")):
+                line = raw.strip()
+                if not line:
+                    continue
+                box = boxes[li] if boxes is not None else None
+
+                if _is_candidate_item_line(line, self.max_title_len):
+                    last_item_line = line
+                    last_item_box = box
+
+                unit = self._table_unit(line)
+                if unit is not None:
+                    if current is not None:
+                        _finalize_block(current, source_url, rows)
+                    current = Block(item_line=last_item_line or "", page_index=pi, per_100=unit)
+                    current.grow(last_item_box)
+                    current.grow(box)
+                    continue
+
+                if current is None:
+                    continue
+
+                cal = _parse_nutrient_values(line, "Energy (Cal)")
+                if cal is not None:
+                    current.calories, current.calories_100 = cal
+                    current.grow(box)
+                    continue
+
+                protein = _parse_nutrient_values(line, "Protein (g)")
+                if protein is not None:
+                    current.protein, current.protein_100 = protein
+                    current.grow(box)
+                    continue
+
+                carbs = _parse_nutrient_values(line, "Carbohydrate (g)")
+                if carbs is not None:
+                    current.carbs, current.carbs_100 = carbs
+                    current.grow(box)
+                    continue
+
+                fat = _parse_nutrient_values(line, "Fat, total (g)")
+                if fat is not None:
+                    current.fat, current.fat_100 = fat
+                    current.grow(box)
+                    continue
+
+                sugar = _parse_nutrient_values(line, "Sugars (g)")
+                if sugar is not None:
+                    current.sugar, current.sugar_100 = sugar
+                    current.grow(box)
+                    continue
+
+            if rows:
+                yield rows
+                rows = RowBatch()
+
+        if current is not None:
+            _finalize_block(current, source_url, rows)
+        if rows:
+            yield rows
+
+
+# Nutrition pages are 4..14 (1-indexed) in the Jan 2026 PDF.
+CORE_FOOD = Guide(
+    pdf_url=(
+        "https://promo.mcdonalds.com.au/sites/mcdonalds.com.au/files/"
+        "Aus%20Core%20Food%20Menu_January%202026.pdf"
+    ),
+    pages=(3, 14),
+)
+
+# Drinks print per 100mL, the odd food item per 100g; titles run longer.
+MCCAFE_BEVERAGES = Guide(
+    pdf_url=(
+        "https://promo.mcdonalds.com.au/sites/mcdonalds.com.au/files/"
+        "Aus%20McCafe%20Beverages%20_January%202026.pdf"
+    ),
+    per_100_units=("mL", "g"),
+    max_title_len=140,
+)
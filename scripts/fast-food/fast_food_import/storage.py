@@ -0,0 +1,39 @@
+"""
+Reading and writing whole menu CSVs.
+
+fast_food_menus.csv is plain UTF-8 CSV: the app's loader
+(lib/food/fast-food-menus.ts) parses it directly, and the key index and the
+manifest address it by byte offset. These helpers are for the callers that
+read or write every record (probe counts, Parquet export, the synthetic
+generator, GYG --out); imports into the served file go through merge.py.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+from typing import Iterable, Iterator, List, Sequence
+
+
+def iter_menu_records(path: str) -> Iterator[List[str]]:
+    """Yield the header row, then every record as cells."""
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from csv.reader(f)
+
+
+def write_menu_records(path: str, headers: Sequence[str], records: Iterable[Sequence[str]]) -> None:
+    """Atomically write a menu CSV."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(headers)
+        writer.writerows(records)
+    os.replace(tmp_path, path)
+
+
+def read_menu_headers(path: str) -> List[str]:
+    records = iter_menu_records(path)
+    try:
+        return next(records, [])
+    finally:
+        records.close()
@@ -0,0 +1,179 @@
+"""
+Synthetic fast_food_menus.csv datasets for load-testing consumers.
+
+A MenuProfile is learned from a real CSV, per (country, chain) partition:
+- its share of all rows
+- its item groups (one item with 1..N size_labels), which are resampled
+  whole, so size-label sets, blank grams/ml/fiber/sugar cells and number
+  formatting ("337.0" vs "337") follow the real chain
+- the lengths of its source_url runs, so URLs repeat the way they do in the
+  real file
+- a word vocabulary for item names
+
+generate_menu_rows() then streams any number of rows from the profile.
+Partitions are written one after another (like the real file), numbers are
+jittered by up to +/-JITTER, and item names get a per-partition serial so
+(country, chain, item, size_label) stays unique at any size. The output
+depends only on the profile and the seed.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .rows import MENU_HEADERS, NUMERIC_COLUMNS
+from .storage import iter_menu_records
+
+
+JITTER = 0.1
+
+# Codes used when --countries asks for more countries than the profile has.
+EXTRA_COUNTRIES = ("NZ", "IE", "SG", "DE", "FR", "JP", "IN", "ZA", "MX", "BR", "ES", "IT", "NL", "SE", "AE", "MY")
+
+_IDX = {name: i for i, name in enumerate(MENU_HEADERS)}
+
+# One real item group: the rows (cells in MENU_HEADERS order) of one item.
+ItemGroup = List[List[str]]
+
+
+@dataclass
+class PartitionProfile:
+    country: str
+    chain: str
+    rows: int
+    groups: List[ItemGroup] = field(default_factory=list)
+    url_runs: List[Tuple[str, int]] = field(default_factory=list)
+    words: List[str] = field(default_factory=list)
+
+
+@dataclass
+class MenuProfile:
+    partitions: List[PartitionProfile]
+
+    @property
+    def rows(self) -> int:
+        return sum(p.rows for p in self.partitions)
+
+    @property
+    def countries(self) -> List[str]:
+        return sorted({p.country for p in self.partitions})
+
+
+def profile_from_csv(csv_path: str) -> MenuProfile:
+    """Learn a MenuProfile from a CSV; raises ValueError on unexpected headers."""
+    reader = iter_menu_records(csv_path)
+    headers = next(reader, [])
+    if headers != MENU_HEADERS:
+        raise ValueError(f"Unexpected CSV headers in {csv_path}: {','.join(headers)}")
+
+    parts: Dict[Tuple[str, str], PartitionProfile] = {}
+    groups: Dict[Tuple[str, str], Dict[str, ItemGroup]] = {}
+    prev_url: Dict[Tuple[str, str], str] = {}
+    for row in reader:
+        if len(row) != len(MENU_HEADERS) or not any(c.strip() for c in row):
+            continue
+        pk = (row[_IDX["country"]], row[_IDX["chain"]])
+        p = parts.get(pk)
+        if p is None:
+            p = parts[pk] = PartitionProfile(country=pk[0], chain=pk[1], rows=0)
+            groups[pk] = {}
+        p.rows += 1
+        group = groups[pk].setdefault(row[_IDX["item"]], [])
+        # The real file has the odd repeated key; don't let it multiply.
+        if all(r[_IDX["size_label"]] != row[_IDX["size_label"]] for r in group):
+            group.append(row)
+
+        url = row[_IDX["source_url"]]
+        if p.url_runs and prev_url[pk] == url:
+            last_url, n = p.url_runs[-1]
+            p.url_runs[-1] = (last_url, n + 1)
+        else:
+            p.url_runs.append((url, 1))
+        prev_url[pk] = url
+
+    for pk, p in parts.items():
+        p.groups = list(groups[pk].values())
+        words = set()
+        for item in groups[pk]:
+            words.update(w for w in item.split() if w.isalpha())
+        p.words = sorted(words) or ["Item"]
+    return MenuProfile(partitions=[parts[k] for k in sorted(parts)])
+
+
+def _jitter(value: str, factor: float) -> str:
+    if not value:
+        return value
+    try:
+        x = float(value)
+    except ValueError:
+        return value
+    decimals = len(value.split(".", 1)[1]) if "." in value else 0
+    return f"{max(0.0, x * factor):.{decimals}f}"
+
+
+def _partition_targets(profile: MenuProfile, rows: int, countries: Optional[int]) -> List[Tuple[str, PartitionProfile, int]]:
+    # (country code, template partition, target rows), by largest remainder.
+    real = profile.countries
+    codes = list(real)
+    if countries is not None and countries > len(codes):
+        extra = [c for c in EXTRA_COUNTRIES if c not in codes]
+        extra += [f"Z{i:02d}" for i in range(countries)]
+        codes += extra[: countries - len(codes)]
+    elif countries is not None:
+        codes = codes[: max(1, countries)]
+
+    plan: List[Tuple[str, PartitionProfile]] = []
+    for ci, code in enumerate(codes):
+        template = real[ci % len(real)]
+        plan.extend((code, p) for p in profile.partitions if p.country == template)
+
+    total = sum(p.rows for _, p in plan)
+    exact = [rows * p.rows / total for _, p in plan]
+    counts = [int(x) for x in exact]
+    by_remainder = sorted(range(len(plan)), key=lambda i: (counts[i] - exact[i], i))
+    for i in by_remainder[: rows - sum(counts)]:
+        counts[i] += 1
+    order = sorted(range(len(plan)), key=lambda i: (plan[i][0], plan[i][1].chain))
+    return [(plan[i][0], plan[i][1], counts[i]) for i in order if counts[i]]
+
+
+def generate_menu_rows(
+    profile: MenuProfile,
+    rows: int,
+    *,
+    seed: int = 0,
+    countries: Optional[int] = None,
+) -> Iterator[List[str]]:
+    """Yield `rows` synthetic records (cells in MENU_HEADERS order)."""
+    rng = random.Random(seed)
+    numeric = [_IDX[c] for c in NUMERIC_COLUMNS]
+    ci, ii, ui = _IDX["country"], _IDX["item"], _IDX["source_url"]
+
+    for country, p, target in _partition_targets(profile, rows, countries):
+        url_serial = 0
+        url, url_left = "", 0
+        serial = 0
+        emitted = 0
+        while emitted < target:
+            group = rng.choice(p.groups)
+            serial += 1
+            name = " ".join(rng.choice(p.words) for _ in range(rng.randint(1, 4)))
+            name = f"{name} {serial}"
+            factor = 1.0 + rng.uniform(-JITTER, JITTER)
+            for real_row in group[: target - emitted]:
+                if url_left == 0:
+                    base_url, url_left = rng.choice(p.url_runs)
+                    url_serial += 1
+                    url = base_url if url_serial == 1 else f"{base_url}#synthetic-{url_serial}"
+                url_left -= 1
+
+                row = list(real_row)
+                row[ci] = country
+                row[ii] = name
+                row[ui] = url
+                for k in numeric:
+                    row[k] = _jitter(row[k], factor)
+                yield row
+                emitted += 1
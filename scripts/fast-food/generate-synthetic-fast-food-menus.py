@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Generates a synthetic fast_food_menus.csv of any size for load tests.
+
+The chain/country mix, multi-size items, repeated source URLs and blank
+grams/ml cells are learned from the real CSV (--profile), and the output is
+identical for the same --seed, --rows and --countries. Example:
+
+    python3 scripts/fast-food/generate-synthetic-fast-food-menus.py \\
+        --rows 1000000 --countries 12 --seed 7 --out /tmp/load/fast_food_menus.csv
+
+Pass --manifest to also write fast_food_menus.manifest.json next to --out, so
+the CSV can be served from a scratch data/food-overrides/ directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+from fast_food_import.manifest import write_manifest
+from fast_food_import.rows import MENU_HEADERS, check_menu_headers
+from fast_food_import.storage import read_menu_headers, write_menu_records
+from fast_food_import.synth import generate_menu_rows, profile_from_csv
+
+
+CSV_DEFAULT = os.path.join("data", "food-overrides", "fast_food_menus.csv")
+
+MAX_ROWS = 10_000_000
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--profile", default=CSV_DEFAULT, help="Real CSV to learn distributions from")
+    ap.add_argument("--out", required=True, help="Output CSV path")
+    ap.add_argument("--rows", type=int, required=True, help=f"Rows to generate (max {MAX_ROWS:,})")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--countries", type=int, help="Number of countries (extra ones reuse real countries' chain mix)")
+    ap.add_argument("--manifest", action="store_true", help="Also write the generation manifest next to --out")
+    args = ap.parse_args()
+
+    if not 0 < args.rows <= MAX_ROWS:
+        print(f"--rows must be between 1 and {MAX_ROWS:,}.", file=sys.stderr)
+        return 2
+    if not os.path.exists(args.profile):
+        print(f"CSV not found: {args.profile}", file=sys.stderr)
+        return 2
+
+    if not check_menu_headers(read_menu_headers(args.profile), sys.stderr):
+        return 2
+
+    t0 = time.perf_counter()
+    profile = profile_from_csv(args.profile)
+
+    out_dir = os.path.dirname(args.out)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    write_menu_records(
+        args.out,
+        MENU_HEADERS,
+        generate_menu_rows(profile, args.rows, seed=args.seed, countries=args.countries),
+    )
+
+    print(f"Wrote {args.rows:,} rows to {args.out} in {time.perf_counter() - t0:.1f}s")
+    if args.manifest:
+        manifest = write_manifest(args.out)
+        print(f"Manifest generation {manifest['generation']} ({len(manifest['partitions'])} partitions)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,300 +5,255 @@ Import Guzman y Gomez (Australia) nutrition data from the official GYG AU PDF.
 Source (official): https://www.guzmanygomez.com.au/nutrition/
 PDF currently linked as of Jan 28, 2026.
 
-Output format matches data/food-overrides/fast_food_menus.csv columns.
+Output format matches data/food-overrides/fast_food_menus.csv columns. The
+parser is fast_food_import/sources/guzman_y_gomez.py. With --out FILE, where
+each row came from is recorded next to it (FILE's .provenance.json, see
+fast_food_import/provenance.py) for --reverify.
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
-import io
-import re
+import itertools
+import os
 import sys
-from dataclasses import dataclass
-from typing import Iterable, Optional
 
-import pdfplumber
-import requests
-
-
-PDF_URL = "https://www.guzmanygomez.com.au/wp-content/uploads/2026/02/260128_NUTRITION_ALLERGEN_GUIDE_420X297MM.pdf"
-SOURCE_URL = "https://www.guzmanygomez.com.au/nutrition/"
-
-COUNTRY = "AU"
-CHAIN = "Guzman y Gomez"
-
-
-NUM_RE = re.compile(r"^\d+(?:\.\d+)?$")
-
-
-def _fmt_num(x: float) -> str:
-    if abs(x - int(x)) < 1e-9:
-        return str(int(x))
-    s = f"{x:.3f}".rstrip("0").rstrip(".")
-    return s
-
-
-def _to_title(s: str) -> str:
-    # Keep it simple: "CALI BURRITO" -> "Cali Burrito", "LITTLE G’S" -> "Little G's"
-    s = s.replace("\u2019", "'").strip()
-    s = " ".join(s.split())
-    return s.title()
-
-
-def _clean_section_line(line: str) -> Optional[str]:
-    line = line.strip()
-    if not line:
-        return None
-
-    # Many pages have headers like "SERVE SIZE ENERGY ..." (not a real section).
-    # Sometimes the section name and headers are on the same line; keep only the section part.
-    if "SERVE SIZE" in line:
-        before = line.split("SERVE SIZE", 1)[0].strip(" ,")
-        line = before
-
-    line = line.strip()
-    if not line:
-        return None
-
-    # Skip obvious non-sections.
-    if line in {"NUTRITIONAL INFORMATION", "CARBOHYDRATE"}:
-        return None
-    if line.strip().isdigit():
-        return None
-    if line.startswith("(") or "(g)" in line and "(kJ)" in line:
-        return None
-    if "ENERGY" in line or "PROTEIN" in line or "TOTAL FAT" in line:
-        return None
-
-    # Section headings are all caps in this PDF.
-    if not line.isupper():
-        return None
-
-    return line or None
-
-
-@dataclass(frozen=True)
-class Row:
-    section: str
-    name: str
-    size_label: str
-    grams: float
-    calories: float
-    protein_g: float
-    carbs_g: float
-    fat_g: float
-    sugar_g: float
-    fiber_g: float
-
-    def item_label(self) -> str:
-        return f"{_to_title(self.section)} - {self.name}"
-
-
-def _split_size_label(name: str) -> tuple[str, Optional[str]]:
-    # Turn "... - Small/Medium/Large" into a serving-size dropdown.
-    # We only do this for true size words; we do NOT treat "Mild/Spicy" as sizes.
-    cleaned = (
-        name.replace("\u2013", "-")
-        .replace("\u2014", "-")
-        .replace("\u2212", "-")
-        .strip()
-    )
-
-    m = re.match(r"^(.*?)(?:\s*-\s*)(Small|Medium|Large)$", cleaned, flags=re.IGNORECASE)
-    if m:
-        base = m.group(1).strip()
-        size = m.group(2).title()
-        return (base, size)
-
-    # Special-case: "Family Fries" is clearly a size in the PDF.
-    m2 = re.match(r"^(.*?)(?:\s*-\s*)(Family Fries)$", cleaned, flags=re.IGNORECASE)
-    if m2:
-        base = m2.group(1).strip()
-        return (base, "Family")
-
-    return (name.strip(), None)
-
-
-def _parse_data_line(line: str) -> Optional[Row]:
-    # Skip modifier / delta lines like:
-    # "For spicy add + 30 + 85 + 20 ..."
-    # "Swap White Rice for Brown Rice 0 - 60 - 14 ..."
-    lo = line.lower()
-    if lo.startswith("for spicy add") or lo.startswith("swap ") or lo.startswith("add "):
-        return None
-    if "+" in line:
-        # In this PDF, these are deltas/swaps, not full item rows.
-        return None
-
-    parts = line.split()
-    if len(parts) < 12:
-        return None
-
-    nums: list[str] = []
-    i = len(parts) - 1
-    while i >= 0 and len(nums) < 10:
-        tok = parts[i]
-        if NUM_RE.match(tok):
-            nums.append(tok)
-            i -= 1
-        else:
-            break
-
-    if len(nums) != 10:
-        return None
-
-    nums = list(reversed(nums))
-    name = " ".join(parts[: i + 1]).strip()
-    if not name or name.isdigit():
-        return None
-
-    # Columns in the GYG AU PDF tables:
-    # serve_size_g, energy_kJ, energy_cal, protein_g, total_fat_g, sat_fat_g,
-    # carbohydrate_g, sugars_g, fibre_g, sodium_mg
-    grams = float(nums[0])
-    calories = float(nums[2])
-    protein_g = float(nums[3])
-    fat_g = float(nums[4])
-    carbs_g = float(nums[6])
-    sugar_g = float(nums[7])
-    fiber_g = float(nums[8])
-
-    base_name, size = _split_size_label(name)
-    size_label = size or "1 serving"
-
-    return Row(
-        section="",
-        name=base_name,
-        size_label=size_label,
-        grams=grams,
-        calories=calories,
-        protein_g=protein_g,
-        carbs_g=carbs_g,
-        fat_g=fat_g,
-        sugar_g=sugar_g,
-        fiber_g=fiber_g,
-    )
-
-
-def extract_rows(pdf_bytes: bytes) -> list[Row]:
-    rows: list[Row] = []
-    section: Optional[str] = None
-
-    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            for raw in text.split("\n"):
-                line = raw.strip()
-                if not line:
-                    continue
-
-                sec = _clean_section_line(line)
-                if sec:
-                    section = sec
-                    continue
-
-                if not section:
-                    continue
-
-                parsed = _parse_data_line(line)
-                if not parsed:
-                    continue
+from fast_food_import.backends import BACKENDS, PdfSource, compare_backends
+from fast_food_import.fonts import FONT_CACHE, print_font_stats
+from fast_food_import.parquet import write_menu_parquet
+from fast_food_import.pages import DEFAULT_PAGE_BUDGET_S, QuarantineReport, pdf_sha256
+from fast_food_import.probe import DEFAULT_SAMPLE_PAGES, print_probe, probe_pdf
+from fast_food_import.pipeline import Stage, print_metrics, run_pipeline
+from fast_food_import.provenance import record_provenance, reverify
+from fast_food_import.remote import download_pdf, open_remote_pdf
+from fast_food_import.rows import MENU_HEADERS, RowBatch, check_menu_headers, to_tenths
+from fast_food_import.sources.guzman_y_gomez import (
+    CHAIN,
+    COUNTRY,
+    PDF_URL,
+    SOURCE_URL,
+    TABLE_MARKERS,
+    TEXT_BACKEND,
+    extract_rows,
+    probe_line,
+    rows_from_pages,
+)
+from fast_food_import.storage import iter_menu_records, write_menu_records
+
+
+def fetch_pdf(url: str, lazy: bool = False) -> PdfSource:
+    # lazy: a Range-backed source (see remote.py), for runs that only parse a few pages.
+    return open_remote_pdf(url) if lazy else download_pdf(url)
+
+
+def write_csv(rows: RowBatch, out_fp) -> None:
+    w = csv.writer(out_fp, lineterminator="\n")
+    w.writerow(MENU_HEADERS)
+    w.writerows(rows.iter_records())
 
-                rows.append(
-                    Row(
-                        section=section,
-                        name=parsed.name,
-                        size_label=parsed.size_label,
-                        grams=parsed.grams,
-                        calories=parsed.calories,
-                        protein_g=parsed.protein_g,
-                        carbs_g=parsed.carbs_g,
-                        fat_g=parsed.fat_g,
-                        sugar_g=parsed.sugar_g,
-                        fiber_g=parsed.fiber_g,
-                    )
-                )
 
-    # De-dupe, stable order.
-    seen: set[tuple[str, str, str, float]] = set()
-    out: list[Row] = []
-    for r in rows:
-        k = (r.section, r.name, r.size_label, r.grams)
+def merge_rows(out: RowBatch, batch: RowBatch, seen: set[tuple[str, str, int]]) -> RowBatch:
+    # Same item/size/grams can appear in more than one source PDF; keep the first.
+    # Returns the rows kept.
+    keep: list[int] = []
+    for i in range(len(batch)):
+        k = (batch.item[i], batch.size_label[i], batch.grams[i])
         if k in seen:
             continue
         seen.add(k)
-        out.append(r)
-
-    return out
-
+        keep.append(i)
+    kept = batch.take(keep) if len(keep) != len(batch) else batch
+    out.extend(kept)
+    return kept
 
-def download_pdf(url: str) -> bytes:
-    r = requests.get(url, timeout=60, headers={"User-Agent": "Mozilla/5.0"})
-    r.raise_for_status()
-    ct = (r.headers.get("content-type") or "").lower()
-    if "pdf" not in ct and not r.content.startswith(b"%PDF"):
-        raise RuntimeError(f"Expected PDF response, got content-type={ct!r}")
-    return r.content
 
-
-def write_csv(rows: Iterable[Row], out_fp) -> None:
-    w = csv.writer(out_fp, lineterminator="\n")
-    w.writerow(
-        [
-            "country",
-            "chain",
-            "item",
-            "size_label",
-            "grams",
-            "ml",
-            "calories",
-            "protein_g",
-            "carbs_g",
-            "fat_g",
-            "fiber_g",
-            "sugar_g",
-            "source_url",
-        ]
-    )
-    for r in rows:
-        w.writerow(
-            [
-                COUNTRY,
-                CHAIN,
-                r.item_label(),
-                r.size_label,
-                _fmt_num(r.grams),
-                "",
-                _fmt_num(r.calories),
-                _fmt_num(r.protein_g),
-                _fmt_num(r.carbs_g),
-                _fmt_num(r.fat_g),
-                _fmt_num(r.fiber_g),
-                _fmt_num(r.sugar_g),
-                SOURCE_URL,
-            ]
-        )
+def record_key(record: list[str]) -> tuple[str, str, int]:
+    # merge_rows()'s key for a row already written to --out.
+    return (record[2], record[3], to_tenths(float(record[4]) if record[4] else None))
 
 
 def main(argv: list[str]) -> int:
     ap = argparse.ArgumentParser()
-    ap.add_argument("--pdf-url", default=PDF_URL)
+    ap.add_argument(
+        "--pdf-url",
+        action="append",
+        help=f"PDF to import; repeat for a multi-source run (default: {PDF_URL})",
+    )
     ap.add_argument("--out", default="-", help="Output CSV file path (default: stdout)")
+    ap.add_argument("--parquet", help="Also write the extracted rows as Parquet")
+    ap.add_argument(
+        "--full-download",
+        action="store_true",
+        help="Download whole PDFs for --probe/--retry-quarantined too (they fetch only the needed byte ranges)",
+    )
+    ap.add_argument(
+        "--font-cache",
+        metavar="DIR",
+        help="Also keep decoded fonts on disk in DIR, so later runs over sibling PDFs skip decoding them",
+    )
+    ap.add_argument("--fetch-workers", type=int, default=2, help="Concurrent PDF downloads")
+    ap.add_argument("--extract-workers", type=int, default=1, help="Concurrent PDF parses")
+    ap.add_argument("--queue-size", type=int, default=2, help="Max PDFs buffered between stages")
+    ap.add_argument(
+        "--page-budget",
+        type=float,
+        default=DEFAULT_PAGE_BUDGET_S,
+        help="Seconds allowed per page before it is quarantined (0 = no limit, in-process)",
+    )
+    ap.add_argument(
+        "--probe",
+        action="store_true",
+        help="Sample a few pages of each PDF, check the layout and predict the row yield, then exit",
+    )
+    ap.add_argument("--probe-pages", type=int, default=DEFAULT_SAMPLE_PAGES, help="Pages to sample with --probe")
+    ap.add_argument("--backend", default=TEXT_BACKEND, choices=sorted(BACKENDS), help="Text extraction backend")
+    ap.add_argument(
+        "--validate-backend",
+        action="store_true",
+        help="Compare --backend against the reference backend for each PDF and exit",
+    )
+    ap.add_argument("--quarantine-report", help="JSON file listing pages that timed out or failed")
+    ap.add_argument(
+        "--retry-quarantined",
+        action="store_true",
+        help="Only extract pages listed for each PDF in --quarantine-report, adding their rows to an existing --out",
+    )
+    ap.add_argument(
+        "--reverify",
+        metavar="ITEM",
+        help="Re-extract the recorded PDF region of ITEM (every size) and diff it against --out, then exit",
+    )
     args = ap.parse_args(argv)
 
-    pdf_bytes = download_pdf(args.pdf_url)
-    rows = extract_rows(pdf_bytes)
+    if args.retry_quarantined and not args.quarantine_report:
+        print("--retry-quarantined needs --quarantine-report.", file=sys.stderr)
+        return 2
+    quarantine = QuarantineReport(args.quarantine_report)
+    if args.font_cache:
+        FONT_CACHE.set_directory(args.font_cache)
+    # Only page-selective runs fetch lazily: a full import reads every page anyway, and
+    # a download in the fetch stage overlaps extraction and stays out of the page budget.
+    lazy = (args.probe or args.retry_quarantined) and not args.full_download
+
+    if args.probe:
+        all_ok = True
+        for url in args.pdf_url or [PDF_URL]:
+            result = probe_pdf(
+                fetch_pdf(url, lazy),
+                markers=TABLE_MARKERS,
+                check_line=probe_line,
+                count_rows=lambda pages: len(rows_from_pages(pages)),
+                sample=args.probe_pages,
+                backend=args.backend,
+                label=url,
+            )
+            print_probe(result, sys.stdout, sys.stderr)
+            all_ok = all_ok and result.ok
+        return 0 if all_ok else 1
+
+    if args.reverify:
+        urls = args.pdf_url or [PDF_URL]
+        if args.out == "-" or len(urls) != 1:
+            print("--reverify needs --out (the CSV the rows were written to) and at most one --pdf-url.", file=sys.stderr)
+            return 2
+        pdf = fetch_pdf(urls[0])
+        # Rows recovered by a lazy --retry-quarantined were recorded under the
+        # URL's identity() rather than the content sha256 (see remote.py).
+        shas = {pdf_sha256(pdf), pdf_sha256(open_remote_pdf(urls[0]))}
+        return reverify(
+            args.out,
+            pdf,
+            COUNTRY,
+            CHAIN,
+            args.reverify,
+            lambda pi, text, source_url: rows_from_pages([(pi, text)], source_url),
+            sys.stdout,
+            pdf_shas=shas,
+        )
+
+    if args.validate_backend:
+        failed = 0
+        for url in args.pdf_url or [PDF_URL]:
+            pdf = fetch_pdf(url)
+            diffs = compare_backends(
+                lambda backend: extract_rows(pdf, page_budget_s=args.page_budget, backend=backend),
+                args.backend,
+            )
+            for d in diffs:
+                print(f"{url}: {d}", file=sys.stderr)
+            if diffs:
+                failed += 1
+        if failed:
+            print(f"Backend {args.backend!r} does not match the reference rows.", file=sys.stderr)
+            return 1
+        print(f"Backend {args.backend!r} matches the reference rows.", file=sys.stderr)
+        return 0
+
+    def fetch(url: str) -> tuple[str, PdfSource]:
+        return url, fetch_pdf(url, lazy)
+
+    def extract(fetched: tuple[str, PdfSource]) -> tuple[str, RowBatch]:
+        url, pdf = fetched
+        rows = extract_rows(
+            pdf,
+            page_budget_s=args.page_budget,
+            quarantine=quarantine,
+            retry_quarantined=args.retry_quarantined,
+            label=url,
+            backend=args.backend,
+            # Line boxes give each row its origin, for --out's provenance sidecar.
+            with_boxes=args.out != "-",
+        )
+        return pdf_sha256(pdf), rows
+
+    # A retry only re-extracts the quarantined pages: keep what the earlier run wrote
+    # to --out and add the recovered rows after it, rather than replacing the file.
+    existing: list[list[str]] = []
+    if args.retry_quarantined and args.out != "-" and os.path.exists(args.out):
+        records = iter_menu_records(args.out)
+        if not check_menu_headers(next(records, []), sys.stderr):
+            return 2
+        existing = list(records)
+
+    # download -> extract -> merge run concurrently with bounded queues between them,
+    # so PDF N+1 downloads while PDF N parses and PDF N-1 is merged.
+    rows = RowBatch(compact=True)
+    seen: set[tuple[str, str, int]] = {record_key(r) for r in existing if len(r) == len(MENU_HEADERS)}
+    traced: list[tuple[str, RowBatch]] = []  # (PDF sha256, rows kept from it)
+    metrics = run_pipeline(
+        args.pdf_url or [PDF_URL],
+        [
+            Stage("fetch", fetch, workers=args.fetch_workers, queue_size=args.queue_size),
+            Stage("extract", extract, workers=args.extract_workers, queue_size=args.queue_size),
+        ],
+        lambda extracted: traced.append((extracted[0], merge_rows(rows, extracted[1], seen))),
+        sink_queue_size=args.queue_size,
+    )
+    quarantine.save()
 
     if args.out == "-":
         out_fp = sys.stdout
         write_csv(rows, out_fp)
     else:
-        with open(args.out, "w", encoding="utf-8", newline="") as f:
-            write_csv(rows, f)
+        write_menu_records(args.out, MENU_HEADERS, itertools.chain(existing, rows.iter_records()))
+        for sha, kept in traced:
+            record_provenance(args.out, kept, sha, args.backend)
+
+    if args.parquet:
+        write_menu_parquet(itertools.chain(existing, rows.iter_records()), args.parquet)
 
     print(f"\n# Extracted rows: {len(rows)}", file=sys.stderr)
+    if existing:
+        print(f"# Rows kept from {args.out}: {len(existing)}", file=sys.stderr)
     print(f"# Source: {SOURCE_URL}", file=sys.stderr)
+    print_metrics(metrics, sys.stderr)
+    print_font_stats(FONT_CACHE.stats(), sys.stderr)
+    for e in quarantine.entries():
+        msg = f"# Quarantined page {e.page_index + 1} of {e.source} ({e.reason} after {e.elapsed_s:.1f}s)"
+        if e.detail:
+            msg += f": {e.detail}"
+        print(msg, file=sys.stderr)
 
     return 0
 
@@ -1,13 +1,10 @@
 #!/usr/bin/env python3
 """
 Imports McDonald's Australia McCafe Beverages nutrition from the official PDF into
-data/food-overrides/fast_food_menus.csv.
+data/food-overrides/fast_food_menus.csv, and the same parse's per-100g/100mL
+values into data/food-overrides/fast_food_macros.csv (see fast_food_import/macros.py).
 
-Rules enforced:
-- Only includes items that have calories + protein + carbs + fat (per serve).
-- If a drink has Small/Medium/Large options in the PDF, they are imported as
-  separate serving options (size_label = Small/Medium/Large) so the app can show
-  the serving-size dropdown.
+The parser is fast_food_import/sources/mcdonalds.py (MCCAFE_BEVERAGES).
 
 Source PDF (official):
 https://promo.mcdonalds.com.au/sites/mcdonalds.com.au/files/Aus%20McCafe%20Beverages%20_January%202026.pdf
@@ -16,282 +13,74 @@ https://promo.mcdonalds.com.au/sites/mcdonalds.com.au/files/Aus%20McCafe%20Bever
 from __future__ import annotations
 
 import argparse
-import csv
 import os
-import re
 import sys
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
 
-import pdfplumber
+from fast_food_import.backends import BACKENDS, compare_backends
+from fast_food_import.fonts import FONT_CACHE, print_font_stats
+from fast_food_import.macros import check_macro_headers, macro_records, merge_macro_records, read_macro_headers
+from fast_food_import.merge import merge_menu_rows
+from fast_food_import.parquet import write_menu_parquet_from_csv
+from fast_food_import.pages import DEFAULT_PAGE_BUDGET_S, QuarantineReport, pdf_sha256
+from fast_food_import.probe import DEFAULT_SAMPLE_PAGES, print_probe, probe_pdf
+from fast_food_import.provenance import record_provenance, reverify
+from fast_food_import.rows import check_menu_headers
+from fast_food_import.sources.mcdonalds import CHAIN, COUNTRY, MCCAFE_BEVERAGES, probe_line
+from fast_food_import.storage import iter_menu_records, read_menu_headers
 
 
-PDF_URL_DEFAULT = (
-    "https://promo.mcdonalds.com.au/sites/mcdonalds.com.au/files/"
-    "Aus%20McCafe%20Beverages%20_January%202026.pdf"
-)
+GUIDE = MCCAFE_BEVERAGES
 
 CSV_DEFAULT = os.path.join("data", "food-overrides", "fast_food_menus.csv")
-
-NUM_RE = re.compile(r"-?\d+(?:\.\d+)?")
-
-
-def _clean_text(s: str) -> str:
-    s = s.replace("®", "")
-    s = re.sub(r"\s+", " ", s)
-    return s.strip()
-
-
-def _is_all_caps(s: str) -> bool:
-    letters = [ch for ch in s if ch.isalpha()]
-    if not letters:
-        return False
-    return all(ch.isupper() for ch in letters)
-
-
-def _is_candidate_item_line(line: str) -> bool:
-    if not line:
-        return False
-    if ":" in line:
-        return False
-    # Avoid accidentally treating ingredient lines as item titles.
-    if "Avg Qty" in line:
-        return False
-    if "," in line:
-        return False
-    if (
-        "Energy (" in line
-        or "Protein (g)" in line
-        or "Carbohydrate (g)" in line
-        or "Fat, total (g)" in line
-        or "Sugars (g)" in line
-    ):
-        return False
-    if len(line) > 140:
-        return False
-    noise_prefixes = (
-        "If this document has been printed",
-        "Issue:",
-        "Revision:",
-        "Information correct",
-        "File:",
-        "Developed and authorised",
-    )
-    for p in noise_prefixes:
-        if line.startswith(p):
-            return False
-    if _is_all_caps(line):
-        return False
-    return any(ch.isalpha() for ch in line)
-
-
-def _dedupe_repeated_title(line: str) -> str:
-    words = line.split()
-    if len(words) >= 2 and len(words) % 2 == 0:
-        half = len(words) // 2
-        if words[:half] == words[half:]:
-            return " ".join(words[:half]).strip()
-    return line.strip()
-
-
-def _parse_per_serve_values(line: str, label: str) -> Optional[List[float]]:
-    if label not in line:
-        return None
-    after = line.split(label, 1)[1]
-    nums = [float(x) for x in NUM_RE.findall(after)]
-    if len(nums) < 2:
-        return None
-    if len(nums) % 2 != 0:
-        return None
-    return nums[0::2]
-
-
-@dataclass
-class Block:
-    item_line: str
-    calories: Optional[List[float]] = None
-    protein: Optional[List[float]] = None
-    carbs: Optional[List[float]] = None
-    fat: Optional[List[float]] = None
-    sugar: Optional[List[float]] = None
-
-    def variant_count(self) -> Optional[int]:
-        for arr in (self.calories, self.protein, self.carbs, self.fat):
-            if arr:
-                return len(arr)
-        return None
-
-
-def _finalize_block(block: Block, source_url: str) -> List[Dict[str, str]]:
-    if not block.item_line:
-        return []
-    if not (block.calories and block.protein and block.carbs and block.fat):
-        return []
-    v = block.variant_count()
-    if v is None:
-        return []
-    if not (
-        len(block.calories) == len(block.protein) == len(block.carbs) == len(block.fat) == v
-    ):
-        return []
-
-    title = _clean_text(_dedupe_repeated_title(block.item_line))
-    out: List[Dict[str, str]] = []
-
-    # Common case for drinks: "... Small Medium Large"
-    if v == 3 and title.endswith(" Small Medium Large"):
-        base = title[: -len(" Small Medium Large")].strip()
-        sizes = ["Small", "Medium", "Large"]
-        for i, size in enumerate(sizes):
-            out.append(
-                {
-                    "country": "AU",
-                    "chain": "McDonald's",
-                    "item": base,
-                    "size_label": size,
-                    "grams": "",
-                    "ml": "",
-                    "calories": str(block.calories[i]),
-                    "protein_g": str(block.protein[i]),
-                    "carbs_g": str(block.carbs[i]),
-                    "fat_g": str(block.fat[i]),
-                    "fiber_g": "",
-                    "sugar_g": str(block.sugar[i]) if block.sugar and i < len(block.sugar) else "",
-                    "source_url": source_url,
-                }
-            )
-        return out
-
-    # Pattern: "X and Y X Y" (treat as two separate items)
-    if v == 2 and " and " in title:
-        left, rest = title.split(" and ", 1)
-        left = left.strip()
-        rest = rest.strip()
-        split_at = rest.rfind(left + " ")
-        right = rest[:split_at].strip() if split_at != -1 else rest
-        right = right.strip()
-        if left and right and left != right:
-            names = [left, right]
-            for i, name in enumerate(names):
-                out.append(
-                    {
-                        "country": "AU",
-                        "chain": "McDonald's",
-                        "item": name,
-                        "size_label": "1 serving",
-                        "grams": "",
-                        "ml": "",
-                        "calories": str(block.calories[i]),
-                        "protein_g": str(block.protein[i]),
-                        "carbs_g": str(block.carbs[i]),
-                        "fat_g": str(block.fat[i]),
-                        "fiber_g": "",
-                        "sugar_g": str(block.sugar[i]) if block.sugar and i < len(block.sugar) else "",
-                        "source_url": source_url,
-                    }
-                )
-            return out
-
-    if v == 1:
-        out.append(
-            {
-                "country": "AU",
-                "chain": "McDonald's",
-                "item": title,
-                "size_label": "1 serving",
-                "grams": "",
-                "ml": "",
-                "calories": str(block.calories[0]),
-                "protein_g": str(block.protein[0]),
-                "carbs_g": str(block.carbs[0]),
-                "fat_g": str(block.fat[0]),
-                "fiber_g": "",
-                "sugar_g": str(block.sugar[0]) if block.sugar else "",
-                "source_url": source_url,
-            }
-        )
-        return out
-
-    return []
-
-
-def _extract_rows_from_pdf(pdf_path: str, source_url: str) -> List[Dict[str, str]]:
-    rows: List[Dict[str, str]] = []
-    with pdfplumber.open(pdf_path) as pdf:
-        last_item_line: Optional[str] = None
-        current: Optional[Block] = None
-
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            for raw in text.split("\n"):
-                line = raw.strip()
-                if not line:
-                    continue
-
-                if _is_candidate_item_line(line):
-                    last_item_line = line
-
-                if "Avg Qty / Serve" in line and ("Avg Qty / 100mL" in line or "Avg Qty / 100g" in line):
-                    if current is not None:
-                        rows.extend(_finalize_block(current, source_url))
-                    current = Block(item_line=last_item_line or "")
-                    continue
-
-                if current is None:
-                    continue
-
-                cal = _parse_per_serve_values(line, "Energy (Cal)")
-                if cal is not None:
-                    current.calories = cal
-                    continue
-
-                protein = _parse_per_serve_values(line, "Protein (g)")
-                if protein is not None:
-                    current.protein = protein
-                    continue
-
-                carbs = _parse_per_serve_values(line, "Carbohydrate (g)")
-                if carbs is not None:
-                    current.carbs = carbs
-                    continue
-
-                fat = _parse_per_serve_values(line, "Fat, total (g)")
-                if fat is not None:
-                    current.fat = fat
-                    continue
-
-                sugar = _parse_per_serve_values(line, "Sugars (g)")
-                if sugar is not None:
-                    current.sugar = sugar
-                    continue
-
-        if current is not None:
-            rows.extend(_finalize_block(current, source_url))
-
-    return rows
-
-
-def _read_csv_rows(csv_path: str) -> Tuple[List[str], List[Dict[str, str]]]:
-    with open(csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        return list(reader.fieldnames or []), list(reader)
-
-
-def _write_csv_rows(csv_path: str, headers: List[str], rows: List[Dict[str, str]]) -> None:
-    tmp_path = csv_path + ".tmp"
-    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writeheader()
-        for r in rows:
-            writer.writerow({h: r.get(h, "") for h in headers})
-    os.replace(tmp_path, csv_path)
+MACROS_CSV_DEFAULT = os.path.join("data", "food-overrides", "fast_food_macros.csv")
 
 
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--csv", default=CSV_DEFAULT, help="Path to fast_food_menus.csv")
     ap.add_argument("--pdf", required=True, help="Path to downloaded PDF")
-    ap.add_argument("--source-url", default=PDF_URL_DEFAULT, help="Official PDF URL to store in CSV")
+    ap.add_argument("--source-url", default=GUIDE.pdf_url, help="Official PDF URL to store in CSV")
+    ap.add_argument(
+        "--macros-csv",
+        default=MACROS_CSV_DEFAULT,
+        help="Path to fast_food_macros.csv (per-100g values from the same parse)",
+    )
+    ap.add_argument("--no-macros", action="store_true", help="Only update --csv, not --macros-csv")
+    ap.add_argument("--parquet", help="Also write the merged CSV as Parquet (one row group per country/chain)")
+    ap.add_argument(
+        "--page-budget",
+        type=float,
+        default=DEFAULT_PAGE_BUDGET_S,
+        help="Seconds allowed per page before it is quarantined (0 = no limit, in-process)",
+    )
+    ap.add_argument(
+        "--probe",
+        action="store_true",
+        help="Sample a few pages, check the layout and predict the row yield, then exit",
+    )
+    ap.add_argument("--probe-pages", type=int, default=DEFAULT_SAMPLE_PAGES, help="Pages to sample with --probe")
+    ap.add_argument("--backend", default=GUIDE.TEXT_BACKEND, choices=sorted(BACKENDS), help="Text extraction backend")
+    ap.add_argument(
+        "--validate-backend",
+        action="store_true",
+        help="Compare --backend against the reference backend and exit (no CSV changes)",
+    )
+    ap.add_argument(
+        "--reverify",
+        metavar="ITEM",
+        help="Re-extract the recorded PDF region of ITEM (every size) and diff it against the CSV, then exit",
+    )
+    ap.add_argument(
+        "--font-cache",
+        metavar="DIR",
+        help="Also keep decoded fonts on disk in DIR, so later runs over sibling PDFs skip decoding them",
+    )
+    ap.add_argument("--quarantine-report", help="JSON file listing pages that timed out or failed")
+    ap.add_argument(
+        "--retry-quarantined",
+        action="store_true",
+        help="Only extract pages listed for this PDF in --quarantine-report",
+    )
     args = ap.parse_args()
 
     if not os.path.exists(args.csv):
@@ -300,57 +89,127 @@ def main() -> int:
     if not os.path.exists(args.pdf):
         print(f"PDF not found: {args.pdf}", file=sys.stderr)
         return 2
+    if args.font_cache:
+        FONT_CACHE.set_directory(args.font_cache)
+
+    if args.probe:
+        start, stop = GUIDE.pages or (0, None)
+        records = iter_menu_records(args.csv)
+        next(records, None)
+        expected = sum(1 for r in records if r and r[-1] == args.source_url)
+        result = probe_pdf(
+            args.pdf,
+            markers=GUIDE.table_markers,
+            check_line=probe_line,
+            count_rows=lambda pages: len(GUIDE.rows_from_pages(pages, args.source_url)),
+            start=start,
+            stop=stop,
+            sample=args.probe_pages,
+            expected_rows=expected,
+            backend=args.backend,
+        )
+        print_probe(result, sys.stdout, sys.stderr)
+        return 0 if result.ok else 1
+
+    if args.reverify:
+        return reverify(
+            args.csv,
+            args.pdf,
+            COUNTRY,
+            CHAIN,
+            args.reverify,
+            lambda pi, text, source_url: GUIDE.rows_from_pages([(pi, text)], source_url),
+            sys.stdout,
+        )
+
+    if args.validate_backend:
+        diffs = compare_backends(
+            lambda backend: GUIDE.extract_rows(
+                args.pdf, args.source_url, page_budget_s=args.page_budget, backend=backend
+            ),
+            args.backend,
+        )
+        for d in diffs:
+            print(d, file=sys.stderr)
+        print_font_stats(FONT_CACHE.stats(), sys.stderr)
+        if diffs:
+            print(f"Backend {args.backend!r} does not match the reference rows.", file=sys.stderr)
+            return 1
+        print(f"Backend {args.backend!r} matches the reference rows.")
+        return 0
 
-    headers, existing_rows = _read_csv_rows(args.csv)
-    required_headers = [
-        "country",
-        "chain",
-        "item",
-        "size_label",
-        "grams",
-        "ml",
-        "calories",
-        "protein_g",
-        "carbs_g",
-        "fat_g",
-        "fiber_g",
-        "sugar_g",
-        "source_url",
-    ]
-    if headers != required_headers:
-        print("Unexpected CSV headers. Refusing to write.", file=sys.stderr)
+    headers = read_menu_headers(args.csv)
+    if not check_menu_headers(headers, sys.stderr):
+        return 2
+    if not args.no_macros:
+        if not os.path.exists(args.macros_csv):
+            print(f"CSV not found: {args.macros_csv}", file=sys.stderr)
+            return 2
+        if not check_macro_headers(read_macro_headers(args.macros_csv), sys.stderr):
+            return 2
+
+    if args.retry_quarantined and not args.quarantine_report:
+        print("--retry-quarantined needs --quarantine-report.", file=sys.stderr)
         return 2
 
-    new_rows = _extract_rows_from_pdf(args.pdf, args.source_url)
+    quarantine = QuarantineReport(args.quarantine_report)
+    pdf_hash = pdf_sha256(args.pdf)
+    only_pages = None
+    if args.retry_quarantined:
+        only_pages = quarantine.pages_for(pdf_hash)
+        if not only_pages:
+            print("No quarantined pages for this PDF (nothing to retry).")
+            return 0
+
+    new_rows = GUIDE.extract_rows(
+        args.pdf,
+        args.source_url,
+        page_budget_s=args.page_budget,
+        quarantine=quarantine,
+        only_pages=only_pages,
+        backend=args.backend,
+        with_boxes=True,
+    )
+    quarantine.save()
+    for e in quarantine.entries():
+        if e.pdf_sha256 != pdf_hash:
+            continue
+        msg = f"Quarantined page {e.page_index + 1} ({e.reason} after {e.elapsed_s:.1f}s)"
+        if e.detail:
+            msg += f": {e.detail}"
+        print(msg, file=sys.stderr)
+    print_font_stats(FONT_CACHE.stats(), sys.stderr)
     if not new_rows:
         print("No rows extracted from PDF (nothing to import).", file=sys.stderr)
         return 2
 
-    existing_keys = set()
-    for r in existing_rows:
-        existing_keys.add((r.get("country", ""), r.get("chain", ""), r.get("item", ""), r.get("size_label", "")))
-
-    unique_new = []
-    for r in new_rows:
-        key = (r["country"], r["chain"], r["item"], r["size_label"])
-        if key in existing_keys:
-            continue
-        existing_keys.add(key)
-        unique_new.append(r)
-
-    if not unique_new:
+    result = merge_menu_rows(args.csv, new_rows, (COUNTRY, CHAIN))
+    record_provenance(args.csv, new_rows.take(result.traced), pdf_hash, args.backend)
+    if result.added:
+        print(f"Imported {len(result.added)} new rows into {args.csv}")
+        if result.generation is not None:
+            print(f"Manifest generation {result.generation}")
+    else:
         print("All extracted rows already exist in CSV (no changes).")
-        return 0
 
-    insert_at = 1
-    for i, r in enumerate(existing_rows):
-        if r.get("country") == "AU" and r.get("chain") == "McDonald's":
-            insert_at = i + 1
-
-    updated = existing_rows[:insert_at] + unique_new + existing_rows[insert_at:]
-    _write_csv_rows(args.csv, headers, updated)
-
-    print(f"Imported {len(unique_new)} new rows into {args.csv}")
+    # Same rows, second output, written only once the menu CSV merge has gone
+    # through: fast_food_macros.csv dedupes on its own `food` key, so this runs
+    # even when every serving is already in the menu CSV.
+    if not args.no_macros:
+        macros = merge_macro_records(args.macros_csv, macro_records(new_rows), CHAIN)
+        for row, record in macros.conflicts:
+            print(
+                f"Kept existing per-100g row {row[0]!r}: {','.join(row[1:])} (PDF: {','.join(record[1:])})",
+                file=sys.stderr,
+            )
+        if macros.added:
+            print(f"Imported {len(macros.added)} new per-100g rows into {args.macros_csv}")
+        else:
+            print(f"All per-100g rows already exist in {args.macros_csv} (no changes).")
+
+    if args.parquet:
+        groups = write_menu_parquet_from_csv(args.csv, args.parquet)
+        print(f"Wrote {args.parquet} ({groups} country/chain row groups)")
     return 0
 
 
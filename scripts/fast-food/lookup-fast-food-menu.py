@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Point lookups in data/food-overrides/fast_food_menus.csv via its key index.
+
+    python3 scripts/fast-food/lookup-fast-food-menu.py --chain "McDonald's" --item "Big Mac"
+    python3 scripts/fast-food/lookup-fast-food-menu.py --chain "McDonald's" --item "Fries" --size Medium
+
+Without --size every size of the item is printed. The index
+(fast_food_menus.idx) is rebuilt first if it is missing or older than the CSV.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from fast_food_import.index import MenuIndex
+from fast_food_import.rows import MENU_HEADERS
+
+
+CSV_DEFAULT = os.path.join("data", "food-overrides", "fast_food_menus.csv")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--csv", default=CSV_DEFAULT, help="Path to fast_food_menus.csv")
+    ap.add_argument("--country", default="AU")
+    ap.add_argument("--chain", required=True)
+    ap.add_argument("--item", required=True)
+    ap.add_argument("--size", help="size_label (default: all sizes)")
+    ap.add_argument("--json", action="store_true", help="Print rows as JSON objects")
+    args = ap.parse_args()
+
+    if not os.path.exists(args.csv):
+        print(f"CSV not found: {args.csv}", file=sys.stderr)
+        return 2
+
+    with MenuIndex.open_or_build(args.csv) as index:
+        t0 = time.perf_counter()
+        if args.size is not None:
+            row = index.lookup((args.country, args.chain, args.item, args.size))
+            rows = [row] if row is not None else []
+        else:
+            rows = [cells for _, cells in index.item_rows(args.country, args.chain, args.item)]
+        elapsed_us = (time.perf_counter() - t0) * 1e6
+
+    if not rows:
+        print("Not found.", file=sys.stderr)
+        return 1
+
+    for cells in rows:
+        record = dict(zip(MENU_HEADERS, cells))
+        if args.json:
+            print(json.dumps(record, ensure_ascii=False))
+        else:
+            print(", ".join(f"{k}={v}" for k, v in record.items() if v))
+    print(f"# {len(rows)} row(s) in {elapsed_us:.0f}us", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The importers run from scripts/fast-food; make fast_food_import importable the same way.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,140 @@
+"""
+Small fixtures shared by the tests: hand-written PDFs, small menu CSVs and a
+local HTTP server with Range support (the stand-in for a chain's CDN).
+"""
+
+from __future__ import annotations
+
+import csv
+import http.server
+import io
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence
+
+from fast_food_import.rows import MENU_HEADERS
+
+URL = "https://example.com/menu.pdf"
+
+# Two partitions, with the quoting the real file has: commas and a line break in a cell.
+MENU_RECORDS = [
+    ["AU", "McDonald's", "Big Mac", "1 serving", "204", "", "493", "26", "38", "26", "3.1", "6.9", URL],
+    ["AU", "McDonald's", "Fries, Large", "1 serving", "150", "", "454", "5.6", "55", "23", "", "", URL],
+    ["AU", "McDonald's", "Latte", "Small", "", "250", "116", "7.7", "11", "4.3", "0", "11", URL],
+    ["AU", "McDonald's", "Latte", "Large", "", "450", "201", "13", "19", "7.4", "0", "19", URL],
+    ["AU", "Guzman y Gomez", "Burritos - Cali\nBurrito", "1 serving", "350", "", "502", "25", "60", "18", "9.1", "4.2", URL],
+    ["AU", "Guzman y Gomez", "Bowls - Cali Bowl", "Small", "280", "", "410", "20", "45", "15", "7", "3", URL],
+]
+
+
+def menu_csv(records: Sequence[Sequence[str]] = MENU_RECORDS, newline: str = "\n", final_newline: bool = True) -> bytes:
+    """A fast_food_menus.csv: MENU_HEADERS then `records`, with `newline` endings."""
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator=newline).writerows([MENU_HEADERS, *records])
+    text = buf.getvalue()
+    if not final_newline:
+        text = text[: -len(newline)]
+    return text.encode("utf-8")
+
+
+def make_pdf(pages: Sequence[Sequence[str]], filler: int = 0) -> bytes:
+    """
+    A PDF with one page per entry of `pages`, each line drawn in Helvetica
+    top to bottom. filler adds that many bytes of content-stream comments to
+    every page, so a test can tell a page's bytes from the rest of the file.
+    """
+    objs: List[bytes] = [b""]  # 1-based object numbers; [0] unused
+
+    def add(body: bytes) -> int:
+        objs.append(body)
+        return len(objs) - 1
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    root = add(b"")
+    kids = []
+    for lines in pages:
+        ops = ["BT /F1 10 Tf 14 TL 40 800 Td"]
+        for line in lines:
+            text = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"({text}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        if filler:
+            stream += b"\n" + b"".join(b"% " + b"x" * 97 + b"\n" for _ in range(filler // 100))
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(add(b"<< /Type /Page /Parent %d 0 R /Contents %d 0 R >>" % (root, content)))
+    objs[root] = b"<< /Type /Pages /Kids [%s] /Count %d /MediaBox [0 0 595 842] /Resources << /Font << /F1 %d 0 R >> >> >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids),
+        len(kids),
+        font,
+    )
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % root)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for n, body in enumerate(objs[1:], 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % n + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % len(objs)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs), catalog, xref)
+    return bytes(out)
+
+
+class RangeServer:
+    """Serves `files` (path -> bytes); counts requests and body bytes sent."""
+
+    def __init__(self, files: Dict[str, bytes], ranges: bool = True) -> None:
+        self.files = files
+        self.ranges = ranges
+        self.requests = 0
+        self.bytes_sent = 0
+        self.url = ""
+
+    def reset(self) -> None:
+        self.requests = self.bytes_sent = 0
+
+
+@contextmanager
+def serve(files: Dict[str, bytes], ranges: bool = True) -> Iterator[RangeServer]:
+    server = RangeServer(files, ranges)
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            data = server.files.get(self.path)
+            if data is None:
+                self.send_error(404)
+                return
+            m = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range") or "")
+            if m and server.ranges:
+                start = int(m.group(1))
+                end = min(int(m.group(2)) if m.group(2) else len(data) - 1, len(data) - 1)
+                body = data[start : end + 1]
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+            else:
+                body = data
+                self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            server.requests += 1
+            server.bytes_sent += len(body)
+
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
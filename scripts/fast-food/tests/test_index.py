@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from fast_food_import.index import MenuIndex, index_path
+from fast_food_import.menu_csv import splice_records
+from helpers import MENU_RECORDS, URL, menu_csv
+
+
+def key(record):
+    return tuple(record[:4])
+
+
+def new_record(n: int):
+    return ["AU", "McDonald's", f"Wrap {n}", "1 serving", "200", "", "450", "20", "40", "20", "3", "4", URL]
+
+
+@pytest.fixture(params=["\n", "\r\n"], ids=["lf", "crlf"])
+def csv_path(request, tmp_path):
+    path = tmp_path / "menu.csv"
+    path.write_bytes(menu_csv(newline=request.param))
+    return str(path)
+
+
+def test_lookups(csv_path):
+    with MenuIndex.build(csv_path) as index:
+        assert index.rows == len(MENU_RECORDS)
+        for record in MENU_RECORDS:
+            assert index.lookup(key(record)) == record
+            assert key(record) in index
+        assert ("AU", "McDonald's", "Latte", "Medium") not in index
+        assert index.lookup(("AU", "McDonald's", "Big Mac ", "1 serving")) is None
+        sizes = [cells[3] for _, cells in index.item_rows("AU", "McDonald's", "Latte")]
+        assert sizes == ["Small", "Large"]
+
+        off, length = index.get(key(MENU_RECORDS[4]))
+        with open(csv_path, "rb") as f:
+            f.seek(off)
+            assert f.read(length).startswith(b'AU,Guzman y Gomez,"Burritos - Cali\nBurrito"')
+
+
+def test_first_occurrence_of_a_repeated_key_wins(tmp_path):
+    path = tmp_path / "menu.csv"
+    again = list(MENU_RECORDS[0])
+    again[6] = "999"
+    path.write_bytes(menu_csv(MENU_RECORDS + [again]))
+    with MenuIndex.build(str(path)) as index:
+        assert index.lookup(key(again))[6] == "493"
+        assert len(index.item_rows("AU", "McDonald's", "Big Mac")) == 2
+
+
+@pytest.mark.parametrize("added", [1, 200], ids=["one row", "table grows"])
+def test_splice_matches_a_rebuild(csv_path, added):
+    with open(csv_path, "rb") as f:
+        data = f.read()
+    records = [new_record(n) for n in range(added)]
+    at = data.index(b"AU,Guzman y Gomez")
+    with MenuIndex.open_or_build(csv_path, data) as index:
+        start, written = splice_records(csv_path, data, at, records)
+        index.apply_splice(at, start, written, [key(r) for r in records])
+
+    index = MenuIndex.open(csv_path)
+    assert index is not None, "the spliced index should match the new CSV"
+    with index:
+        assert index.rows == len(MENU_RECORDS) + added
+        for record in MENU_RECORDS + records:
+            assert index.lookup(key(record)) == record
+        spliced = {key(r): index.get(key(r)) for r in MENU_RECORDS + records}
+
+    os.remove(index_path(csv_path))
+    with MenuIndex.build(csv_path) as index:
+        assert {k: index.get(k) for k in spliced} == spliced
+
+
+def test_stale_index_is_refused_and_rebuilt(csv_path):
+    MenuIndex.build(csv_path).close()
+    with open(csv_path, "ab") as f:
+        f.write(",".join(new_record(0)).encode("utf-8") + b"\n")
+    assert MenuIndex.open(csv_path) is None
+    with MenuIndex.open_or_build(csv_path) as index:
+        assert key(new_record(0)) in index
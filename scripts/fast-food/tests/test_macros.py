@@ -0,0 +1,48 @@
+import csv
+
+from fast_food_import.macros import MACROS_HEADERS, macro_records, merge_macro_records
+from fast_food_import.rows import RowBatch
+
+CHAIN = "McDonald's"
+ROW = dict(country="AU", chain=CHAIN, size_label="1 serving", source_url="https://example.com/menu.pdf")
+PER_100G = dict(calories_100=265, protein_g_100=11.8, carbs_g_100=20.1, fat_g_100=15)
+LATTE = dict(calories_100=40, protein_g_100=2.5, carbs_g_100=3.9, fat_g_100=1.6, sugar_g_100=3.9)
+
+
+def batch() -> RowBatch:
+    rows = RowBatch(compact=True)
+    rows.append(item="Big Mac", **ROW, **PER_100G)
+    rows.append(item="McSpicy", **ROW, **PER_100G, sugar_g_100=4.5)
+    rows.append(item="Latte", **dict(ROW, size_label="Small"), **LATTE, per_100="mL")
+    return rows
+
+
+def test_names_match_the_hand_maintained_rows():
+    assert macro_records(batch()) == [
+        ["Big Mac (McDonald's)", "265", "11.8", "20.1", "15", "0", "0"],
+        ["McSpicy (McDonald's)", "265", "11.8", "20.1", "15", "0", "4.5"],
+        ["Latte (McDonald's, per 100mL)", "40", "2.5", "3.9", "1.6", "0", "3.9"],
+    ]
+
+
+def test_existing_food_is_kept_not_duplicated(tmp_path):
+    path = tmp_path / "macros.csv"
+    path.write_text(
+        ",".join(MACROS_HEADERS) + "\n"
+        "Big Mac (McDonald's),265,11.8,20.1,15.0,0,0\n"
+        "Hotcakes (McDonald's),230,5.0,40.0,6.0,0,0\n"
+        "Apple (Generic),52,0.3,14,0.2,2.4,10\n",
+        encoding="utf-8",
+    )
+    result = merge_macro_records(str(path), macro_records(batch()), CHAIN)
+    assert [r[0] for r in result.added] == ["McSpicy (McDonald's)", "Latte (McDonald's, per 100mL)"]
+    assert result.conflicts == []
+    with open(path, encoding="utf-8", newline="") as f:
+        foods = [row[0] for row in csv.reader(f)][1:]
+    assert foods == [
+        "Big Mac (McDonald's)",
+        "Hotcakes (McDonald's)",
+        "McSpicy (McDonald's)",
+        "Latte (McDonald's, per 100mL)",
+        "Apple (Generic)",
+    ]
@@ -0,0 +1,77 @@
+import pytest
+
+from fast_food_import.manifest import apply_splice, build_partitions, load_manifest, partition_end, write_manifest
+from fast_food_import.menu_csv import iter_record_spans, splice_records
+from helpers import MENU_RECORDS, URL, menu_csv
+
+LAYOUTS = {
+    "lf": dict(newline="\n"),
+    "crlf": dict(newline="\r\n"),
+    "noeol": dict(newline="\n", final_newline=False),
+    "crlf-noeol": dict(newline="\r\n", final_newline=False),
+}
+
+MCD_ROW = ["AU", "McDonald's", "McFlurry", "1 serving", "180", "", "340", "8", "50", "11", "0.5", "45", URL]
+GYG_ROW = ["AU", "Guzman y Gomez", "Nachos - Cali Nachos", "1 serving", "400", "", "800", "30", "70", "40", "12", "5", URL]
+NZ_ROW = ["NZ", "McDonald's", "Kiwiburger", "1 serving", "250", "", "560", "30", "40", "30", "3", "10", URL]
+
+
+def record_end(data: bytes, n: int) -> int:
+    # Byte offset just past data record n (0-based, header excluded).
+    spans = list(iter_record_spans(data))
+    return spans[n + 1][1]
+
+
+@pytest.fixture(params=sorted(LAYOUTS))
+def csv_path(request, tmp_path):
+    path = tmp_path / "menu.csv"
+    path.write_bytes(menu_csv(**LAYOUTS[request.param]))
+    write_manifest(str(path))
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "where, records",
+    [
+        ("end of McDonald's", [MCD_ROW]),
+        ("end of file", [GYG_ROW, NZ_ROW]),
+        ("inside McDonald's", [GYG_ROW]),
+    ],
+)
+def test_splice_matches_a_full_rebuild(csv_path, where, records):
+    with open(csv_path, "rb") as f:
+        data = f.read()
+    before = load_manifest(csv_path, len(data))
+    assert before["generation"] == 1
+
+    at = {
+        "end of McDonald's": partition_end(csv_path, data, "AU", "McDonald's"),
+        "end of file": len(data),
+        "inside McDonald's": record_end(data, 1),
+    }[where]
+    start, written = splice_records(csv_path, data, at, records)
+    after = apply_splice(csv_path, before, at, start, written, [(r[0], r[1]) for r in records])
+
+    with open(csv_path, "rb") as f:
+        new_data = f.read()
+    rebuilt = build_partitions(new_data)
+    assert after["partitions"] == rebuilt["partitions"]
+    assert after["header_bytes"] == rebuilt["header_bytes"]
+    assert after["csv_bytes"] == len(new_data)
+    assert after["rows"] == len(MENU_RECORDS) + len(records)
+    assert after["generation"] == 2
+    assert load_manifest(csv_path, len(new_data)) == after
+
+
+def test_ranges_cover_each_partitions_records(csv_path):
+    with open(csv_path, "rb") as f:
+        data = f.read()
+    parts = load_manifest(csv_path, len(data))["partitions"]
+    assert {k: p["rows"] for k, p in parts.items()} == {"AU|McDonald's": 4, "AU|Guzman y Gomez": 2}
+    (s, e), = parts["AU|Guzman y Gomez"]["ranges"]
+    assert data[s:e].startswith(b"AU,Guzman y Gomez,")
+    assert e == len(data)
+
+
+def test_unchanged_csv_keeps_its_generation(csv_path):
+    assert write_manifest(csv_path)["generation"] == 1
@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from fast_food_import.pages import QuarantineReport, iter_page_texts, pdf_sha256
+from helpers import make_pdf
+
+pytest.importorskip("pdfplumber")
+
+
+@pytest.fixture(scope="module")
+def slow_pdf() -> bytes:
+    # Page 1 takes over a second to extract; the others a few milliseconds.
+    return make_pdf([["Page 0", "a 1 2"], [f"Line {i} 1 2 3" for i in range(3000)], ["Page 2", "b 1 2"]])
+
+
+def test_slow_page_is_quarantined_and_the_rest_extracted(slow_pdf, tmp_path):
+    report_path = str(tmp_path / "quarantine.json")
+    quarantine = QuarantineReport(report_path)
+    pages = list(iter_page_texts(slow_pdf, budget_s=0.3, quarantine=quarantine, label="slow.pdf"))
+
+    assert [pi for pi, _ in pages] == [0, 2]
+    assert "b 1 2" in pages[1][1]
+    (entry,) = quarantine.entries()
+    assert (entry.page_index, entry.reason, entry.source) == (1, "timeout", "slow.pdf")
+    assert entry.elapsed_s >= 0.3 and entry.budget_s == 0.3
+
+    quarantine.save()
+    reloaded = QuarantineReport(report_path)
+    assert reloaded.pages_for(pdf_sha256(slow_pdf)) == [1]
+
+    # The retry extracts just that page, with no deadline, and resolves it.
+    retried = list(iter_page_texts(slow_pdf, only=[1], budget_s=None, quarantine=reloaded))
+    assert [pi for pi, _ in retried] == [1]
+    assert "Line 2999 1 2 3" in retried[0][1]
+    assert len(reloaded) == 0
+
+
+def test_slow_consumer_does_not_use_up_the_page_budget():
+    # The clock starts when the worker starts a page, not when the caller asks for it.
+    pdf = make_pdf([[f"Page {i}", f"Item {i} 1 2"] for i in range(3)])
+    quarantine = QuarantineReport()
+    seen = []
+    for pi, text in iter_page_texts(pdf, budget_s=0.4, quarantine=quarantine):
+        seen.append(pi)
+        time.sleep(0.6)
+    assert seen == [0, 1, 2]
+    assert len(quarantine) == 0
+
+
+@pytest.mark.parametrize("budget_s", [None, 5.0], ids=["in-process", "worker"])
+def test_page_selection_and_boxes(budget_s):
+    pdf = make_pdf([[f"Page {i}", f"Item {i} 1 2"] for i in range(5)])
+    pages = list(iter_page_texts(pdf, start=1, stop=4, only=[0, 2, 3], budget_s=budget_s, with_boxes=True))
+    assert [pi for pi, _ in pages] == [2, 3]
+    for pi, text in pages:
+        assert text.split("\n") == [f"Page {pi}", f"Item {pi} 1 2"]
+        assert len(text.boxes) == 2 and text.boxes[0][1] < text.boxes[1][1]
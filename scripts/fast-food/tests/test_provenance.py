@@ -0,0 +1,69 @@
+import io
+import json
+
+import pytest
+
+from fast_food_import.provenance import ProvenanceStore, provenance_path, record_provenance, reverify
+from fast_food_import.rows import MENU_HEADERS
+from fast_food_import.sources import guzman_y_gomez as gyg
+from fast_food_import.storage import write_menu_records
+from helpers import make_pdf
+
+pytest.importorskip("pdfplumber")
+
+NUMS = "350 2100 502 25 18 7.5 60 4.2 9.1 980"
+PAGES = [
+    ["BURRITOS SERVE SIZE ENERGY", f"Cali | Burrito {NUMS}", f"Cali Burrito Art {NUMS}"],
+    ["BOWLS", f"Cali Bowl - Small {NUMS}", f"Cali Bowl - Large {NUMS}"],
+]
+
+
+def reparse(pi, text, source_url):
+    return gyg.rows_from_pages([(pi, text)], source_url)
+
+
+@pytest.fixture
+def imported(tmp_path):
+    pdf = make_pdf(PAGES)
+    rows = gyg.extract_rows(pdf, page_budget_s=None, with_boxes=True)
+    csv_path = str(tmp_path / "menu.csv")
+    write_menu_records(csv_path, MENU_HEADERS, list(rows.iter_records()))
+    assert record_provenance(csv_path, rows, "sha", "pdfplumber") == len(rows) == 4
+    return pdf, csv_path
+
+
+def test_keys_with_a_pipe_round_trip(imported):
+    _, csv_path = imported
+    store = ProvenanceStore(provenance_path(csv_path))
+    assert store.get(("AU", gyg.CHAIN, "Burritos - Cali | Burrito", "1 serving")).page_index == 0
+    assert store.get(("AU", gyg.CHAIN, "Bowls - Cali Bowl", "Large")).page_index == 1
+
+
+def test_reverify_matches_the_item_exactly(imported):
+    pdf, csv_path = imported
+    out = io.StringIO()
+    assert reverify(csv_path, pdf, "AU", gyg.CHAIN, "Burritos - Cali | Burrito", reparse, out, pdf_shas=["sha"]) == 0
+    checked = [line for line in out.getvalue().splitlines() if line.startswith("OK")]
+    # Not "Cali Burrito Art", whose name merely starts the same way.
+    assert len(checked) == 1 and "Cali | Burrito / 1 serving" in checked[0]
+
+
+def test_reverify_reports_a_changed_value(imported):
+    pdf, csv_path = imported
+    with open(csv_path, encoding="utf-8") as f:
+        text = f.read()
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write(text.replace(",502,", ",503,", 1))
+    out = io.StringIO()
+    assert reverify(csv_path, pdf, "AU", gyg.CHAIN, "Burritos - Cali | Burrito", reparse, out, pdf_shas=["sha"]) == 1
+    assert "calories: csv='503' pdf='502'" in out.getvalue()
+
+
+def test_version_1_keys_are_read_when_unambiguous(tmp_path):
+    entry = {"pdf_sha256": "sha", "source_url": "u", "page_index": 3, "bbox": None, "backend": "raw"}
+    path = str(tmp_path / "menu.provenance.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "rows": {"AU|C|Item|1 serving": entry, "AU|C|A|B|1 serving": entry}}, f)
+    store = ProvenanceStore(path)
+    assert len(store) == 1
+    assert store.get(("AU", "C", "Item", "1 serving")).page_index == 3
@@ -0,0 +1,64 @@
+import pytest
+
+from fast_food_import.backends import open_document
+from fast_food_import.pages import iter_page_texts
+from fast_food_import.remote import DEFAULT_BLOCK_SIZE, RangeFile, RemotePdf, open_remote_pdf
+from helpers import make_pdf, serve
+
+pytest.importorskip("requests")
+pytest.importorskip("pdfplumber")
+
+PAGES = [[f"Page {i}", f"Item {i} 100 200 300"] for i in range(30)]
+
+
+@pytest.fixture(scope="module")
+def big_pdf() -> bytes:
+    # ~7.7 MB, most of it page content, like a real guide with artwork.
+    return make_pdf(PAGES, filler=256 * 1024)
+
+
+@pytest.mark.parametrize("backend", ["pdfplumber", "pdfminer", "raw"])
+def test_page_selective_run_fetches_a_fraction_of_the_file(big_pdf, backend):
+    with serve({"/menu.pdf": big_pdf}) as server:
+        pdf = open_remote_pdf(server.url + "/menu.pdf")
+        assert isinstance(pdf, RemotePdf)
+        pages = list(iter_page_texts(pdf, only=[17], budget_s=None, backend=backend))
+
+    assert [pi for pi, _ in pages] == [17]
+    assert "Item 17 100 200 300" in pages[0][1]
+    # The trailer/xref, the page tree and one page's content: nowhere near 30 pages' worth.
+    assert server.bytes_sent < len(big_pdf) // 10, (server.bytes_sent, len(big_pdf))
+
+
+def test_opening_a_document_reads_no_page_content(big_pdf):
+    with serve({"/menu.pdf": big_pdf}) as server:
+        pdf = open_remote_pdf(server.url + "/menu.pdf")
+        with open_document(pdf, "pdfplumber") as doc:
+            assert doc.page_count == len(PAGES)
+    # The first block and the trailer/xref at the end.
+    assert server.bytes_sent <= 3 * DEFAULT_BLOCK_SIZE
+
+
+def test_server_without_range_support_gives_the_whole_file(big_pdf):
+    with serve({"/menu.pdf": big_pdf}, ranges=False) as server:
+        pdf = open_remote_pdf(server.url + "/menu.pdf")
+    assert pdf == big_pdf
+    assert server.requests == 1
+
+
+def test_small_file_is_returned_whole():
+    data = make_pdf(PAGES[:2])
+    with serve({"/small.pdf": data}) as server:
+        assert open_remote_pdf(server.url + "/small.pdf") == data
+
+
+def test_range_file_reads_match_the_bytes(big_pdf):
+    with serve({"/menu.pdf": big_pdf}) as server:
+        pdf = open_remote_pdf(server.url + "/menu.pdf", block_size=4096)
+        f = RangeFile(pdf)
+        for pos, n in [(0, 10), (len(big_pdf) - 50, 100), (12345, 9000), (4095, 2), (100000, 0)]:
+            f.seek(pos)
+            assert f.read(n) == big_pdf[pos : pos + n]
+        f.seek(-20, 2)
+        assert f.read() == big_pdf[-20:]
+        f.close()
@@ -0,0 +1,54 @@
+import pytest
+
+from fast_food_import.rows import MISSING, RowBatch, format_tenths, is_tenths, to_tenths
+
+ROW = dict(country="AU", chain="McDonald's", size_label="1 serving", source_url="https://example.com/menu.pdf")
+
+
+@pytest.mark.parametrize(
+    "v, plain, compact",
+    [(3370, "337.0", "337"), (65, "6.5", "6.5"), (0, "0.0", "0"), (-15, "-1.5", "-1.5"), (MISSING, "", "")],
+)
+def test_format_tenths(v, plain, compact):
+    assert format_tenths(v) == plain
+    assert format_tenths(v, compact=True) == compact
+
+
+def test_to_tenths_and_is_tenths():
+    assert to_tenths(None) == MISSING
+    assert to_tenths(6.5) == 65 and to_tenths(0.1 + 0.2) == 3
+    assert is_tenths(0.1 + 0.2) and is_tenths(337)
+    assert not is_tenths(0.05) and not is_tenths(2.25)
+
+
+def batch(compact: bool = False) -> RowBatch:
+    rows = RowBatch(compact=compact)
+    rows.append(item="Big Mac", grams=204, calories=493, protein_g=26.4, fiber_g=None, **ROW)
+    rows.append(item="Fries", grams=150, calories=454, sugar_g=0.25, **ROW)
+    rows.append(item="Latte", ml=250, calories=116, fat_g=4.35, origin=(3, (1.0, 2.0, 3.0, 4.0)), **ROW)
+    return rows
+
+
+def test_records_keep_values_that_are_not_whole_tenths():
+    rows = batch()
+    assert rows.record(0)[4:12] == ["204.0", "", "493.0", "26.4", "", "", "", ""]
+    assert rows.text(1, "sugar_g") == "0.25"
+    assert rows.text(2, "fat_g", compact=True) == "4.35"
+    assert rows.text(0, "calories", compact=True) == "493"
+    assert batch(compact=True).record(0)[4:7] == ["204", "", "493"]
+
+
+def test_take_and_extend_carry_verbatim_cells_and_origins():
+    rows = batch()
+    taken = rows.take([2, 1])
+    assert [taken.item[i] for i in range(len(taken))] == ["Latte", "Fries"]
+    assert taken.text(0, "fat_g") == "4.35" and taken.text(1, "sugar_g") == "0.25"
+    assert taken.text(0, "sugar_g") == "" and taken.origin == [(3, (1.0, 2.0, 3.0, 4.0)), None]
+
+    out = RowBatch()
+    out.extend(batch())
+    out.extend(taken)
+    assert len(out) == 5
+    assert list(out.iter_records()) == list(rows.iter_records()) + list(taken.iter_records())
+    assert out.key(3) == ("AU", "McDonald's", "Latte", "1 serving")
+    assert out.origin[3] == (3, (1.0, 2.0, 3.0, 4.0))
@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from fast_food_import.rows import MENU_HEADERS
+from fast_food_import.synth import generate_menu_rows, profile_from_csv
+from helpers import menu_csv
+
+
+@pytest.fixture
+def profile(tmp_path):
+    path = tmp_path / "menu.csv"
+    path.write_bytes(menu_csv())
+    return profile_from_csv(str(path))
+
+
+def test_profile(profile):
+    assert profile.rows == 6 and profile.countries == ["AU"]
+    mcd = next(p for p in profile.partitions if p.chain == "McDonald's")
+    assert [[r[3] for r in g] for g in mcd.groups] == [["1 serving"], ["1 serving"], ["Small", "Large"]]
+    assert mcd.url_runs == [("https://example.com/menu.pdf", 4)]
+
+
+def test_same_seed_same_rows(profile):
+    first = list(generate_menu_rows(profile, 500, seed=7))
+    assert first == list(generate_menu_rows(profile, 500, seed=7))
+    assert first != list(generate_menu_rows(profile, 500, seed=8))
+
+
+@pytest.mark.parametrize("rows, countries", [(1, None), (500, None), (1000, 3)])
+def test_row_count_and_unique_keys(profile, rows, countries):
+    out = list(generate_menu_rows(profile, rows, seed=1, countries=countries))
+    assert len(out) == rows
+    assert all(len(r) == len(MENU_HEADERS) for r in out)
+    assert len({tuple(r[:4]) for r in out}) == rows
+    if countries:
+        assert len({r[0] for r in out}) == countries
+        # Partitions come out one after another, like the real file.
+        firsts = [tuple(r[:2]) for i, r in enumerate(out) if i == 0 or tuple(out[i - 1][:2]) != tuple(r[:2])]
+        assert len(firsts) == len(set(firsts))
+
+
+def test_output_file_is_the_same_in_every_process(tmp_path):
+    # Nothing may depend on str hashing (set/dict order), which differs per process.
+    profile_path = tmp_path / "menu.csv"
+    profile_path.write_bytes(menu_csv())
+    script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "generate-synthetic-fast-food-menus.py")
+    outputs = []
+    for hash_seed in ("1", "2"):
+        out = tmp_path / f"synthetic-{hash_seed}.csv"
+        subprocess.run(
+            [sys.executable, script, "--profile", str(profile_path), "--out", str(out), "--rows", "300", "--seed", "5", "--countries", "4"],
+            check=True,
+            capture_output=True,
+            env=dict(os.environ, PYTHONHASHSEED=hash_seed),
+        )
+        outputs.append(out.read_bytes())
+    assert outputs[0] == outputs[1]
+    assert outputs[0].count(b"\n") == 301
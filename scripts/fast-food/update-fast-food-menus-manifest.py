@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Rewrites data/food-overrides/fast_food_menus.manifest.json for the current CSV.
+
+The importers do this automatically; run it after editing fast_food_menus.csv
+by hand so lib/food/fast-food-menus.ts picks up the change (it reloads only the
+(country, chain) partitions whose hash changed).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+from fast_food_import.manifest import changed_partitions, load_manifest, manifest_path, write_manifest
+
+
+CSV_DEFAULT = os.path.join("data", "food-overrides", "fast_food_menus.csv")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--csv", default=CSV_DEFAULT, help="Path to fast_food_menus.csv")
+    args = ap.parse_args()
+
+    if not os.path.exists(args.csv):
+        print(f"CSV not found: {args.csv}", file=sys.stderr)
+        return 2
+
+    prev = load_manifest(args.csv)
+    manifest = write_manifest(args.csv)
+    changed = changed_partitions(prev, manifest)
+
+    print(f"Wrote {manifest_path(args.csv)} (generation {manifest['generation']}, {manifest['rows']} rows)")
+    for key in changed:
+        print(f"  changed: {key}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())